@@ -0,0 +1,120 @@
+"""
+Django management command to migrate many courses from the old Mongo modulestore to the
+split-Mongo modulestore, in parallel processes.
+
+The progress of each course's migration is recorded in a checkpoint directory: running the
+command again with the same directory skips the courses already migrated and resumes the
+ones whose migration failed.
+"""
+import logging
+import multiprocessing
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from contentstore.management.commands.utils import user_from_str
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore, clear_existing_modulestores
+from xmodule.modulestore.split_migrator import SplitMigrator, MigrationCheckpoints
+
+log = logging.getLogger(__name__)
+
+
+def _init_worker():
+    """
+    Process pool initializer: forked workers must open their own database connections.
+    """
+    clear_existing_modulestores()
+    connection.close()
+
+
+def migrate_course(course_id, user_id, checkpoint_dir):
+    """
+    Migrates the course to split, recording its progress under checkpoint_dir.
+
+    Returns a (course_id, record of the migration, error message or None) tuple.
+    """
+    course_key = CourseKey.from_string(course_id)
+    checkpoints = MigrationCheckpoints(checkpoint_dir)
+    migrator = SplitMigrator(
+        source_modulestore=modulestore(),
+        split_modulestore=modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.split),  # pylint: disable=protected-access
+    )
+    try:
+        migrator.migrate_mongo_course(course_key, user_id, checkpoints=checkpoints)
+    except Exception as exc:  # pylint: disable=broad-except
+        log.exception(u'Failed to migrate %s', course_id)
+        return course_id, checkpoints.get(course_key), unicode(exc)
+    return course_id, checkpoints.get(course_key), None
+
+
+def _migrate_course_in_process(args):
+    """
+    Process pool worker for migrate_course.
+    """
+    return migrate_course(*args)
+
+
+class Command(BaseCommand):
+    """
+    Migrate many courses from old-Mongo to split-Mongo, reusing their course ids.
+    """
+    help = (
+        "Migrate courses from old-Mongo to split-Mongo, in parallel processes. Run it again with the "
+        "same checkpoint directory to resume after failures."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('user', help="email or ID of the user whose action is causing the migration")
+        parser.add_argument('checkpoint_dir', help="directory recording the progress of each course's migration")
+        parser.add_argument(
+            'course_ids', nargs='*', help="IDs of the courses to migrate (default: all the old-Mongo courses)"
+        )
+        parser.add_argument('--processes', type=int, default=1, help="number of courses to migrate at once")
+
+    def handle(self, *args, **options):
+        try:
+            user = user_from_str(options['user'])
+        except User.DoesNotExist:
+            raise CommandError("No user found identified by {}".format(options['user']))
+
+        if options['course_ids']:
+            try:
+                course_ids = [unicode(CourseKey.from_string(course_id)) for course_id in options['course_ids']]
+            except InvalidKeyError:
+                raise CommandError("Invalid course key")
+        else:
+            mongo_store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.mongo)  # pylint: disable=protected-access
+            course_ids = [unicode(course.id) for course in mongo_store.get_courses()]
+
+        tasks = [(course_id, user.id, options['checkpoint_dir']) for course_id in course_ids]
+        if options['processes'] > 1:
+            pool = multiprocessing.Pool(options['processes'], initializer=_init_worker)
+            results = pool.imap_unordered(_migrate_course_in_process, tasks)
+        else:
+            pool = None
+            results = (migrate_course(*task) for task in tasks)
+
+        failed = []
+        try:
+            for course_id, record, error in results:
+                if error is not None:
+                    failed.append(course_id)
+                    self.stdout.write(u"{}: FAILED: {}".format(course_id, error))
+                    continue
+                blocks = record.get('published_blocks', 0) + record.get('draft_blocks', 0)
+                seconds = record.get('seconds', 0)
+                self.stdout.write(u"{}: migrated to {}, {} blocks in {:.1f}s ({:.1f} blocks/s)".format(
+                    course_id, record['new_course_key'], blocks, seconds, blocks / seconds if seconds else 0
+                ))
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        self.stdout.write(u"{} courses migrated, {} failed".format(len(course_ids) - len(failed), len(failed)))
+        if failed:
+            raise CommandError(u"Failed to migrate: {}".format(u", ".join(failed)))
@@ -0,0 +1,47 @@
+"""
+Unittests for migrating courses to split mongo in bulk
+"""
+import shutil
+from tempfile import mkdtemp
+
+from django.core.management import CommandError, call_command
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.split_migrator import MigrationCheckpoints
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+# pylint: disable=protected-access
+class TestMigrateCoursesToSplit(ModuleStoreTestCase):
+    """
+    Unit tests for the migrate_courses_to_split management command
+    """
+
+    def setUp(self):
+        super(TestMigrateCoursesToSplit, self).setUp(create_user=True)
+        self.course = CourseFactory(default_store=ModuleStoreEnum.Type.mongo)
+        self.checkpoint_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.checkpoint_dir)
+
+    def test_migrate_courses(self):
+        """
+        Test migrating a course and recording its checkpoint
+        """
+        call_command("migrate_courses_to_split", str(self.user.email), self.checkpoint_dir, unicode(self.course.id))
+        split_store = modulestore()._get_modulestore_by_type(ModuleStoreEnum.Type.split)
+        new_key = split_store.make_course_key(self.course.id.org, self.course.id.course, self.course.id.run)
+        self.assertTrue(split_store.has_course(new_key), "Could not find course")
+
+        record = MigrationCheckpoints(self.checkpoint_dir).get(self.course.id)
+        self.assertEqual(record['phase'], MigrationCheckpoints.COMPLETE)
+
+        # running the command again skips the migrated course
+        call_command("migrate_courses_to_split", str(self.user.email), self.checkpoint_dir, unicode(self.course.id))
+
+    def test_nonexistent_user(self):
+        """
+        Test error for using an unknown user
+        """
+        with self.assertRaisesRegexp(CommandError, "No user found identified by fake@example.com"):
+            call_command("migrate_courses_to_split", "fake@example.com", self.checkpoint_dir)
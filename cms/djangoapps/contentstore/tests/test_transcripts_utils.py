@@ -3,6 +3,7 @@
 import unittest
 from uuid import uuid4
 import copy
+import json
 import textwrap
 from mock import patch, Mock
 
@@ -582,6 +583,9 @@ class TestTranscript(unittest.TestCase):
 
         self.txt_transcript = u"Elephant's Dream\nAt the left we can see..."
 
+        transcripts_utils.CONVERTED_TRANSCRIPTS.clear()
+        self.addCleanup(transcripts_utils.CONVERTED_TRANSCRIPTS.clear)
+
     def test_convert_srt_to_txt(self):
         expected = self.txt_transcript
         actual = transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'txt')
@@ -606,6 +610,75 @@ class TestTranscript(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'sjson')
 
+    def test_convert_cached(self):
+        with patch(
+            'xmodule.video_module.transcripts_utils.SubRipFile.from_string',
+            wraps=transcripts_utils.SubRipFile.from_string
+        ) as mock_parse:
+            for __ in range(2):
+                actual = transcripts_utils.Transcript.convert(self.srt_transcript, 'srt', 'txt')
+                self.assertEqual(actual, self.txt_transcript)
+            self.assertEqual(mock_parse.call_count, 1)
+
+            # another transcript is converted on its own
+            transcripts_utils.Transcript.convert(self.srt_transcript.replace('Dream', 'Nightmare'), 'srt', 'txt')
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_sjson_at_speed(self):
+        expected = {
+            'start': [7875, 11250],
+            'end': [9750, 13500],
+            'text': ["Elephant&#39;s Dream", "At the left we can see..."],
+        }
+        for content, input_format in ((self.srt_transcript, 'srt'), (self.sjson_transcript, 'sjson')):
+            actual = transcripts_utils.Transcript.sjson_at_speed(content, input_format, 0.75)
+            self.assertEqual(json.loads(actual), expected)
+
+        # speed 1.0 is the canonical transcript
+        actual = transcripts_utils.Transcript.sjson_at_speed(self.srt_transcript, 'srt')
+        self.assertEqual(json.loads(actual), json.loads(self.sjson_transcript))
+
+    def test_sjson_at_speed_cached(self):
+        with patch(
+            'xmodule.video_module.transcripts_utils.SubRipFile.from_string',
+            wraps=transcripts_utils.SubRipFile.from_string
+        ) as mock_parse:
+            first = transcripts_utils.Transcript.sjson_at_speed(self.srt_transcript, 'srt', 1.5)
+            second = transcripts_utils.Transcript.sjson_at_speed(self.srt_transcript, 'srt', 1.5)
+            self.assertEqual(first, second)
+            self.assertEqual(mock_parse.call_count, 1)
+
+
+class TestConvertedTranscriptsCache(unittest.TestCase):
+    """
+    Tests for the ConvertedTranscriptsCache.
+    """
+    def test_evicts_least_recently_used(self):
+        cache = transcripts_utils.ConvertedTranscriptsCache(max_size=10)
+        convert = Mock(side_effect=lambda: 'x' * 4)
+
+        cache.get_or_convert('a', 'srt', 'txt', 1.0, convert)
+        cache.get_or_convert('b', 'srt', 'txt', 1.0, convert)
+        # 'a' is used again, so 'b' is evicted to make room for 'c'
+        cache.get_or_convert('a', 'srt', 'txt', 1.0, convert)
+        cache.get_or_convert('c', 'srt', 'txt', 1.0, convert)
+        self.assertEqual(convert.call_count, 3)
+
+        cache.get_or_convert('a', 'srt', 'txt', 1.0, convert)
+        self.assertEqual(convert.call_count, 3)
+        cache.get_or_convert('b', 'srt', 'txt', 1.0, convert)
+        self.assertEqual(convert.call_count, 4)
+
+    def test_keyed_by_format_and_speed(self):
+        cache = transcripts_utils.ConvertedTranscriptsCache()
+        convert = Mock(return_value='converted')
+
+        cache.get_or_convert('a', 'srt', 'txt', 1.0, convert)
+        cache.get_or_convert('a', 'srt', 'sjson', 1.0, convert)
+        cache.get_or_convert('a', 'srt', 'sjson', 1.5, convert)
+        cache.get_or_convert('a', 'sjson', 'txt', 1.0, convert)
+        self.assertEqual(convert.call_count, 4)
+
 
 class TestSubsFilename(unittest.TestCase):
     """
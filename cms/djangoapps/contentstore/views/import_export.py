@@ -398,14 +398,13 @@ def create_export_tarball(course_module, course_key, context):
     root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
         logging.debug(u'tar file being generated at %s', export_file.name)
+        # the static assets are streamed into the tarball, so only the xml is written to root_dir
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name, tar_file)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name, tar_file)
 
     except SerializationError as exc:
         log.exception(u'There was an error exporting %s', course_key)
@@ -6,7 +6,6 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 
 """
 import logging
-import pygeoip
 
 from django.core.cache import cache
 from django.conf import settings
@@ -15,7 +14,8 @@ from rest_framework import status
 from ipware.ip import get_ip
 
 from student.auth import has_course_author_access
-from embargo.models import CountryAccessRule, RestrictedCourse
+from embargo.decision_table import decision_table
+from embargo.models import RestrictedCourse
 
 
 log = logging.getLogger(__name__)
@@ -36,7 +36,7 @@ def redirect_if_blocked(course_key, access_point='enrollment', **kwargs):
         is_blocked = not check_course_access(course_key, **kwargs)
         if is_blocked:
             if access_point == "courseware":
-                if not RestrictedCourse.is_disabled_access_check(course_key):
+                if not decision_table.is_disabled_access_check(course_key):
                     return message_url_path(course_key, access_point)
             else:
                 return message_url_path(course_key, access_point)
@@ -66,7 +66,7 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
 
     # First, check whether there are any restrictions on the course.
     # If not, then we do not need to do any further checks
-    course_is_restricted = RestrictedCourse.is_restricted_course(course_key)
+    course_is_restricted = decision_table.is_restricted_course(course_key)
 
     if not course_is_restricted:
         return True
@@ -80,7 +80,7 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
         # and check it against the allowed countries list for a course
         user_country_from_ip = _country_code_from_ip(ip_address)
 
-        if not CountryAccessRule.check_country_access(course_key, user_country_from_ip):
+        if not decision_table.check_country_access(course_key, user_country_from_ip):
             log.info(
                 (
                     u"Blocking user %s from accessing course %s at %s "
@@ -100,7 +100,7 @@ def check_course_access(course_key, user=None, ip_address=None, url=None):
         # and check it against the allowed countries list for a course.
         user_country_from_profile = _get_user_country_from_profile(user)
 
-        if not CountryAccessRule.check_country_access(course_key, user_country_from_profile):
+        if not decision_table.check_country_access(course_key, user_country_from_profile):
             log.info(
                 (
                     u"Blocking user %s from accessing course %s at %s "
@@ -161,7 +161,8 @@ def _get_user_country_from_profile(user):
 def _country_code_from_ip(ip_addr):
     """
     Return the country code associated with an IP address.
-    Handles both IPv4 and IPv6 addresses.
+    Handles both IPv4 and IPv6 addresses.  Lookups are remembered in
+    an in-process LRU.
 
     Args:
         ip_addr (str): The IP address to look up.
@@ -170,10 +171,7 @@ def _country_code_from_ip(ip_addr):
         str: A 2-letter country code.
 
     """
-    if ip_addr.find(':') >= 0:
-        return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
-    else:
-        return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+    return decision_table.country_code_from_ip(ip_addr)
 
 
 def get_embargo_response(request, course_id, user):
@@ -0,0 +1,179 @@
+"""
+In-process, compiled form of the country access rules.
+
+Checking whether a request may access a course otherwise requires a
+GeoIP lookup plus Django cache lookups of the restricted course list and
+of the course's allowed countries on every course request.  The decision
+table instead keeps, in each process:
+
+* the set of restricted courses (with their disable_access_check flag),
+* a bitmap of allowed countries per restricted course, built lazily,
+* an LRU of IP address to country code lookups.
+
+The table is versioned through a single Django cache key, which is bumped
+whenever a RestrictedCourse or CountryAccessRule is saved or deleted, so
+that every process rebuilds its table after a rules change.  The version
+is read at most once per request.  The IP address lookups don't depend on
+the rules, so they are kept across rebuilds.
+
+"""
+import uuid
+
+import pygeoip
+from django.conf import settings
+from django.core.cache import cache
+
+import request_cache
+from xmodule.util.lru import LRUCache
+from embargo.models import CountryAccessRule, RestrictedCourse
+
+
+# Bit assigned to each known country code in the allowed-country bitmaps.
+COUNTRY_BITS = {
+    country_code: 1 << index
+    for index, country_code in enumerate(sorted(CountryAccessRule.ALL_COUNTRIES))
+}
+
+DEFAULT_IP_COUNTRY_CACHE_SIZE = 10000
+
+
+class CountryAccessDecisionTable(object):
+    """
+    Answers the country access questions of the embargo api from data
+    compiled in-process.
+    """
+    VERSION_CACHE_KEY = 'embargo.decision_table.version'
+    REQUEST_CACHE_NAME = 'embargo.decision_table'
+
+    def __init__(self):
+        self._version = None
+
+        # {unicode(course_key): disable_access_check}, or None until loaded.
+        self._restricted_courses = None
+
+        # {unicode(course_key): bitmap of COUNTRY_BITS allowed for the course}
+        self._allowed_countries = {}
+
+        self._ip_countries = LRUCache(
+            getattr(settings, 'EMBARGO_IP_COUNTRY_CACHE_SIZE', DEFAULT_IP_COUNTRY_CACHE_SIZE)
+        )
+        self._geoip_readers = {}
+
+    def is_restricted_course(self, course_key):
+        """
+        Returns whether there are country access rules for the course.
+        """
+        return unicode(course_key) in self._get_restricted_courses()
+
+    def is_disabled_access_check(self, course_key):
+        """
+        Returns whether the restricted course allows users who enrolled from an
+        allowed country to access it from excluded countries.
+        """
+        return self._get_restricted_courses().get(unicode(course_key), False)
+
+    def check_country_access(self, course_key, country):
+        """
+        Returns whether users from the country may access the course.
+
+        Same semantics as CountryAccessRule.check_country_access: unknown
+        country codes (e.g. continent codes returned by GeoIP) are allowed.
+        """
+        country_bit = COUNTRY_BITS.get(country)
+        if country_bit is None:
+            return True
+        return bool(self._get_allowed_countries(course_key) & country_bit)
+
+    def country_code_from_ip(self, ip_addr):
+        """
+        Return the country code associated with an IPv4 or IPv6 address.
+        """
+        country_code = self._ip_countries.get(ip_addr)
+        if country_code is None:
+            geoip_path = settings.GEOIPV6_PATH if ip_addr.find(':') >= 0 else settings.GEOIP_PATH
+            reader = self._geoip_readers.get(geoip_path)
+            if reader is None:
+                reader = self._geoip_readers[geoip_path] = pygeoip.GeoIP(geoip_path)
+            # GeoIP returns None for addresses it can't locate; store those as
+            # '' so that they are cached as well.
+            country_code = reader.country_code_by_addr(ip_addr) or ''
+            self._ip_countries.set(ip_addr, country_code)
+        return country_code or None
+
+    def invalidate(self):
+        """
+        Discard the compiled table in this and every other process.
+        """
+        version = uuid.uuid4().hex
+        cache.set(self.VERSION_CACHE_KEY, version, None)
+        request_cache.get_cache(self.REQUEST_CACHE_NAME)['version'] = version
+        self._reset(version)
+
+    def _check_version(self):
+        """
+        Discard the compiled table if the rules changed since it was built.
+
+        Within a request, the version is only read from the cache once.
+        """
+        # Outside of a request (e.g. in a celery task) nothing clears the
+        # request cache, so read the version every time.
+        if request_cache.get_request() is None:
+            version = self._get_version()
+        else:
+            cached = request_cache.get_cache(self.REQUEST_CACHE_NAME)
+            version = cached.get('version')
+            if version is None:
+                version = cached['version'] = self._get_version()
+        if version != self._version:
+            self._reset(version)
+
+    def _get_version(self):
+        """
+        Returns the current version of the rules, initializing it if needed.
+        """
+        version = cache.get(self.VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(self.VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(self.VERSION_CACHE_KEY)
+        return version
+
+    def _reset(self, version):
+        """
+        Empty the compiled table, tagging it with the given version.
+        """
+        self._version = version
+        self._restricted_courses = None
+        self._allowed_countries = {}
+
+    def _get_restricted_courses(self):
+        """
+        Returns the restricted courses, loading them in one query if needed.
+        """
+        self._check_version()
+        if self._restricted_courses is None:
+            self._restricted_courses = {
+                unicode(course_key): disable_access_check
+                for course_key, disable_access_check in RestrictedCourse.objects.values_list(
+                    'course_key', 'disable_access_check'
+                )
+            }
+        return self._restricted_courses
+
+    def _get_allowed_countries(self, course_key):
+        """
+        Returns the bitmap of countries allowed to access the course, compiling
+        it from the course's rules in one query if needed.
+        """
+        self._check_version()
+        course_id = unicode(course_key)
+        allowed_countries = self._allowed_countries.get(course_id)
+        if allowed_countries is None:
+            allowed_countries = 0
+            for country in CountryAccessRule._get_country_access_list(course_key):  # pylint: disable=protected-access
+                allowed_countries |= COUNTRY_BITS.get(country, 0)
+            self._allowed_countries[course_id] = allowed_countries
+        return allowed_countries
+
+
+# The decision table of this process.
+decision_table = CountryAccessDecisionTable()  # pylint: disable=invalid-name
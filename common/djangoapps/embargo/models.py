@@ -545,6 +545,10 @@ def invalidate_country_rule_cache(sender, instance, **kwargs):  # pylint: disabl
             being saved or deleted.
 
     """
+    # Import here to avoid a circular import.
+    from embargo.decision_table import decision_table
+    decision_table.invalidate()
+
     if isinstance(instance, RestrictedCourse):
         # If a restricted course changed, we need to update the list
         # of which courses are restricted as well as any rules
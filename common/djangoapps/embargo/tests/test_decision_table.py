@@ -0,0 +1,103 @@
+"""Tests for the in-process country access decision table. """
+import mock
+import pygeoip
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.client import RequestFactory
+from opaque_keys.edx.locator import CourseLocator
+
+from request_cache.middleware import RequestCache
+from embargo.decision_table import CountryAccessDecisionTable
+from embargo.models import Country, CountryAccessRule, RestrictedCourse
+
+
+class CountryAccessDecisionTableTest(TestCase):
+    """Test the compiled country access rules. """
+
+    def setUp(self):
+        super(CountryAccessDecisionTableTest, self).setUp()
+        self.course_key = CourseLocator('abc', '123', 'doremi')
+        self.restricted_course = RestrictedCourse.objects.create(course_key=self.course_key)
+        self.table = CountryAccessDecisionTable()
+        cache.clear()
+
+    def _add_rule(self, rule_type, country_code):
+        """Add a country access rule for the restricted course. """
+        CountryAccessRule.objects.create(
+            rule_type=rule_type,
+            restricted_course=self.restricted_course,
+            country=Country.objects.get_or_create(country=country_code)[0],
+        )
+
+    def test_restricted_courses(self):
+        self.assertTrue(self.table.is_restricted_course(self.course_key))
+        self.assertFalse(self.table.is_restricted_course(CourseLocator('abc', '123', 'other')))
+        self.assertFalse(self.table.is_disabled_access_check(self.course_key))
+
+        # The table is rebuilt once the restricted course changes.
+        self.restricted_course.disable_access_check = True
+        self.restricted_course.save()
+        self.assertTrue(self.table.is_disabled_access_check(self.course_key))
+
+    def test_check_country_access(self):
+        self._add_rule(CountryAccessRule.WHITELIST_RULE, 'US')
+        self._add_rule(CountryAccessRule.WHITELIST_RULE, 'IR')
+        self._add_rule(CountryAccessRule.BLACKLIST_RULE, 'IR')
+
+        self.assertTrue(self.table.check_country_access(self.course_key, 'US'))
+        self.assertFalse(self.table.check_country_access(self.course_key, 'IR'))
+        self.assertFalse(self.table.check_country_access(self.course_key, 'CU'))
+
+        # Unknown countries, like continent codes, are allowed.
+        self.assertTrue(self.table.check_country_access(self.course_key, 'EU'))
+        self.assertTrue(self.table.check_country_access(self.course_key, ''))
+        self.assertTrue(self.table.check_country_access(self.course_key, None))
+
+    def test_compiled_once(self):
+        self._add_rule(CountryAccessRule.BLACKLIST_RULE, 'CU')
+        with self.assertNumQueries(2):
+            self.assertFalse(self.table.check_country_access(self.course_key, 'CU'))
+            self.assertTrue(self.table.is_restricted_course(self.course_key))
+        with self.assertNumQueries(0):
+            self.assertFalse(self.table.check_country_access(self.course_key, 'CU'))
+            self.assertTrue(self.table.is_restricted_course(self.course_key))
+
+        # Rule changes invalidate the table.
+        self._add_rule(CountryAccessRule.BLACKLIST_RULE, 'US')
+        self.assertFalse(self.table.check_country_access(self.course_key, 'US'))
+
+    def test_version_checked_once_per_request(self):
+        request = RequestFactory().get('/')
+        RequestCache().process_request(request)
+        self.addCleanup(RequestCache.clear_request_cache)
+        cache.set(CountryAccessDecisionTable.VERSION_CACHE_KEY, 'version', None)
+
+        with mock.patch('embargo.decision_table.cache.get', wraps=cache.get) as mock_get:
+            self.assertTrue(self.table.is_restricted_course(self.course_key))
+            self.assertTrue(self.table.check_country_access(self.course_key, 'US'))
+            self.assertFalse(self.table.is_disabled_access_check(self.course_key))
+            self.assertEqual(mock_get.call_count, 1)
+
+            # The next request reads the version again.
+            RequestCache().process_request(request)
+            self.assertTrue(self.table.is_restricted_course(self.course_key))
+            self.assertEqual(mock_get.call_count, 2)
+
+    def test_ip_lookups_kept_across_rebuilds(self):
+        with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
+            mock_ip.return_value = 'US'
+            self.assertEqual(self.table.country_code_from_ip('1.2.3.4'), 'US')
+            self.table.invalidate()
+            self.assertEqual(self.table.country_code_from_ip('1.2.3.4'), 'US')
+            self.assertEqual(mock_ip.call_count, 1)
+
+    def test_ip_lookups_cached(self):
+        with mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr') as mock_ip:
+            mock_ip.return_value = 'US'
+            self.assertEqual(self.table.country_code_from_ip('1.2.3.4'), 'US')
+            self.assertEqual(self.table.country_code_from_ip('1.2.3.4'), 'US')
+            mock_ip.return_value = None
+            self.assertIsNone(self.table.country_code_from_ip('5.6.7.8'))
+            self.assertIsNone(self.table.country_code_from_ip('5.6.7.8'))
+            self.assertEqual(mock_ip.call_count, 2)
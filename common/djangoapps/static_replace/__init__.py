@@ -30,13 +30,64 @@ def _url_replace_regex(prefix):
         """.format(prefix=prefix)
 
 
+# Per-process memo of staticfiles_storage lookups, which are otherwise
+# repeated for every static url of every rendered module. The memo is
+# discarded whenever staticfiles_storage is replaced (e.g., in tests), and
+# cleared once it grows beyond STATICFILES_LOOKUP_CACHE_SIZE entries.
+STATICFILES_LOOKUP_CACHE_SIZE = 10000
+_staticfiles_lookup_cache = {'storage': None, 'lookups': {}}
+
+# Memos of compiled url regexes and rewriters, keyed by their configuration.
+_compiled_url_replace_regexes = {}
+_url_rewriters = {}
+
+
+def _memoized_staticfiles_lookup(method_name, path):
+    """
+    Returns staticfiles_storage.<method_name>(path), memoized per process.
+
+    Lookups are not memoized in DEBUG mode, where static files may change
+    while the process is running. Exceptions raised by the storage are
+    propagated and not memoized.
+    """
+    if settings.DEBUG:
+        return getattr(staticfiles_storage, method_name)(path)
+
+    if _staticfiles_lookup_cache['storage'] is not staticfiles_storage:
+        _staticfiles_lookup_cache['storage'] = staticfiles_storage
+        _staticfiles_lookup_cache['lookups'] = {}
+
+    lookups = _staticfiles_lookup_cache['lookups']
+    key = (method_name, path)
+    if key not in lookups:
+        value = getattr(staticfiles_storage, method_name)(path)
+        if len(lookups) >= STATICFILES_LOOKUP_CACHE_SIZE:
+            lookups.clear()
+        lookups[key] = value
+    return lookups[key]
+
+
+def staticfiles_exists(path):
+    """
+    Memoized version of staticfiles_storage.exists.
+    """
+    return _memoized_staticfiles_lookup('exists', path)
+
+
+def staticfiles_url(path):
+    """
+    Memoized version of staticfiles_storage.url.
+    """
+    return _memoized_staticfiles_lookup('url', path)
+
+
 def try_staticfiles_lookup(path):
     """
     Try to lookup a path in staticfiles_storage.  If it fails, return
     a dead link instead of raising an exception.
     """
     try:
-        url = staticfiles_storage.url(path)
+        url = staticfiles_url(path)
     except Exception as err:
         log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
             path, str(err)))
@@ -45,6 +96,30 @@ def try_staticfiles_lookup(path):
     return url
 
 
+def _compiled_url_replace_regex(prefix):
+    """
+    Returns the compiled _url_replace_regex for the given prefix.
+    """
+    # re caches compiled patterns too, but only a hundred of them, which
+    # are all thrown away once the limit is reached.
+    regex = _compiled_url_replace_regexes.get(prefix)
+    if regex is None:
+        regex = re.compile(_url_replace_regex(prefix))
+        _compiled_url_replace_regexes[prefix] = regex
+    return regex
+
+
+def _static_url_prefix(data_dir):
+    """
+    Returns the _url_replace_regex prefix that matches static urls which
+    aren't already pointing into the data_dir.
+    """
+    return u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+        static_url=settings.STATIC_URL,
+        data_dir=data_dir
+    )
+
+
 def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
     """
     This will replace a link to another piece of courseware to a 'jump_to'
@@ -71,7 +146,7 @@ def replace_jump_to_id_urls(text, course_id, jump_to_id_base_url):
         rest = match.group('rest')
         return "".join([quote, jump_to_id_base_url + rest, quote])
 
-    return re.sub(_url_replace_regex('/jump_to_id/'), replace_jump_to_id_url, text)
+    return _compiled_url_replace_regex('/jump_to_id/').sub(replace_jump_to_id_url, text)
 
 
 def replace_course_urls(text, course_key):
@@ -91,7 +166,7 @@ def replace_course_urls(text, course_key):
         rest = match.group('rest')
         return "".join([quote, '/courses/' + course_id + '/', rest, quote])
 
-    return re.sub(_url_replace_regex('/course/'), replace_course_url, text)
+    return _compiled_url_replace_regex('/course/').sub(replace_course_url, text)
 
 
 def process_static_urls(text, replacement_function, data_dir=None):
@@ -110,14 +185,7 @@ def process_static_urls(text, replacement_function, data_dir=None):
         rest = match.group('rest')
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
-            static_url=settings.STATIC_URL,
-            data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+    return _compiled_url_replace_regex(_static_url_prefix(data_dir)).sub(wrap_part_extraction, text)
 
 
 def make_static_urls_absolute(request, html):
@@ -137,18 +205,22 @@ def make_static_urls_absolute(request, html):
     )
 
 
-def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+def _static_url_replacer(data_directory=None, course_id=None, static_asset_path=''):
     """
-    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
-    (/static/$md5_hashed_stuff) or by the course-specific content static url
-    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
-    correct url in the contentstore (/c4x/.. or /asset-loc:..)
-
-    text: The source text to do the substitution in
-    data_directory: The directory in which course data is stored
-    course_id: The course identifier used to distinguish static content for this course in studio
-    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    Returns a function that replaces a single static url matched by
+    process_static_urls, as described in replace_static_urls.
     """
+    # The modulestore type of the course is only looked up once per
+    # replacer, and only if a url needs it.
+    is_xml_course = []
+
+    def course_is_xml():
+        """
+        Returns whether the course is stored in an XML modulestore.
+        """
+        if not is_xml_course:
+            is_xml_course.append(modulestore().get_modulestore_type(course_id) == ModuleStoreEnum.Type.xml)
+        return is_xml_course[0]
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -164,19 +236,19 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
         # if we're running with a MongoBacked store course_namespace is not None, then use studio style urls
         elif (not static_asset_path) \
                 and course_id \
-                and modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml:
+                and not course_is_xml():
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
             exists_in_staticfiles_storage = False
             try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                exists_in_staticfiles_storage = staticfiles_exists(rest)
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
                     rest, str(err)))
 
             if exists_in_staticfiles_storage:
-                url = staticfiles_storage.url(rest)
+                url = staticfiles_url(rest)
             else:
                 # if not, then assume it's courseware specific content and then look in the
                 # Mongo-backed database
@@ -190,10 +262,10 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             course_path = "/".join((static_asset_path or data_directory, rest))
 
             try:
-                if staticfiles_storage.exists(rest):
-                    url = staticfiles_storage.url(rest)
+                if staticfiles_exists(rest):
+                    url = staticfiles_url(rest)
                 else:
-                    url = staticfiles_storage.url(course_path)
+                    url = staticfiles_url(course_path)
             # And if that fails, assume that it's course content, and add manually data directory
             except Exception as err:
                 log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
@@ -202,4 +274,100 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
 
         return "".join([quote, url, quote])
 
-    return process_static_urls(text, replace_static_url, data_dir=static_asset_path or data_directory)
+    return replace_static_url
+
+
+def replace_static_urls(text, data_directory=None, course_id=None, static_asset_path=''):
+    """
+    Replace /static/$stuff urls either with their correct url as generated by collectstatic,
+    (/static/$md5_hashed_stuff) or by the course-specific content static url
+    /static/$course_data_dir/$stuff, or, if course_namespace is not None, by the
+    correct url in the contentstore (/c4x/.. or /asset-loc:..)
+
+    text: The source text to do the substitution in
+    data_directory: The directory in which course data is stored
+    course_id: The course identifier used to distinguish static content for this course in studio
+    static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+    """
+    return process_static_urls(
+        text,
+        _static_url_replacer(data_directory, course_id, static_asset_path),
+        data_dir=static_asset_path or data_directory
+    )
+
+
+class CourseUrlRewriter(object):
+    """
+    Rewrites the /static/, /course/ and /jump_to_id/ urls of a course's
+    content in a single scan of the text, with the same results as applying
+    replace_static_urls, replace_course_urls and replace_jump_to_id_urls
+    in turn.
+
+    Use get_course_url_rewriter to get a rewriter, so that its regex is
+    only compiled once per configuration.
+    """
+    def __init__(self, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+        """
+        course_id: The course in which the rewrite happens
+        data_directory: The directory in which course data is stored
+        static_asset_path: Path for static assets, which overrides data_directory, if nonempty
+        jump_to_id_base_url: The base url of the jump_to_id handler. If None,
+            /jump_to_id/ urls are left unchanged.
+        """
+        self.course_id = course_id
+        self.data_directory = data_directory
+        self.static_asset_path = static_asset_path
+        self.jump_to_id_base_url = jump_to_id_base_url
+        self.course_url_base = '/courses/' + course_id.to_deprecated_string() + '/'
+
+        prefixes = [
+            u'(?P<static>{})'.format(_static_url_prefix(static_asset_path or data_directory)),
+            u'(?P<course>/course/)',
+        ]
+        if jump_to_id_base_url is not None:
+            prefixes.append(u'(?P<jump_to_id>/jump_to_id/)')
+        self.regex = re.compile(_url_replace_regex(u'|'.join(prefixes)))
+
+    def rewrite(self, text):
+        """
+        Returns text with all the course's urls rewritten.
+        """
+        replace_static_url = _static_url_replacer(self.data_directory, self.course_id, self.static_asset_path)
+
+        def replace_url(match):
+            """
+            Replaces a single matched url according to its family.
+            """
+            quote = match.group('quote')
+            rest = match.group('rest')
+            if match.group('static') is not None:
+                return replace_static_url(match.group(0), match.group('prefix'), quote, rest)
+            elif match.group('course') is not None:
+                return "".join([quote, self.course_url_base, rest, quote])
+            else:
+                return "".join([quote, self.jump_to_id_base_url + rest, quote])
+
+        return self.regex.sub(replace_url, text)
+
+
+def get_course_url_rewriter(course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Returns the CourseUrlRewriter for the given configuration, reusing the
+    one compiled by a previous call if there is one.
+    """
+    key = (course_id, data_directory, static_asset_path, jump_to_id_base_url, settings.STATIC_URL)
+    rewriter = _url_rewriters.get(key)
+    if rewriter is None:
+        if len(_url_rewriters) >= STATICFILES_LOOKUP_CACHE_SIZE:
+            _url_rewriters.clear()
+        rewriter = CourseUrlRewriter(course_id, data_directory, static_asset_path, jump_to_id_base_url)
+        _url_rewriters[key] = rewriter
+    return rewriter
+
+
+def replace_urls(text, course_id, data_directory=None, static_asset_path='', jump_to_id_base_url=None):
+    """
+    Rewrite the /static/, /course/ and /jump_to_id/ urls in text in a single
+    pass. See CourseUrlRewriter.
+    """
+    return get_course_url_rewriter(course_id, data_directory, static_asset_path, jump_to_id_base_url).rewrite(text)
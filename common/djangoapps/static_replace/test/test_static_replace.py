@@ -4,6 +4,9 @@ from nose.tools import assert_equals, assert_true, assert_false  # pylint: disab
 from static_replace import (
     replace_static_urls,
     replace_course_urls,
+    replace_jump_to_id_urls,
+    replace_urls,
+    get_course_url_rewriter,
     _url_replace_regex,
     process_static_urls,
     make_static_urls_absolute
@@ -17,6 +20,12 @@ from xmodule.modulestore.xml import XMLModuleStore
 DATA_DIRECTORY = 'data_dir'
 COURSE_KEY = SlashSeparatedCourseKey('org', 'course', 'run')
 STATIC_SOURCE = '"/static/file.png"'
+JUMP_TO_ID_BASE_URL = '/courses/org/course/run/jump_to_id/'
+MIXED_SOURCE = (
+    '<img src="/static/file.png"/><a href="/course/info">info</a>'
+    '<a href=\'/jump_to_id/intro\'>intro</a><img src="/static/raw.png?raw"/>'
+    '<img src="/static/data_dir/other.png"/>'
+)
 
 
 def test_multi_replace():
@@ -161,3 +170,46 @@ def test_regex():
     for s in no:
         print 'Should not match: {0!r}'.format(s)
         assert_false(re.match(regex, s))
+
+
+@patch('static_replace.modulestore', autospec=True)
+def test_replace_urls_single_pass(mock_modulestore):
+    """
+    Make sure replace_urls gives the same result as the three separate replacements.
+    """
+    mock_modulestore.return_value = Mock(XMLModuleStore)
+    mock_modulestore.return_value.get_modulestore_type.return_value = 'xml'
+    expected = replace_jump_to_id_urls(
+        replace_course_urls(replace_static_urls(MIXED_SOURCE, DATA_DIRECTORY, COURSE_KEY), COURSE_KEY),
+        COURSE_KEY,
+        JUMP_TO_ID_BASE_URL,
+    )
+    assert_equals(
+        expected,
+        replace_urls(MIXED_SOURCE, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=JUMP_TO_ID_BASE_URL)
+    )
+
+    # /jump_to_id/ urls are left alone without a base url
+    assert_true(
+        '/jump_to_id/intro' in replace_urls(MIXED_SOURCE, COURSE_KEY, DATA_DIRECTORY)
+    )
+
+
+def test_course_url_rewriter_reused():
+    assert_true(
+        get_course_url_rewriter(COURSE_KEY, DATA_DIRECTORY) is get_course_url_rewriter(COURSE_KEY, DATA_DIRECTORY)
+    )
+    assert_false(
+        get_course_url_rewriter(COURSE_KEY, DATA_DIRECTORY) is get_course_url_rewriter(COURSE_KEY, 'other_dir')
+    )
+
+
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_staticfiles_lookups_memoized(mock_storage):
+    mock_storage.exists.return_value = True
+    mock_storage.url.return_value = '/static/file.abc123.png'
+
+    for __ in range(3):
+        assert_equals('"/static/file.abc123.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY))
+    mock_storage.exists.assert_called_once_with('file.png')
+    mock_storage.url.assert_called_once_with('file.png')
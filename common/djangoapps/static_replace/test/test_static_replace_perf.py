@@ -0,0 +1,72 @@
+"""
+Performance test comparing the separate static_replace rewrites with the
+single-pass replace_urls on large HTML units.
+"""
+import time
+import unittest
+
+from mock import patch, Mock
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xmodule.modulestore.xml import XMLModuleStore
+
+from static_replace import replace_static_urls, replace_course_urls, replace_jump_to_id_urls, replace_urls
+
+COURSE_KEY = SlashSeparatedCourseKey('org', 'course', 'run')
+DATA_DIRECTORY = 'data_dir'
+JUMP_TO_ID_BASE_URL = '/courses/org/course/run/jump_to_id/'
+
+# Number of url-bearing paragraphs in the generated HTML units.
+PARAGRAPH_COUNTS = (10, 100, 1000, 10000)
+REPETITIONS = 10
+
+PARAGRAPH = (
+    u'<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit. <img src="/static/images/figure_{0}.png"/> '
+    u'See <a href="/course/wiki/page_{0}">the wiki</a> or <a href="/jump_to_id/block_{0}">the exercise</a>.</p>\n'
+)
+
+
+@unittest.skip
+class StaticReplacePerformance(unittest.TestCase):
+    """
+    Times rewriting the urls of generated HTML units of increasing size.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def _time(self, func, html):
+        """
+        Returns the average seconds spent running func on html.
+        """
+        start = time.time()
+        for __ in range(REPETITIONS):
+            func(html)
+        return (time.time() - start) / REPETITIONS
+
+    @patch('static_replace.modulestore', autospec=True)
+    def test_replace_urls(self, mock_modulestore):
+        mock_modulestore.return_value = Mock(XMLModuleStore)
+        mock_modulestore.return_value.get_modulestore_type.return_value = 'xml'
+
+        def separate_passes(html):
+            """
+            The three rewrites, as previously applied by module_render.
+            """
+            html = replace_static_urls(html, DATA_DIRECTORY, course_id=COURSE_KEY)
+            html = replace_course_urls(html, COURSE_KEY)
+            return replace_jump_to_id_urls(html, COURSE_KEY, JUMP_TO_ID_BASE_URL)
+
+        def single_pass(html):
+            """
+            The combined rewrite.
+            """
+            return replace_urls(html, COURSE_KEY, DATA_DIRECTORY, jump_to_id_base_url=JUMP_TO_ID_BASE_URL)
+
+        separate_passes_seconds = single_pass_seconds = 0
+        for paragraph_count in PARAGRAPH_COUNTS:
+            html = u''.join(PARAGRAPH.format(index) for index in range(paragraph_count))
+            self.assertEqual(separate_passes(html), single_pass(html))
+            separate_passes_seconds += self._time(separate_passes, html)
+            single_pass_seconds += self._time(single_pass, html)
+
+        self.assertLess(single_pass_seconds, separate_passes_seconds)
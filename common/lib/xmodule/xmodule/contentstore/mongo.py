@@ -2,7 +2,13 @@
 MongoDB/GridFS-level code for the contentstore.
 """
 import os
+import errno
 import json
+import calendar
+import tarfile
+from collections import deque
+from multiprocessing.pool import ThreadPool
+from cStringIO import StringIO
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
@@ -18,6 +24,29 @@ from xmodule.util.misc import escape_invalid_characters
 from xmodule.mongo_connection import connect_to_mongodb
 from .content import StaticContent, ContentStore, StaticContentStream
 
+# Number of assets read from GridFS concurrently by export_all_for_course.
+EXPORT_ASSET_WORKERS = 4
+
+
+def _imap_bounded(func, items, workers):
+    """
+    Yields func(item) for each of the items, in order, calling func from a pool of worker
+    threads. At most 2 * workers results are computed ahead of the one being consumed, which
+    bounds the memory used when the results are large (e.g. asset contents).
+    """
+    pool = ThreadPool(workers)
+    try:
+        pending = deque()
+        for item in items:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(func, (item,)))
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
 
 class MongoContentStore(ContentStore):
     """
@@ -134,36 +163,70 @@ class MongoContentStore(ContentStore):
     def export(self, location, output_directory):
         content = self.find(location)
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
-
-        if not os.path.exists(output_directory):
+        output_directory, export_name = self._export_path(content, output_directory)
+        try:
             os.makedirs(output_directory)
-
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
+        except OSError as err:
+            # assets are exported concurrently, so another one may have just created the directory
+            if err.errno != errno.EEXIST:
+                raise
 
         disk_fs = OSFS(output_directory)
 
         with disk_fs.open(export_name, 'wb') as asset_file:
             asset_file.write(content.data)
 
-    def export_all_for_course(self, course_key, output_directory, assets_policy_file):
+    def export_to_tarball(self, content, output_directory, tar_file):
+        """
+        Adds the asset content to the open tarfile.TarFile tar_file, under the same path relative to
+        output_directory (here a directory of the archive) as export() would write it on disk.
+        """
+        output_directory, export_name = self._export_path(content, output_directory)
+        tar_info = tarfile.TarInfo(os.path.join(output_directory, export_name))
+        tar_info.size = len(content.data)
+        tar_info.mode = 0644
+        if content.last_modified_at is not None:
+            tar_info.mtime = calendar.timegm(content.last_modified_at.utctimetuple())
+        tar_file.addfile(tar_info, StringIO(content.data))
+
+    @staticmethod
+    def _export_path(content, output_directory):
+        """
+        Returns the (directory, filename) under which to export the asset content.
+        """
+        if content.import_path is not None:
+            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
+
+        # Escape invalid char from filename.
+        export_name = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+        return output_directory, export_name
+
+    def export_all_for_course(self, course_key, output_directory, assets_policy_file, tar_file=None):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
         attributes to the policy file.
 
+        Assets are read from GridFS by EXPORT_ASSET_WORKERS threads at once.
+
         Args:
             course_key (CourseKey): the :class:`CourseKey` identifying the course
             output_directory: the directory under which to put all the asset files
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
+            tar_file (tarfile.TarFile): if given, the asset files are streamed into this open
+                archive, output_directory being their directory inside it, rather than written
+                to disk. The policy file is still written to disk.
         """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
         for asset in assets:
+            for attr, value in asset.iteritems():
+                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+
+        asset_keys = [asset['asset_key'] for asset in assets]
+        if tar_file is None:
             # TODO: On 6/19/14, I had to put a try/except around this
             # to export a course. The course failed on JSON files in
             # the /static/ directory placed in it with an import.
@@ -172,10 +235,13 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+            for __ in _imap_bounded(lambda asset_key: self.export(asset_key, output_directory), asset_keys,
+                                    EXPORT_ASSET_WORKERS):
+                pass
+        else:
+            # the archive is written sequentially: only the reads are concurrent
+            for content in _imap_bounded(self.find, asset_keys, EXPORT_ASSET_WORKERS):
+                self.export_to_tarball(content, output_directory, tar_file)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
@@ -1224,6 +1224,13 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
                 None
             )
 
+    def get_parent_locations(self, locations, **kwargs):
+        """
+        Returns {location: its parent location, or None} for all the given locations.
+        Stores which can find many parents at once should override this.
+        """
+        return {location: self.get_parent_location(location, **kwargs) for location in locations}
+
     def has_published_version(self, xblock):
         """
         Returns True since this is a read-only store.
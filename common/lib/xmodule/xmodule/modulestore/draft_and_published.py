@@ -85,6 +85,19 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin, BulkOperationsMixin):
     def publish(self, location, user_id):
         raise NotImplementedError
 
+    def publish_many(self, locations, user_id, **kwargs):
+        """
+        Publishes the subtrees rooted at each of the locations, which must all be in the same
+        course, signalling course_published once. Returns the list of the newly published items.
+
+        This default publishes each location in turn within one bulk operation; stores which can
+        publish several subtrees at once override it.
+        """
+        if not locations:
+            return []
+        with self.bulk_operations(locations[0].course_key):
+            return [self.publish(location, user_id, **kwargs) for location in locations]
+
     @abstractmethod
     def unpublish(self, location, user_id):
         """
@@ -6,6 +6,7 @@ In this way, courses can be served up both - say - XMLModuleStore or MongoModule
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -536,6 +537,21 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courselike(location.course_key)
         return store.get_parent_location(location, **kwargs)
 
+    @strip_key
+    def get_parent_locations(self, locations, **kwargs):
+        """
+        returns {location: its parent location, or None} for the given locations, asking
+        each store for the parents of all its locations at once
+        """
+        locations_by_store = defaultdict(list)
+        for location in locations:
+            locations_by_store[self._get_modulestore_for_courselike(location.course_key)].append(location)
+
+        parents = {}
+        for store, store_locations in locations_by_store.iteritems():
+            parents.update(store.get_parent_locations(store_locations, **kwargs))
+        return parents
+
     def get_block_original_usage(self, usage_key):
         """
         If a block was inherited into another structure using copy_from_template,
@@ -835,6 +851,17 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(location.course_key, 'publish')
         return store.publish(location, user_id, **kwargs)
 
+    @strip_key
+    def publish_many(self, locations, user_id, **kwargs):
+        """
+        Save the current drafts of several subtrees of one course to the underlying modulestore
+        Returns the list of newly published items.
+        """
+        if not locations:
+            return []
+        store = self._verify_modulestore_support(locations[0].course_key, 'publish_many')
+        return store.publish_many(locations, user_id, **kwargs)
+
     @strip_key
     def unpublish(self, location, user_id, **kwargs):
         """
@@ -17,9 +17,12 @@ import sys
 import logging
 import copy
 import re
+import time
+import dogstats_wrapper as dog_stats_api
 from uuid import uuid4
 
 from bson.son import SON
+from collections import defaultdict
 from datetime import datetime
 from fs.osfs import OSFS
 from mongodb_proxy import autoretry_read
@@ -49,6 +52,7 @@ from xmodule.modulestore.draft_and_published import ModuleStoreDraftAndPublished
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseError, ReferentialIntegrityError
 from xmodule.modulestore.inheritance import InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.mongo.inheritance_tree import serialize_inheritance_tree, deserialize_inheritance_tree
 from xmodule.modulestore.xml import CourseLocationManager
 from xmodule.services import SettingsService
 
@@ -73,6 +77,10 @@ BLOCK_TYPES_WITH_CHILDREN = list(set(
 # Allow us to call _from_deprecated_(son|string) throughout the file
 # pylint: disable=protected-access
 
+# how long, in seconds, a process may hold the lock on patching the cached
+# inheritance tree of a course (see refresh_cached_metadata_inheritance_subtree)
+INHERITANCE_TREE_LOCK_TIMEOUT = 60
+
 # at module level, cache one instance of OSFS per filesystem root.
 _OSFS_INSTANCE = {}
 
@@ -665,18 +673,24 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         else:
             return ParentLocationCache()
 
-    def _compute_metadata_inheritance_tree(self, course_id):
-        '''
-        Find all inheritable fields from all xblocks in the course which may define inheritable data
-        '''
+    def _get_inheritance_records(self, course_id, block_names=None):
+        """
+        Find the records, with their children and inheritable metadata, of the blocks in the
+        course which may define inheritable data (those which have children). If block_names is
+        given, only get the blocks with those names.
+
+        Returns a tuple of the records by location url, with the draft and published versions of
+        each block merged, and of the url of the course root (None if the root wasn't found).
+        """
         # get all collections in the course, this query should not return any leaf nodes
-        course_id = self.fill_in_run(course_id)
         query = SON([
             ('_id.tag', 'i4x'),
             ('_id.org', course_id.org),
             ('_id.course', course_id.course),
             ('_id.category', {'$in': BLOCK_TYPES_WITH_CHILDREN})
         ])
+        if block_names is not None:
+            query['_id.name'] = {'$in': list(block_names)}
         # if we're only dealing in the published branch, then only get published containers
         if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only:
             query['_id.revision'] = None
@@ -716,80 +730,204 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if location.category == 'course':
                 root = location_url
 
-        # now traverse the tree and compute down the inherited metadata
-        metadata_to_inherit = {}
+        return results_by_url, root
 
-        def _compute_inherited_metadata(url):
-            """
-            Helper method for computing inherited metadata for a specific location url
-            """
-            my_metadata = results_by_url[url].get('metadata', {})
-
-            # go through all the children and recurse, but only if we have
-            # in the result set. Remember results will not contain leaf nodes
-            for child in results_by_url[url].get('definition', {}).get('children', []):
-                if child in results_by_url:
-                    new_child_metadata = copy.deepcopy(my_metadata)
-                    new_child_metadata.update(results_by_url[child].get('metadata', {}))
-                    results_by_url[child]['metadata'] = new_child_metadata
-                    metadata_to_inherit[child] = new_child_metadata
-                    _compute_inherited_metadata(child)
-                else:
-                    # this is likely a leaf node, so let's record what metadata we need to inherit
-                    metadata_to_inherit[child] = my_metadata.copy()
-                # WARNING: 'parent' is not part of inherited metadata, but
-                # we're piggybacking on this recursive traversal to grab
-                # and cache the child's parent, as a performance optimization.
-                # The 'parent' key will be popped out of the dictionary during
-                # CachingDescriptorSystem.load_item
-                metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+    def _propagate_inherited_metadata(self, results_by_url, url, metadata_to_inherit):
+        """
+        Computes down the metadata inherited by the descendants of the block at url (whose record
+        metadata must already include what it inherits), recording it in metadata_to_inherit.
+        """
+        my_metadata = results_by_url[url].get('metadata', {})
 
+        # go through all the children and recurse, but only if we have
+        # in the result set. Remember results will not contain leaf nodes
+        for child in results_by_url[url].get('definition', {}).get('children', []):
+            if child in results_by_url:
+                new_child_metadata = copy.deepcopy(my_metadata)
+                new_child_metadata.update(results_by_url[child].get('metadata', {}))
+                results_by_url[child]['metadata'] = new_child_metadata
+                metadata_to_inherit[child] = new_child_metadata
+                self._propagate_inherited_metadata(results_by_url, child, metadata_to_inherit)
+            else:
+                # this is likely a leaf node, so let's record what metadata we need to inherit
+                metadata_to_inherit[child] = my_metadata.copy()
+            # WARNING: 'parent' is not part of inherited metadata, but
+            # we're piggybacking on this recursive traversal to grab
+            # and cache the child's parent, as a performance optimization.
+            # The 'parent' key will be popped out of the dictionary during
+            # CachingDescriptorSystem.load_item
+            metadata_to_inherit[child].setdefault('parent', {})[self.get_branch_setting()] = url
+
+    def _compute_metadata_inheritance_tree(self, course_id):
+        '''
+        Find all inheritable fields from all xblocks in the course which may define inheritable data
+        '''
+        course_id = self.fill_in_run(course_id)
+        start = time.time()
+        results_by_url, root = self._get_inheritance_records(course_id)
+
+        # now traverse the tree and compute down the inherited metadata
+        metadata_to_inherit = {}
         if root is not None:
-            _compute_inherited_metadata(root)
+            self._propagate_inherited_metadata(results_by_url, root, metadata_to_inherit)
 
+        self._record_inheritance_tree_build(course_id, 'full', start, len(results_by_url))
         return metadata_to_inherit
 
+    def _update_metadata_inheritance_subtree(self, course_id, tree, location_url):
+        """
+        Recompute, in place, the entries of the inheritance tree for the block at location_url
+        and its descendants, reading only the containers of that subtree from the db.
+
+        Returns False if the tree can't be updated that way (e.g. the block is the course root,
+        or the tree doesn't know its parent), in which case the whole tree must be recomputed.
+        """
+        entry = tree.get(location_url)
+        if entry is None:
+            # not reachable from the course root, so nothing in the tree depends on it
+            return True
+        branch_setting = self.get_branch_setting()
+        parent_url = entry.get('parent', {}).get(branch_setting)
+        if parent_url is None:
+            return False
+
+        start = time.time()
+        if parent_url in tree:
+            parent_metadata = {key: value for key, value in tree[parent_url].iteritems() if key != 'parent'}
+        else:
+            # only the root isn't in the tree: read the metadata it defines along with the block
+            parent_metadata = None
+
+        # read the containers in the subtree, one level at a time
+        results_by_url = {}
+        level = [location_url]
+        urls_to_read = level if parent_metadata is not None else level + [parent_url]
+        while level:
+            records, root = self._get_inheritance_records(
+                course_id,
+                set(course_id.make_usage_key_from_deprecated_string(url).block_id for url in urls_to_read)
+            )
+            if parent_metadata is None:
+                if root != parent_url:
+                    return False
+                parent_metadata = records[root].get('metadata', {})
+
+            level = [url for url in level if url in records]
+            for url in level:
+                results_by_url[url] = records[url]
+            # leaves aren't in the db results, so don't look for them
+            level = urls_to_read = [
+                child
+                for url in level
+                for child in records[url].get('definition', {}).get('children', [])
+                if child not in results_by_url and
+                course_id.make_usage_key_from_deprecated_string(child).category in BLOCK_TYPES_WITH_CHILDREN
+            ]
+
+        if location_url not in results_by_url:
+            return False
+
+        # drop the entries of the block's current descendants: they're recomputed below, and
+        # those of blocks which are no longer in the subtree would be stale
+        children_by_parent = {}
+        for url, metadata in tree.iteritems():
+            child_parent_url = metadata.get('parent', {}).get(branch_setting)
+            if child_parent_url is not None:
+                children_by_parent.setdefault(child_parent_url, []).append(url)
+        descendants = set()
+        stack = [location_url]
+        while stack:
+            for child in children_by_parent.get(stack.pop(), []):
+                if child not in descendants:
+                    descendants.add(child)
+                    stack.append(child)
+        for url in descendants:
+            del tree[url]
+
+        my_metadata = copy.deepcopy(parent_metadata)
+        my_metadata.update(results_by_url[location_url].get('metadata', {}))
+        results_by_url[location_url]['metadata'] = my_metadata
+        tree[location_url] = dict(my_metadata, parent=copy.copy(entry.get('parent', {})))
+        self._propagate_inherited_metadata(results_by_url, location_url, tree)
+
+        self._record_inheritance_tree_build(course_id, 'subtree', start, len(results_by_url))
+        return True
+
+    def _record_inheritance_tree_build(self, course_id, build_type, start, block_count):
+        """
+        Report how long building (all or part of) an inheritance tree took, and how many
+        container records it read.
+        """
+        tags = [u'course:{}'.format(course_id), u'build:{}'.format(build_type)]
+        dog_stats_api.histogram('mongo_modulestore.inheritance_tree.duration', time.time() - start, tags=tags)
+        dog_stats_api.histogram('mongo_modulestore.inheritance_tree.records', block_count, tags=tags)
+
     def _get_cached_metadata_inheritance_tree(self, course_id, force_refresh=False):
         '''
         Compute the metadata inheritance for the course.
         '''
-        tree = {}
+        tree = None
 
         course_id = self.fill_in_run(course_id)
         if not force_refresh:
-            # see if we are first in the request cache (if present)
-            if self.request_cache is not None and unicode(course_id) in self.request_cache.data.get('metadata_inheritance', {}):
-                return self.request_cache.data['metadata_inheritance'][unicode(course_id)]
+            tree = self._lookup_cached_metadata_inheritance_tree(course_id)
 
-            # then look in any caching subsystem (e.g. memcached)
-            if self.metadata_inheritance_cache_subsystem is not None:
-                tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
-            else:
-                logging.warning(
-                    'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
-                    OK in localdev and testing environment. Not OK in production.'
-                )
-
-        if not tree:
+        if tree is None:
             # if not in subsystem, or we are on force refresh, then we have to compute
             tree = self._compute_metadata_inheritance_tree(course_id)
+            self._set_cached_metadata_inheritance_tree(course_id, tree)
+
+        return tree
 
-            # now write out computed tree to caching subsystem (e.g. memcached), if available
-            if self.metadata_inheritance_cache_subsystem is not None:
-                self.metadata_inheritance_cache_subsystem.set(unicode(course_id), tree)
+    def _lookup_cached_metadata_inheritance_tree(self, course_id, use_request_cache=True):
+        """
+        Returns the course's inheritance tree from the request cache or the caching subsystem,
+        or None if it's in neither.
+        """
+        # see if we are first in the request cache (if present)
+        if (
+                use_request_cache and self.request_cache is not None and
+                unicode(course_id) in self.request_cache.data.get('metadata_inheritance', {})
+        ):
+            return self.request_cache.data['metadata_inheritance'][unicode(course_id)]
+
+        # then look in any caching subsystem (e.g. memcached)
+        tree = None
+        if self.metadata_inheritance_cache_subsystem is not None:
+            tree = deserialize_inheritance_tree(self.metadata_inheritance_cache_subsystem.get(unicode(course_id)))
+        else:
+            logging.warning(
+                'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
+                OK in localdev and testing environment. Not OK in production.'
+            )
+        if not tree:
+            return None
 
-        # now populate a request_cache, if available. NOTE, we are outside of the
-        # scope of the above if: statement so that after a memcache hit, it'll get
-        # put into the request_cache
+        # after a memcache hit, put it into the request_cache
         if self.request_cache is not None:
-            # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
-            # defined
-            if 'metadata_inheritance' not in self.request_cache.data:
-                self.request_cache.data['metadata_inheritance'] = {}
-            self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
+            self.request_cache.data.setdefault('metadata_inheritance', {})[unicode(course_id)] = tree
 
         return tree
 
+    def _set_cached_metadata_inheritance_tree(self, course_id, tree):
+        """
+        Write the course's inheritance tree out to the caching subsystem (e.g. memcached), if
+        available, in its compact serialized form, and to the request cache, if available.
+        """
+        if self.metadata_inheritance_cache_subsystem is not None:
+            serialized_tree = serialize_inheritance_tree(tree)
+            dog_stats_api.histogram(
+                'mongo_modulestore.inheritance_tree.size',
+                len(serialized_tree),
+                tags=[u'course:{}'.format(course_id)],
+            )
+            self.metadata_inheritance_cache_subsystem.set(unicode(course_id), serialized_tree)
+
+        if self.request_cache is not None:
+            # we can't assume the 'metadatat_inheritance' part of the request cache dict has been
+            # defined
+            self.request_cache.data.setdefault('metadata_inheritance', {})[unicode(course_id)] = tree
+
     def refresh_cached_metadata_inheritance_tree(self, course_id, runtime=None):
         """
         Refresh the cached metadata inheritance tree for the org/course combination
@@ -805,6 +943,73 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
+    def refresh_cached_metadata_inheritance_subtree(self, location, runtime=None):
+        """
+        Update the cached metadata inheritance tree of the location's course after the block at
+        location was edited: only the entries for the block's subtree are recomputed, unless the
+        whole tree has to be (e.g. the block is the course root).
+
+        If given a runtime, it replaces the cached_metadata in that runtime.
+        """
+        if location.category not in BLOCK_TYPES_WITH_CHILDREN:
+            # leaves only inherit their parent's metadata: editing them doesn't change the tree
+            return
+
+        course_id = self.fill_in_run(location.course_key.for_branch(None))
+        if location.category == 'course' or self._is_in_bulk_operation(course_id):
+            # the course root's subtree is the whole course; and bulk operations refresh the tree at their end
+            self.refresh_cached_metadata_inheritance_tree(course_id, runtime)
+            return
+
+        cache_subsystem = self.metadata_inheritance_cache_subsystem
+        if cache_subsystem is None:
+            self._patch_cached_metadata_inheritance_tree(course_id, location, runtime)
+            return
+
+        # Patching the shared tree is a read-modify-write: the process holding the lock patches it,
+        # and the others, whose edits the patched tree may lack, drop it instead (it then gets
+        # computed from scratch) and flag the conflict for the holder to drop the tree it writes.
+        lock_key = u'{}.update_lock'.format(course_id)
+        conflict_key = u'{}.update_conflict'.format(course_id)
+        if not cache_subsystem.add(lock_key, True, INHERITANCE_TREE_LOCK_TIMEOUT):
+            cache_subsystem.set(conflict_key, True, INHERITANCE_TREE_LOCK_TIMEOUT)
+            self._drop_cached_metadata_inheritance_tree(course_id, runtime)
+            return
+        try:
+            self._patch_cached_metadata_inheritance_tree(course_id, location, runtime)
+            if cache_subsystem.get(conflict_key):
+                cache_subsystem.delete(conflict_key)
+                self._drop_cached_metadata_inheritance_tree(course_id, runtime)
+        finally:
+            cache_subsystem.delete(lock_key)
+
+    def _patch_cached_metadata_inheritance_tree(self, course_id, location, runtime):
+        """
+        Recompute the entries of the cached inheritance tree for the subtree of the block at location,
+        or the whole tree if that's not possible.
+        """
+        # a tree which isn't cached yet has to be computed from scratch anyway; and one from the request
+        # cache may be missing the edits of other processes
+        tree = self._lookup_cached_metadata_inheritance_tree(course_id, use_request_cache=False)
+        if not tree or not self._update_metadata_inheritance_subtree(course_id, tree, unicode(as_published(location))):
+            self.refresh_cached_metadata_inheritance_tree(course_id, runtime)
+            return
+
+        self._set_cached_metadata_inheritance_tree(course_id, tree)
+        if runtime:
+            runtime.cached_metadata = tree
+
+    def _drop_cached_metadata_inheritance_tree(self, course_id, runtime):
+        """
+        Remove the course's inheritance tree from the caching subsystem, to have it computed again on next access.
+        The tree is still computed right away for this request.
+        """
+        self.metadata_inheritance_cache_subsystem.delete(unicode(course_id))
+        if self.request_cache is not None:
+            self.request_cache.data.get('metadata_inheritance', {}).pop(unicode(course_id), None)
+        if runtime:
+            runtime.cached_metadata = self._get_cached_metadata_inheritance_tree(course_id)
+
     def _clean_item_data(self, item):
         """
         Renames the '_id' field in item to 'location'
@@ -1471,8 +1676,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # update the edit info of the instantiated xblock
             xblock._edit_info = payload['edit_info']
 
-            # recompute (and update) the metadata inheritance tree which is cached
-            self.refresh_cached_metadata_inheritance_tree(xblock.scope_ids.usage_id.course_key, xblock.runtime)
+            # update the metadata inheritance tree which is cached for the edited subtree
+            self.refresh_cached_metadata_inheritance_subtree(xblock.scope_ids.usage_id, xblock.runtime)
             # fire signal that we've written to DB
         except ItemNotFoundError:
             if not allow_not_found:
@@ -1633,6 +1838,57 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             return parent
         return None
 
+    def get_parent_locations(self, locations, revision=ModuleStoreEnum.RevisionOption.published_only, **kwargs):
+        '''
+        Returns {location: its parent location, or None} for all the given locations.
+        See get_parent_location for the revision argument.
+
+        The parents of all the locations of a course are found with one query, and cached
+        like get_parent_location's. Only the locations with several candidate parents to sort
+        out (e.g. orphaned copies) are looked up one at a time.
+        '''
+        parent_cache = self._get_parent_cache(self.get_branch_setting())
+        parents = {}
+        locations_by_course = defaultdict(list)
+        for location in locations:
+            assert location.revision is None
+            if parent_cache.has(unicode(location)):
+                parents[location] = parent_cache.get(unicode(location))
+            else:
+                locations_by_course[location.course_key].append(location)
+
+        for course_key, course_locations in locations_by_course.iteritems():
+            query = self._course_key_to_son(course_key)
+            query['definition.children'] = {'$in': [unicode(location) for location in course_locations]}
+            if revision == ModuleStoreEnum.RevisionOption.published_only:
+                query['_id.revision'] = MongoRevisionKey.published
+
+            # {child location string: its parents' records, drafts first}
+            candidates = defaultdict(list)
+            for parent in self.collection.find(
+                query, {'_id': True, 'definition.children': True}, sort=[SORT_REVISION_FAVOR_DRAFT]
+            ):
+                for child in parent.get('definition', {}).get('children', []):
+                    candidates[child].append(parent)
+
+            for location in course_locations:
+                location_parents = candidates.get(unicode(location), [])
+                published_parents = sum(1 for parent in location_parents if parent['_id']['revision'] is None)
+                if not location_parents:
+                    parent = None
+                elif len(location_parents) == 1 or (
+                    revision == ModuleStoreEnum.RevisionOption.draft_preferred and published_parents <= 1
+                ):
+                    # same as _get_raw_parent_location: the draft parent if any, else the published one
+                    parent = Location._from_deprecated_son(location_parents[0]['_id'], course_key.run)
+                else:
+                    parents[location] = self.get_parent_location(location, revision)
+                    continue
+                parent_cache.set(unicode(location), parent)
+                parents[location] = parent
+
+        return parents
+
     def get_modulestore_type(self, course_key=None):
         """
         Returns an enumeration-like type reflecting the type of this modulestore per ModuleStoreEnum.Type
@@ -308,6 +308,17 @@ class DraftModuleStore(MongoModuleStore):
                 else ModuleStoreEnum.RevisionOption.draft_preferred
         return super(DraftModuleStore, self).get_parent_location(location, revision, **kwargs)
 
+    def get_parent_locations(self, locations, revision=None, **kwargs):
+        '''
+        Returns {location: its parent location, or None} for all the given locations.
+        See get_parent_location for the revision argument.
+        '''
+        if revision is None:
+            revision = ModuleStoreEnum.RevisionOption.published_only \
+                if self.get_branch_setting() == ModuleStoreEnum.Branch.published_only \
+                else ModuleStoreEnum.RevisionOption.draft_preferred
+        return super(DraftModuleStore, self).get_parent_locations(locations, revision, **kwargs)
+
     def create_xblock(self, runtime, course_key, block_type, block_id=None, fields=None, **kwargs):
         """
         Create the new xmodule but don't save it. Returns the new module with a draft locator if
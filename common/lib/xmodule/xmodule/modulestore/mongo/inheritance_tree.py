@@ -0,0 +1,57 @@
+"""
+Compact serialized form of the metadata inheritance trees cached by the Mongo modulestore.
+
+A course's inheritance tree maps the url of each block to the metadata the block inherits
+(plus a 'parent' entry). Most blocks share their inherited metadata with their siblings, so
+the serialized form stores each distinct metadata dict once and compresses the result.
+"""
+import cPickle as pickle
+import zlib
+
+# Bump when changing the serialized form: trees in any other form are recomputed.
+INHERITANCE_TREE_FORMAT = 1
+
+
+def serialize_inheritance_tree(tree):
+    """
+    Returns the compact serialized form (a str) of the inheritance tree.
+    """
+    metadata_list = []
+    metadata_positions = {}
+    entries = []
+    for url, metadata in tree.iteritems():
+        inherited = dict(metadata)
+        parent = inherited.pop('parent', None)
+        # pickling the sorted items gives equal dicts the same key
+        metadata_key = pickle.dumps(sorted(inherited.items()), pickle.HIGHEST_PROTOCOL)
+        position = metadata_positions.get(metadata_key)
+        if position is None:
+            position = metadata_positions[metadata_key] = len(metadata_list)
+            metadata_list.append(inherited)
+        entries.append((url, position, parent))
+    return zlib.compress(
+        pickle.dumps((INHERITANCE_TREE_FORMAT, metadata_list, entries), pickle.HIGHEST_PROTOCOL)
+    )
+
+
+def deserialize_inheritance_tree(data):
+    """
+    Returns the inheritance tree from its serialized form, or None if data isn't a tree
+    serialized in the current form (e.g. a tree cached by an older release).
+    """
+    if not isinstance(data, str):
+        return None
+    try:
+        tree_format, metadata_list, entries = pickle.loads(zlib.decompress(data))
+    except (zlib.error, pickle.UnpicklingError, ValueError, TypeError, EOFError):
+        return None
+    if tree_format != INHERITANCE_TREE_FORMAT:
+        return None
+
+    tree = {}
+    for url, position, parent in entries:
+        metadata = dict(metadata_list[position])
+        if parent is not None:
+            metadata['parent'] = parent
+        tree[url] = metadata
+    return tree
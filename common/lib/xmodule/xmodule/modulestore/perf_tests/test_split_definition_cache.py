@@ -0,0 +1,76 @@
+"""
+Performance test for loading the content of a split unit page through the definition cache.
+"""
+import time
+import unittest
+
+from django.core.cache import caches
+from mock import patch
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.mongo_connection import DefinitionCache
+from xmodule.modulestore.tests.utils import VersioningModulestoreBuilder
+
+# Shape of the generated unit: 50 html blocks of about 20KB each.
+HTML_BLOCKS = 50
+HTML_SIZE = 20 * 1024
+
+# Number of times the unit page is loaded (as if by different requests).
+REQUESTS = 20
+
+USER_ID = ModuleStoreEnum.UserID.test
+
+
+@unittest.skip
+class SplitDefinitionCachePerformance(unittest.TestCase):
+    """
+    Times loading a content-heavy unit and the content of all its blocks, as the
+    LMS does to render a unit page, with and without the definition cache.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def _create_unit(self, store):
+        """
+        Creates and publishes a course with one unit of html blocks. Returns the unit's location.
+        """
+        with store.bulk_operations(store.make_course_key('perf', 'definitions', 'run')):
+            course = store.create_course('perf', 'definitions', 'run', USER_ID)
+            chapter = store.create_child(USER_ID, course.location, 'chapter')
+            sequential = store.create_child(USER_ID, chapter.location, 'sequential')
+            unit = store.create_child(USER_ID, sequential.location, 'vertical')
+            for index in range(HTML_BLOCKS):
+                store.create_child(
+                    USER_ID, unit.location, 'html',
+                    fields={'data': u'<p>{}</p>'.format(unicode(index) * (HTML_SIZE // len(unicode(index))))},
+                )
+        store.publish(course.location, USER_ID)
+        return unit.location.for_branch(ModuleStoreEnum.BranchName.published)
+
+    def _time(self, store, unit_location):
+        """
+        Returns the seconds spent loading the unit and its content REQUESTS times.
+        """
+        start = time.time()
+        for __ in range(REQUESTS):
+            unit = store.get_item(unit_location, depth=1)
+            for child in unit.get_children():
+                child.data  # pylint: disable=pointless-statement
+        return time.time() - start
+
+    def test_unit_page(self):
+        with VersioningModulestoreBuilder().build() as (__, store):
+            unit_location = self._create_unit(store)
+
+            uncached_seconds = self._time(store, unit_location)
+
+            # the default cache stands in for memcached
+            caches['default'].clear()
+            with patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache', return_value=caches['default']):
+                definition_cache = DefinitionCache()
+                with patch.object(store.db_connection, 'definition_cache', definition_cache):
+                    cached_seconds = self._time(store, unit_location)
+
+            self.assertGreater(definition_cache.hit_rate, 0)
+            self.assertLess(cached_seconds, uncached_seconds)
@@ -0,0 +1,87 @@
+"""
+Performance test for has_changes over the outline of a large split course.
+"""
+import time
+import unittest
+
+from mock import patch
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.split_draft import DraftVersioningModuleStore
+from xmodule.modulestore.tests.utils import VersioningModulestoreBuilder
+
+# Shape of the generated course: 10 chapters of 10 sequentials of 10 verticals of 4 problems,
+# which is 5111 blocks.
+CHAPTERS = 10
+SEQUENTIALS_PER_CHAPTER = 10
+VERTICALS_PER_SEQUENTIAL = 10
+PROBLEMS_PER_VERTICAL = 4
+
+# Number of problems edited after the course is published.
+EDITED_PROBLEMS = 10
+
+USER_ID = ModuleStoreEnum.UserID.test
+
+
+@unittest.skip
+class SplitHasChangesPerformance(unittest.TestCase):
+    """
+    Times calling has_changes for every section, subsection and unit of a
+    5k-block course, as Studio's course outline does.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def _create_course(self, store):
+        """
+        Creates and publishes the course, then edits a few of its problems.
+        Returns the course and the list of its outline blocks.
+        """
+        outline = []
+        problems = []
+        with store.bulk_operations(store.make_course_key('perf', 'has_changes', 'run')):
+            course = store.create_course('perf', 'has_changes', 'run', USER_ID)
+            for __ in range(CHAPTERS):
+                chapter = store.create_child(USER_ID, course.location, 'chapter')
+                outline.append(chapter)
+                for __ in range(SEQUENTIALS_PER_CHAPTER):
+                    sequential = store.create_child(USER_ID, chapter.location, 'sequential')
+                    outline.append(sequential)
+                    for __ in range(VERTICALS_PER_SEQUENTIAL):
+                        vertical = store.create_child(USER_ID, sequential.location, 'vertical')
+                        outline.append(vertical)
+                        for __ in range(PROBLEMS_PER_VERTICAL):
+                            problems.append(store.create_child(USER_ID, vertical.location, 'problem'))
+
+        store.publish(course.location, USER_ID)
+
+        step = len(problems) // EDITED_PROBLEMS
+        with store.bulk_operations(course.id):
+            for problem in problems[::step]:
+                problem = store.get_item(problem.location)
+                problem.display_name = 'Edited'
+                store.update_item(problem, USER_ID)
+
+        return course, [store.get_item(block.location) for block in outline]
+
+    def _time(self, store, outline):
+        """
+        Returns the seconds spent calling has_changes on every block of the outline,
+        and the number of blocks with changes.
+        """
+        start = time.time()
+        changed = sum(1 for block in outline if store.has_changes(block))
+        return time.time() - start, changed
+
+    def test_has_changes_outline(self):
+        with VersioningModulestoreBuilder().build() as (__, store):
+            __, outline = self._create_course(store)
+
+            # the recursive walk is still used for structures which may be edited in place
+            with patch.object(DraftVersioningModuleStore, '_is_structure_immutable', return_value=False):
+                walk_seconds, walk_changed = self._time(store, outline)
+            memoized_seconds, memoized_changed = self._time(store, outline)
+
+            self.assertEqual(walk_changed, memoized_changed)
+            self.assertLess(memoized_seconds, walk_seconds)
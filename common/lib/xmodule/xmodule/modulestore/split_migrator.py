@@ -6,15 +6,89 @@ Exists at the top level of modulestore b/c it needs to know about and access eac
 In general, it's strategy is to treat the other modulestores as read-only and to never directly
 manipulate storage but use existing api's.
 '''
+import hashlib
+import json
 import logging
+import os
+import time
+from itertools import islice
 
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
 from xmodule.modulestore import ModuleStoreEnum
+from opaque_keys.edx.keys import CourseKey
 from opaque_keys.edx.locator import CourseLocator
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 log = logging.getLogger(__name__)
 
+# Number of blocks translated and written to split at a time.
+MIGRATION_BATCH_SIZE = 500
+
+
+def _batches(iterable, size):
+    """
+    Yields lists of up to size consecutive items of the iterable.
+    """
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class MigrationCheckpoints(object):
+    """
+    Records how far the migration of each course got, in one json file per course under a
+    directory, so that several processes can migrate courses at once and an interrupted
+    migration can be resumed by passing the same checkpoints to migrate_mongo_course.
+
+    A course's record is a dict with its 'phase', the 'new_course_key', and migration statistics.
+    """
+    # the split course is being created: it may exist partially
+    STARTED = 'started'
+    # the published branch is fully migrated
+    PUBLISHED = 'published'
+    # both branches are fully migrated
+    COMPLETE = 'complete'
+
+    def __init__(self, checkpoint_dir):
+        self.checkpoint_dir = checkpoint_dir
+        if not os.path.isdir(checkpoint_dir):
+            os.makedirs(checkpoint_dir)
+
+    def _path(self, source_course_key):
+        """
+        Returns the path of the file recording the migration of the course.
+        """
+        return os.path.join(
+            self.checkpoint_dir, hashlib.sha1(unicode(source_course_key).encode('utf-8')).hexdigest() + '.json'
+        )
+
+    def get(self, source_course_key):
+        """
+        Returns the record of the migration of the course, or None if it wasn't started.
+        """
+        try:
+            with open(self._path(source_course_key)) as checkpoint_file:
+                return json.load(checkpoint_file)
+        except IOError:
+            return None
+
+    def save(self, source_course_key, **record):
+        """
+        Records the migration of the course, keeping the values of the previous record which
+        aren't overridden.
+        """
+        new_record = self.get(source_course_key) or {'source_course_key': unicode(source_course_key)}
+        new_record.update(record)
+        path = self._path(source_course_key)
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'w') as checkpoint_file:
+            json.dump(new_record, checkpoint_file, sort_keys=True, indent=4)
+        # replace the previous record atomically, so that an interrupted write can't corrupt it
+        os.rename(temp_path, path)
+        return new_record
+
 
 class SplitMigrator(object):
     """
@@ -27,7 +101,8 @@ class SplitMigrator(object):
         self.source_modulestore = source_modulestore
 
     def migrate_mongo_course(
-            self, source_course_key, user_id, new_org=None, new_course=None, new_run=None, fields=None, **kwargs
+            self, source_course_key, user_id, new_org=None, new_course=None, new_run=None, fields=None,
+            checkpoints=None, **kwargs
     ):
         """
         Create a new course in split_mongo representing the published and draft versions of the course from the
@@ -39,7 +114,33 @@ class SplitMigrator(object):
         :param user_id: the user whose action is causing this migration
         :param new_org, new_course, new_run: (optional) identifiers for the new course. Defaults to
             the source_course_key's values.
+        :param checkpoints: (optional) the MigrationCheckpoints in which to record the progress of the
+            migration. If they show the course was already migrated, this just returns its new key; if they
+            show a migration of the course was interrupted, this resumes it: a partially created course is
+            deleted and migrated again, and a partially migrated draft branch is migrated again.
         """
+        checkpoint = checkpoints.get(source_course_key) if checkpoints is not None else None
+        if checkpoint is not None:
+            new_course_key = CourseKey.from_string(checkpoint['new_course_key'])
+            if checkpoint['phase'] == MigrationCheckpoints.COMPLETE:
+                return new_course_key
+            if checkpoint['phase'] == MigrationCheckpoints.PUBLISHED:
+                start = time.time()
+                with self.split_modulestore.bulk_operations(new_course_key):
+                    self._reset_draft_branch(new_course_key)
+                    draft_blocks = self._add_draft_modules_to_course(
+                        self.split_modulestore.make_course_usage_key(new_course_key),
+                        source_course_key, user_id, **kwargs
+                    )
+                self._record_migration(
+                    checkpoints, source_course_key, new_course_key, start,
+                    draft_blocks=draft_blocks, seconds=checkpoint.get('seconds', 0),
+                )
+                return new_course_key
+            # the published branch wasn't fully written: start over
+            if self.split_modulestore.has_course(new_course_key):
+                self.split_modulestore.delete_course(new_course_key, user_id)
+
         # the only difference in data between the old and split_mongo xblocks are the locations;
         # so, any field which holds a location must change to a Locator; otherwise, the persistence
         # layer and kvs's know how to store it.
@@ -58,6 +159,12 @@ class SplitMigrator(object):
             new_run = source_course_key.run
 
         new_course_key = CourseLocator(new_org, new_course, new_run, branch=ModuleStoreEnum.BranchName.published)
+        # a course which already exists isn't recorded, so that resuming never deletes it
+        if checkpoints is not None and not self.split_modulestore.has_course(new_course_key):
+            checkpoints.save(
+                source_course_key, phase=MigrationCheckpoints.STARTED, new_course_key=unicode(new_course_key)
+            )
+        start = time.time()
         with self.split_modulestore.bulk_operations(new_course_key):
             new_fields = self._get_fields_translate_references(original_course, new_course_key, None)
             if fields:
@@ -70,96 +177,128 @@ class SplitMigrator(object):
                 **kwargs
             )
 
-            self._copy_published_modules_to_course(
+            published_blocks = 1 + self._copy_published_modules_to_course(
                 new_course, original_course.location, source_course_key, user_id, **kwargs
             )
+        if checkpoints is not None:
+            checkpoints.save(
+                source_course_key, phase=MigrationCheckpoints.PUBLISHED,
+                published_blocks=published_blocks, seconds=time.time() - start,
+            )
 
         # TODO: This should be merged back into the above transaction, but can't be until split.py
         # is refactored to have more coherent access patterns
         with self.split_modulestore.bulk_operations(new_course_key):
 
             # create a new version for the drafts
-            self._add_draft_modules_to_course(new_course.location, source_course_key, user_id, **kwargs)
+            draft_blocks = self._add_draft_modules_to_course(new_course.location, source_course_key, user_id, **kwargs)
 
+        self._record_migration(
+            checkpoints, source_course_key, new_course.id, start,
+            published_blocks=published_blocks, draft_blocks=draft_blocks,
+        )
         return new_course.id
 
+    def _record_migration(self, checkpoints, source_course_key, new_course_key, start, seconds=0, **counts):
+        """
+        Logs the throughput of the completed migration of the course, and records it in the checkpoints if any.
+        ``seconds`` is the time spent in previous, interrupted, runs of the migration.
+        """
+        seconds += time.time() - start
+        if checkpoints is not None:
+            record = checkpoints.save(
+                source_course_key, phase=MigrationCheckpoints.COMPLETE, seconds=seconds, **counts
+            )
+        else:
+            record = counts
+        blocks = record.get('published_blocks', 0) + record.get('draft_blocks', 0)
+        log.info(
+            u'Migrated %s to %s: %d blocks in %.1fs (%.1f blocks/s)',
+            source_course_key, new_course_key, blocks, seconds, blocks / seconds if seconds else 0,
+        )
+
+    def _reset_draft_branch(self, course_key):
+        """
+        Point the course's draft branch to its published version.
+        """
+        index_info = self.split_modulestore.get_course_index_info(course_key)
+        versions = index_info['versions']
+        versions[ModuleStoreEnum.BranchName.draft] = versions[ModuleStoreEnum.BranchName.published]
+        self.split_modulestore.update_course_index(course_key, index_info)
+
     def _copy_published_modules_to_course(self, new_course, old_course_loc, source_course_key, user_id, **kwargs):
         """
         Copy all of the modules from the 'direct' version of the course to the new split course.
+        Returns the number of modules copied.
         """
         course_version_locator = new_course.id.version_agnostic()
 
         # iterate over published course elements. Wildcarding rather than descending b/c some elements are orphaned (e.g.,
         # course about pages, conditionals)
-        for module in self.source_modulestore.get_items(
-            source_course_key, revision=ModuleStoreEnum.RevisionOption.published_only, **kwargs
-        ):
+        # NOTE: the below populates the children when it migrates the parent; so, it doesn't need the
+        # parent to be migrated first. That is, it translates and populates the 'children' field as it goes.
+        blocks = (
+            (
+                module.location.block_type,
+                module.location.block_id,
+                self._get_fields_translate_references(module, course_version_locator, new_course.location.block_id),
+            )
+            for module in self.source_modulestore.get_items(
+                source_course_key, revision=ModuleStoreEnum.RevisionOption.published_only, **kwargs
+            )
             # don't copy the course again.
-            if module.location != old_course_loc:
-                # create split_xblock using split.create_item
-                # NOTE: the below auto populates the children when it migrates the parent; so,
-                # it doesn't need the parent as the first arg. That is, it translates and populates
-                # the 'children' field as it goes.
-                _new_module = self.split_modulestore.create_item(
-                    user_id,
-                    course_version_locator,
-                    module.location.block_type,
-                    block_id=module.location.block_id,
-                    fields=self._get_fields_translate_references(
-                        module, course_version_locator, new_course.location.block_id
-                    ),
-                    skip_auto_publish=True,
-                    **kwargs
-                )
+            if module.location != old_course_loc
+        )
+        copied = 0
+        # all the batches are written to the structure of the caller's bulk operation
+        for batch in _batches(blocks, MIGRATION_BATCH_SIZE):
+            self.split_modulestore.create_or_replace_items(user_id, course_version_locator, batch, **kwargs)
+            copied += len(batch)
+            log.debug(u'Copied %d published blocks of %s', copied, source_course_key)
+
         # after done w/ published items, add version for DRAFT pointing to the published structure
-        index_info = self.split_modulestore.get_course_index_info(course_version_locator)
-        versions = index_info['versions']
-        versions[ModuleStoreEnum.BranchName.draft] = versions[ModuleStoreEnum.BranchName.published]
-        self.split_modulestore.update_course_index(course_version_locator, index_info)
+        self._reset_draft_branch(course_version_locator)
 
         # clean up orphans in published version: in old mongo, parents pointed to the union of their published and draft
         # children which meant some pointers were to non-existent locations in 'direct'
         self.split_modulestore.fix_not_found(course_version_locator, user_id)
+        return copied
 
     def _add_draft_modules_to_course(self, published_course_usage_key, source_course_key, user_id, **kwargs):
         """
         update each draft. Create any which don't exist in published and attach to their parents.
+        Returns the number of drafts migrated.
         """
-        # each true update below will trigger a new version of the structure. We may want to just have one new version
-        # but that's for a later date.
         new_draft_course_loc = published_course_usage_key.course_key.for_branch(ModuleStoreEnum.BranchName.draft)
         # to prevent race conditions of grandchilden being added before their parents and thus having no parent to
         # add to
         awaiting_adoption = {}
-        for module in self.source_modulestore.get_items(
-                source_course_key, revision=ModuleStoreEnum.RevisionOption.draft_only, **kwargs
-        ):
-            new_locator = new_draft_course_loc.make_usage_key(module.category, module.location.block_id)
-            if self.split_modulestore.has_item(new_locator):
-                # was in 'direct' so draft is a new version
-                split_module = self.split_modulestore.get_item(new_locator, **kwargs)
-                # need to remove any no-longer-explicitly-set values and add/update any now set values.
-                for name, field in split_module.fields.iteritems():
-                    if field.is_set_on(split_module) and not module.fields[name].is_set_on(module):
-                        field.delete_from(split_module)
-                for field, value in self._get_fields_translate_references(
-                        module, new_draft_course_loc, published_course_usage_key.block_id, field_names=False
-                ).iteritems():
-                    field.write_to(split_module, value)
-
-                _new_module = self.split_modulestore.update_item(split_module, user_id, **kwargs)
-            else:
-                # only a draft version (aka, 'private').
-                _new_module = self.split_modulestore.create_item(
-                    user_id, new_draft_course_loc,
+
+        def draft_blocks():
+            """
+            Yields the (block_type, block_id, fields) of each draft: the drafts of blocks which were in 'direct'
+            replace their fields, the others (only a draft version, aka 'private') are created.
+            """
+            for module in self.source_modulestore.get_items(
+                    source_course_key, revision=ModuleStoreEnum.RevisionOption.draft_only, **kwargs
+            ):
+                new_locator = new_draft_course_loc.make_usage_key(module.category, module.location.block_id)
+                if not self.split_modulestore.has_item(new_locator):
+                    awaiting_adoption[module.location] = new_locator
+                yield (
                     new_locator.block_type,
-                    block_id=new_locator.block_id,
-                    fields=self._get_fields_translate_references(
+                    new_locator.block_id,
+                    self._get_fields_translate_references(
                         module, new_draft_course_loc, published_course_usage_key.block_id
                     ),
-                    **kwargs
                 )
-                awaiting_adoption[module.location] = new_locator
+
+        migrated = 0
+        for batch in _batches(draft_blocks(), MIGRATION_BATCH_SIZE):
+            self.split_modulestore.create_or_replace_items(user_id, new_draft_course_loc, batch, **kwargs)
+            migrated += len(batch)
+            log.debug(u'Migrated %d drafts of %s', migrated, source_course_key)
+
         for draft_location, new_locator in awaiting_adoption.iteritems():
             parent_loc = self.source_modulestore.get_parent_location(
                 draft_location, revision=ModuleStoreEnum.RevisionOption.draft_preferred, **kwargs
@@ -188,6 +327,7 @@ class SplitMigrator(object):
                         break  # skipped sibs enough, pick back up scan
             new_parent.children.insert(new_parent_cursor, new_locator)
             new_parent = self.split_modulestore.update_item(new_parent, user_id)
+        return migrated
 
     def _get_fields_translate_references(self, xblock, new_course_key, course_block_id, field_names=True):
         """
@@ -18,7 +18,7 @@ from xmodule.modulestore.inheritance import inheriting_field_data, InheritanceMi
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
 from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
-from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
+from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS, FieldDecodeStats
 
 log = logging.getLogger(__name__)
 
@@ -80,6 +80,19 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.default_class = default_class
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
+        self._field_decode_stats = FieldDecodeStats()
+
+    @property
+    def field_decode_stats(self):
+        """
+        The FieldDecodeStats of the current request, if there is a request cache, or else of this runtime.
+
+        Looked up on each access, since this runtime can outlive the request that created it.
+        """
+        request_cache = self.modulestore.request_cache
+        if request_cache is not None:
+            return request_cache.data.setdefault('split_field_decode_stats', FieldDecodeStats())
+        return self._field_decode_stats
 
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
@@ -177,8 +190,9 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         if block_key is None:
             block_key = BlockKey(block_data.block_type, LocalId())
 
+        structure_blocks = self.course_entry.structure['blocks']
         convert_fields = lambda field: self.modulestore.convert_references_to_keys(
-            course_key, class_, field, self.course_entry.structure['blocks'],
+            course_key, class_, field, structure_blocks,
         )
 
         if definition_id is not None and not block_data.definition_loaded:
@@ -202,20 +216,32 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             block_id=block_key.id,
         )
 
-        converted_fields = convert_fields(block_data.fields)
         converted_defaults = convert_fields(block_data.defaults)
         if block_key in self._parent_map:
             parent_key = self._parent_map[block_key]
             parent = course_key.make_usage_key(parent_key.type, parent_key.id)
         else:
             parent = None
-        kvs = SplitMongoKVS(
-            definition_loader,
-            converted_fields,
-            converted_defaults,
-            parent=parent,
-            field_decorator=kwargs.get('field_decorator')
-        )
+        if self.modulestore.lazy_field_materialization:
+            # leave the fields in their raw form until they're first read,
+            # since many callers only ever touch a handful of them
+            kvs = SplitMongoKVS(
+                definition_loader,
+                block_data.fields,
+                converted_defaults,
+                parent=parent,
+                field_decorator=kwargs.get('field_decorator'),
+                field_converter=convert_fields,
+                decode_stats=self.field_decode_stats,
+            )
+        else:
+            kvs = SplitMongoKVS(
+                definition_loader,
+                convert_fields(block_data.fields),
+                converted_defaults,
+                parent=parent,
+                field_decorator=kwargs.get('field_decorator')
+            )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
             field_data = inheriting_field_data(kvs)
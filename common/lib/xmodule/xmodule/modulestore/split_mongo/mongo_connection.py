@@ -28,6 +28,7 @@ from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_connection import connect_to_mongodb
+from xmodule.util.lru import LRUCache
 
 
 new_contract('BlockData', BlockData)
@@ -277,6 +278,114 @@ class CourseStructureCache(object):
             self.cache.set(key, compressed_pickled_data, None)
 
 
+# Size (in bytes of compressed pickles) of the in-process tier of the definition cache.
+DEFINITION_CACHE_LOCAL_SIZE = 32 * 1024 * 1024
+
+
+class DefinitionCache(object):
+    """
+    Cache of definition documents, which are immutable once written, shared across requests.
+
+    The definitions are pickled and compressed (like the course structures of
+    :class:`CourseStructureCache`), then kept in an in-process LRU in front of the
+    'definition_cache' django cache (e.g. memcached). Every get unpickles new copies
+    of the documents, so callers may modify what they get.
+
+    If the 'definition_cache' doesn't exist, then don't do anything for set and get.
+    """
+    def __init__(self, local_size=DEFINITION_CACHE_LOCAL_SIZE):
+        self.enabled = False
+        if DJANGO_AVAILABLE:
+            try:
+                get_cache('definition_cache')
+                self.enabled = True
+            except InvalidCacheBackendError:
+                pass
+
+        self._local = LRUCache(local_size, size_of=len)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of the definitions looked up by this process which were cached.
+        """
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+    @staticmethod
+    def _cache_key(definition_id):
+        """
+        Returns the django cache key of the definition with the given id.
+        """
+        return 'definition.{}'.format(definition_id)
+
+    def get_many(self, definition_ids, course_context=None):
+        """
+        Returns a dict mapping the ids of the cached definitions among definition_ids to
+        (new copies of) the definitions.
+        """
+        if not self.enabled or not definition_ids:
+            return {}
+
+        with TIMER.timer("DefinitionCache.get_many", course_context) as tagger:
+            found = {}
+            missing_local = []
+            for definition_id in definition_ids:
+                data = self._local.get(definition_id)
+                if data is None:
+                    missing_local.append(definition_id)
+                else:
+                    found[definition_id] = data
+            local_hits = len(found)
+
+            if missing_local:
+                keys = {self._cache_key(definition_id): definition_id for definition_id in missing_local}
+                for key, data in get_cache('definition_cache').get_many(keys.keys()).iteritems():
+                    found[keys[key]] = data
+                    self._local.set(keys[key], data)
+            shared_hits = len(found) - local_hits
+            misses = len(definition_ids) - len(found)
+
+            self.hits += len(found)
+            self.misses += misses
+            tagger.measure('definitions', len(definition_ids))
+            tagger.measure('compressed_size', sum(len(data) for data in found.itervalues()))
+            for result, count in (('local_hit', local_hits), ('shared_hit', shared_hits), ('miss', misses)):
+                if count:
+                    dog_stats_api.increment(
+                        '{}.DefinitionCache.lookups'.format(__name__),
+                        value=count,
+                        tags=['result:{}'.format(result), 'course:{}'.format(course_context)],
+                    )
+
+            return {
+                definition_id: pickle.loads(zlib.decompress(data))
+                for definition_id, data in found.iteritems()
+            }
+
+    def set_many(self, definitions, course_context=None):
+        """
+        Given a list of definitions, will pickle, compress, and write them to both tiers of the cache.
+        """
+        if not self.enabled or not definitions:
+            return
+
+        with TIMER.timer("DefinitionCache.set_many", course_context) as tagger:
+            shared_data = {}
+            for definition in definitions:
+                # 1 = Fastest (slightly larger results)
+                data = zlib.compress(pickle.dumps(definition, pickle.HIGHEST_PROTOCOL), 1)
+                self._local.set(definition['_id'], data)
+                shared_data[self._cache_key(definition['_id'])] = data
+            tagger.measure('definitions', len(definitions))
+            tagger.measure('compressed_size', sum(len(data) for data in shared_data.itervalues()))
+
+            # Definitions are immutable, so we set a timeout of "never"
+            get_cache('definition_cache').set_many(shared_data, None)
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
@@ -301,6 +410,7 @@ class MongoConnection(object):
         self.course_index = self.database[collection + '.active_versions']
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
+        self.definition_cache = DefinitionCache()
 
     def heartbeat(self):
         """
@@ -492,22 +602,39 @@ class MongoConnection(object):
 
     def get_definition(self, key, course_context=None):
         """
-        Get the definition from the persistence mechanism whose id is the given key
+        Get the definition from the persistence mechanism whose id is the given key.
+
+        This method will use a cached version of the definition if it is available.
         """
         with TIMER.timer("get_definition", course_context) as tagger:
-            definition = self.definitions.find_one({'_id': key})
+            definition = self.definition_cache.get_many([key], course_context).get(key)
+            tagger.tag(from_cache=str(definition is not None).lower())
+            if definition is None:
+                definition = self.definitions.find_one({'_id': key})
+                if definition is None:
+                    return None
+                self.definition_cache.set_many([definition], course_context)
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
 
     def get_definitions(self, definitions, course_context=None):
         """
-        Retrieve all definitions listed in `definitions`.
+        Retrieve all definitions listed in `definitions`, as a list.
+
+        Only the definitions which aren't cached are read from the db, in one query.
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            cached = self.definition_cache.get_many(definitions, course_context)
+            tagger.measure('cached_definitions', len(cached))
+            result = cached.values()
+            missing = [definition_id for definition_id in definitions if definition_id not in cached]
+            if missing:
+                from_db = list(self.definitions.find({'_id': {'$in': missing}}))
+                self.definition_cache.set_many(from_db, course_context)
+                result.extend(from_db)
+            return result
 
     def insert_definition(self, definition, course_context=None):
         """
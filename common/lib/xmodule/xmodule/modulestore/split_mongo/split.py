@@ -83,6 +83,10 @@ from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.split_mongo_kvs import FieldDecodeStats
+from xmodule.modulestore.split_mongo.structure_diff import diff_structures
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+from xmodule.util.lru import LRUCache
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
 from types import NoneType
@@ -112,6 +116,9 @@ log = logging.getLogger(__name__)
 # When blacklists are this, all children should be excluded
 EXCLUDE_ALL = '*'
 
+# How many structure versions' get_items indexes to keep in memory
+DEFAULT_STRUCTURE_INDEX_CACHE_SIZE = 64
+
 
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('BlockKey', BlockKey)
@@ -340,12 +347,19 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         (no data will be written to the database if a bulk operation is active.)
         """
         self._clear_cache(structure['_id'])
+        self._clear_structure_index(structure['_id'])
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             bulk_write_record.structures[structure['_id']] = structure
         else:
             self.db_connection.insert_structure(structure, course_key)
 
+    def _clear_structure_index(self, structure_id):
+        """
+        Overridden by :class:`.SplitMongoModuleStore` to drop its cached index of the structure.
+        """
+        pass
+
     def get_cached_block(self, course_key, version_guid, block_id):
         """
         If there's an active bulk_operation, see if it's cached this module and just return it
@@ -642,9 +656,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, lazy_field_materialization=False,
+                 structure_index_cache_size=DEFAULT_STRUCTURE_INDEX_CACHE_SIZE, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param lazy_field_materialization: if True, the fields of loaded xblocks are kept in their stored
+            form until they're first read, rather than all being converted when the xblock is constructed.
+            Off by default; enable it by adding it to the split store's OPTIONS in MODULESTORE.
+        :param structure_index_cache_size: how many structure versions to keep the get_items
+            indexes (see :class:`.StructureIndex`) of in memory.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -675,6 +695,20 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        self.lazy_field_materialization = lazy_field_materialization
+
+        # {structure _id: StructureIndex}
+        self._structure_indexes = LRUCache(structure_index_cache_size)
+
+    def get_field_decode_stats(self):
+        """
+        Returns the FieldDecodeStats of the current request: how many xblock fields were
+        loaded in their raw form, and how many of those were actually decoded. Returns
+        None if there's no request cache to keep per-request stats in.
+        """
+        if self.request_cache is None:
+            return None
+        return self.request_cache.data.get('split_field_decode_stats', FieldDecodeStats())
 
     def close_connections(self):
         """
@@ -850,6 +884,39 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # add it in the envelope for the structure.
         return CourseEnvelope(course_key.replace(version_guid=version_guid), entry)
 
+    def _is_structure_immutable(self, course_key, structure_id):
+        """
+        Returns whether the structure can no longer change: any structure except one
+        created inside the active bulk operation on course_key, which may still be
+        edited in place.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        return not bulk_write_record.active or structure_id in bulk_write_record.structures_in_db
+
+    def _get_structure_index(self, course_key, structure):
+        """
+        Returns the :class:`.StructureIndex` of the structure, building it if needed.
+
+        Indexes are cached by structure version, as structures don't change once
+        they're stored. The exception is a structure created inside the active bulk
+        operation, which may still be edited in place: its index isn't cached.
+        """
+        structure_id = structure['_id']
+        if not self._is_structure_immutable(course_key, structure_id):
+            return StructureIndex(structure['blocks'])
+
+        index = self._structure_indexes.get(structure_id)
+        if index is None:
+            index = StructureIndex(structure['blocks'])
+            self._structure_indexes.set(structure_id, index)
+        return index
+
+    def _clear_structure_index(self, structure_id):
+        """
+        Drop the cached get_items index of the structure, if any.
+        """
+        self._structure_indexes.pop(structure_id)
+
     def _get_structures_for_branch(self, branch, **kwargs):
         """
         Internal generator for fetching lists of courses, libraries, etc.
@@ -1106,12 +1173,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if settings is None:
             settings = {}
+        # use the structure's indexes to narrow down which blocks have to be checked
+        index = self._get_structure_index(course_locator, course.structure)
+        blocks = course.structure['blocks']
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
             block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                if block_name == block_id.id and _block_matches_all(block):
+            for block_id in index.candidates(blocks, block_id=block_name, settings=settings):
+                if _block_matches_all(blocks[block_id]):
                     block_ids.append(block_id)
 
             return self._load_items(course, block_ids, **kwargs)
@@ -1122,8 +1192,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         # don't expect caller to know that children are in fields
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in index.candidates(blocks, block_type=qualifiers.get('block_type'), settings=settings):
+            if _block_matches_all(blocks[block_id]):
                 items.append(block_id)
 
         if len(items) > 0:
@@ -1131,27 +1201,31 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
-    def has_path_to_root(self, block_key, course):
+    def has_path_to_root(self, block_key, course, parent_map=None):
         """
         Check recursively if an xblock has a path to the course root
 
         :param block_key: BlockKey of the component whose path is to be checked
         :param course: actual db json of course from structures
+        :param parent_map: the course's child to parent map (see _get_parent_map), if already at hand
 
         :return Bool: whether or not component has path to the root
         """
+        if parent_map is None:
+            parent_map = self._get_parent_map(course)
 
-        xblock_parents = self._get_parents_from_structure(block_key, course.structure)
+        xblock_parents = parent_map.get(block_key, [])
         if len(xblock_parents) == 0 and block_key.type in ["course", "library"]:
             # Found, xblock has the path to the root
             return True
 
-        return any(self.has_path_to_root(xblock_parent, course) for xblock_parent in xblock_parents)
+        return any(self.has_path_to_root(xblock_parent, course, parent_map) for xblock_parent in xblock_parents)
 
     def get_parent_location(self, locator, **kwargs):
         """
         Return the location (Locators w/ block_ids) for the parent of this location in this
-        course. Could use get_items(location, {'children': block_id}) but this is slightly faster.
+        course. Parents are looked up in the child to parent map of the course's structure,
+        which is built once per structure version.
         NOTE: the locator must contain the block_id, and this code does not actually ensure block_id exists
 
         :param locator: BlockUsageLocator restricting search scope
@@ -1161,14 +1235,46 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             raise ItemNotFoundError(locator)
 
         course = self._lookup_course(locator.course_key)
-        all_parent_ids = self._get_parents_from_structure(BlockKey.from_usage_key(locator), course.structure)
+        return self._get_parent_from_map(locator, course, self._get_parent_map(course))
+
+    def get_parent_locations(self, locators, **kwargs):
+        """
+        Return {locator: the location of its parent, or None} for all the given locators,
+        looking up each course (and its child to parent map) only once.
+        """
+        parents = {}
+        courses = {}
+        for locator in locators:
+            if not isinstance(locator, BlockUsageLocator) or locator.deprecated:
+                # The supplied locator is of the wrong type, so it can't possibly be stored in this modulestore.
+                raise ItemNotFoundError(locator)
+            if locator.course_key not in courses:
+                course = self._lookup_course(locator.course_key)
+                courses[locator.course_key] = (course, self._get_parent_map(course))
+            course, parent_map = courses[locator.course_key]
+            parents[locator] = self._get_parent_from_map(locator, course, parent_map)
+        return parents
+
+    def _get_parent_map(self, course):
+        """
+        Returns the {BlockKey: [parent BlockKeys]} map of the structure of the course (a
+        CourseEnvelope). It's kept with the structure's index, so it's only built once per
+        structure version and shared by all the requests using that version.
+        """
+        return self._get_structure_index(course.course_key, course.structure).parents(course.structure['blocks'])
+
+    def _get_parent_from_map(self, locator, course, parent_map):
+        """
+        Returns the location of the parent of locator in the course, given the course's parent_map.
+        """
+        all_parent_ids = parent_map.get(BlockKey.from_usage_key(locator), [])
 
         # Check and verify the found parent_ids are not orphans; Remove parent which has no valid path
         # to the course root
         parent_ids = [
             valid_parent
             for valid_parent in all_parent_ids
-            if self.has_path_to_root(valid_parent, course)
+            if self.has_path_to_root(valid_parent, course, parent_map)
         ]
 
         if len(parent_ids) == 0:
@@ -1358,6 +1464,38 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             result
         )
 
+    def diff_structures(self, old_version, new_version):
+        """
+        Returns the :class:`.StructureDiff` of the changes from one version of a course or
+        library to another: the added and removed blocks, and the modified blocks along with
+        which of their fields changed.
+
+        The diff is computed from the blocks' edit_info.update_version markers, so only the
+        blocks changed in between are compared. Diffs between versions which can no longer
+        change are cached with the new version's index, for consumers (search, block caches,
+        grading, ...) which want to only process the blocks changed by an edit or a publish.
+
+        :param old_version: the CourseLocator of the old version (by version_guid or branch)
+        :param new_version: the CourseLocator of the new version (by version_guid or branch)
+        """
+        for course_key in (old_version, new_version):
+            if not isinstance(course_key, CourseLocator) or course_key.deprecated:
+                # The supplied CourseKey is of the wrong type, so it can't possibly be stored in this modulestore.
+                raise ItemNotFoundError(course_key)
+
+        old_structure = self._lookup_course(old_version).structure
+        new_structure = self._lookup_course(new_version).structure
+        if (  # pylint: disable=bad-continuation
+            self._is_structure_immutable(old_version, old_structure['_id']) and
+            self._is_structure_immutable(new_version, new_structure['_id'])
+        ):
+            return self._get_structure_index(new_version, new_structure).memoize(
+                u'diff:{}'.format(old_structure['_id']),
+                old_structure['_id'],
+                lambda: diff_structures(old_structure, new_structure),
+            )
+        return diff_structures(old_structure, new_structure)
+
     def get_definition_successors(self, definition_locator, version_history_depth=1):
         """
         Find the version_history_depth next versions of this definition. Return as a VersionTree
@@ -1588,6 +1726,65 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             # reconstruct the new_item from the cache
             return self.get_item(item_loc)
 
+    def create_or_replace_items(self, user_id, course_key, blocks, force=False, **kwargs):
+        """
+        Write the given blocks into the course as a single new version of its structure (or into
+        the structure of the active bulk operation), and return their BlockUsageLocators.
+
+        Unlike create_item and update_item, this doesn't load any of the blocks as xblocks, which
+        makes it suitable for copying whole courses into split (e.g. the SplitMigrator).
+
+        :param blocks: an iterable of (block_type, block_id, fields) tuples, fields being a dict of
+        all the explicitly set fields of the block. A block which already exists in the structure gets
+        its fields replaced by the given ones (keeping its definition if its content didn't change).
+        The others are created.
+        """
+        with self.bulk_operations(course_key):
+            index_entry = self._get_index_if_valid(course_key, force)
+            structure = self._lookup_course(course_key).structure
+            new_structure = self.version_structure(course_key, structure, user_id)
+            new_id = new_structure['_id']
+
+            locators = []
+            for block_type, block_id, fields in blocks:
+                partitioned_fields = self.partition_fields_by_scope(block_type, fields)
+                new_def_data = partitioned_fields.get(Scope.content, {})
+                block_fields = partitioned_fields.get(Scope.settings, {})
+                if Scope.children in partitioned_fields:
+                    block_fields.update(partitioned_fields[Scope.children])
+
+                block_key = BlockKey(block_type, block_id)
+                block_data = self._get_block_from_structure(new_structure, block_key)
+                if block_data is None:
+                    definition_locator = self.create_definition_from_data(
+                        course_key, new_def_data, block_type, user_id
+                    )
+                    self._update_block_in_structure(new_structure, block_key, self._new_block(
+                        user_id, block_type, block_fields, definition_locator.definition_id, new_id,
+                    ))
+                else:
+                    definition_locator, is_updated = self.update_definition_from_data(
+                        course_key, DefinitionLocator(block_type, block_data.definition), new_def_data, user_id
+                    )
+                    block_fields = self._serialize_fields(block_type, block_fields)
+                    if is_updated or block_fields != block_data.fields:
+                        block_data.definition = definition_locator.definition_id
+                        block_data.fields = block_fields
+                        # as in update_item, the block is no longer a direct copy of its source
+                        block_data.edit_info.source_version = None
+                        self.version_block(block_data, user_id, new_id)
+
+                if index_entry is not None:
+                    self._update_search_targets(index_entry, fields)
+                locators.append(BlockUsageLocator(course_key.version_agnostic(), block_type, block_id))
+
+            self.update_structure(course_key, new_structure)
+            if index_entry is not None:
+                self._update_head(course_key, index_entry, course_key.branch, new_id)
+            if isinstance(course_key, LibraryLocator):
+                self._flag_library_updated_event(course_key)
+            return locators
+
     def create_child(self, user_id, parent_usage_key, block_type, block_id=None, fields=None, **kwargs):
         """
         Creates and saves a new xblock that as a child of the specified block
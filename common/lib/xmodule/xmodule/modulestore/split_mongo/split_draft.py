@@ -112,13 +112,16 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
             # We don't use _auto_publish_no_children since children may need to be published.
             with self.bulk_operations(dest_key.course_key):
                 keys_to_check = list(new_keys)
+                keys_to_publish = []
                 while keys_to_check:
                     usage_key = keys_to_check.pop()
                     if usage_key.category in DIRECT_ONLY_CATEGORIES:
-                        self.publish(usage_key.version_agnostic(), user_id, blacklist=EXCLUDE_ALL, **kwargs)
+                        keys_to_publish.append(usage_key.version_agnostic())
                         children = getattr(self.get_item(usage_key, **kwargs), "children", [])
                         # e.g. if usage_key is a chapter, it may have an auto-publish sequential child
                         keys_to_check.extend(children)
+                # parents come before their children, so each block's parent is published first
+                self.publish_many(keys_to_publish, user_id, blacklist=EXCLUDE_ALL, **kwargs)
         return new_keys
 
     def update_item(self, descriptor, user_id, allow_not_found=False, force=False, **kwargs):
@@ -290,6 +293,20 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         location = self._map_revision_to_branch(location, revision=revision)
         return super(DraftVersioningModuleStore, self).get_parent_location(location, **kwargs)
 
+    def get_parent_locations(self, locations, revision=None, **kwargs):
+        """
+        Returns {location: its parent location in this course, or None} for all the given
+        locations. See get_parent_location for the revision argument.
+        """
+        if revision == ModuleStoreEnum.RevisionOption.draft_preferred:
+            revision = ModuleStoreEnum.RevisionOption.draft_only
+        branch_locations = {
+            location: self._map_revision_to_branch(location, revision=revision)
+            for location in locations
+        }
+        parents = super(DraftVersioningModuleStore, self).get_parent_locations(branch_locations.values(), **kwargs)
+        return {location: parents[branch_location] for location, branch_location in branch_locations.iteritems()}
+
     def get_block_original_usage(self, usage_key):
         """
         If a block was inherited into another structure using copy_from_template,
@@ -319,15 +336,28 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         :param xblock: the block to check
         :return: True if the draft and published versions differ
         """
-        def get_course(branch_name):
-            return self._lookup_course(xblock.location.course_key.for_branch(branch_name)).structure
+        draft_course_key = xblock.location.course_key.for_branch(ModuleStoreEnum.BranchName.draft)
+        published_course_key = xblock.location.course_key.for_branch(ModuleStoreEnum.BranchName.published)
+        draft_course = self._lookup_course(draft_course_key).structure
+        published_course = self._lookup_course(published_course_key).structure
+        block_key = BlockKey.from_usage_key(xblock.location)
+
+        if (  # pylint: disable=bad-continuation
+            self._is_structure_immutable(draft_course_key, draft_course['_id']) and
+            self._is_structure_immutable(published_course_key, published_course['_id'])
+        ):
+            # Both versions are final, so compute which blocks have changes once for the pair
+            # and keep the result with the draft structure's index.
+            changed_blocks = self._get_structure_index(draft_course_key, draft_course).memoize(
+                'changed_blocks',
+                published_course['_id'],
+                lambda: self._get_changed_blocks(draft_course, published_course),
+            )
+            return block_key in changed_blocks or block_key not in draft_course['blocks']
 
         def get_block(course_structure, block_key):
             return self._get_block_from_structure(course_structure, block_key)
 
-        draft_course = get_course(ModuleStoreEnum.BranchName.draft)
-        published_course = get_course(ModuleStoreEnum.BranchName.published)
-
         def has_changes_subtree(block_key):
             draft_block = get_block(draft_course, block_key)
             if draft_block is None:  # temporary fix for bad pointers TNL-1141
@@ -348,29 +378,96 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
             return False
 
-        return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
+        return has_changes_subtree(block_key)
+
+    def _get_changed_blocks(self, draft_structure, published_structure):
+        """
+        Returns the frozenset of the BlockKeys of the draft structure's blocks which have
+        unpublished changes in their subtree: the block, or one of its descendants, is
+        missing from the published structure or has a different version there.
+        """
+        draft_blocks = draft_structure['blocks']
+        published_blocks = published_structure['blocks']
+
+        # {BlockKey: whether the subtree has changes}, filled in bottom-up
+        changed = {}
+        # blocks whose children are being visited
+        visiting = set()
+
+        for root_key in draft_blocks:
+            stack = [root_key]
+            while stack:
+                block_key = stack[-1]
+                if block_key in changed:
+                    stack.pop()
+                    continue
+
+                draft_block = draft_blocks.get(block_key)
+                if draft_block is None:  # temporary fix for bad pointers TNL-1141
+                    changed[block_key] = True
+                    stack.pop()
+                    continue
+
+                children = draft_block.fields.get('children', [])
+                if block_key not in visiting:
+                    published_block = published_blocks.get(block_key)
+                    if published_block is None or self._get_version(draft_block) != self._get_version(published_block):
+                        changed[block_key] = True
+                        stack.pop()
+                        continue
+                    visiting.add(block_key)
+                    stack.extend(
+                        child_key for child_key in children
+                        if child_key not in changed and child_key not in visiting
+                    )
+                    continue
+
+                # all the children have been visited
+                stack.pop()
+                visiting.discard(block_key)
+                changed[block_key] = any(changed.get(child_key, False) for child_key in children)
+
+        return frozenset(block_key for block_key, has_changes in changed.iteritems() if has_changes)
 
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
         Returns the newly published item.
         """
+        return self.publish_many([location], user_id, blacklist=blacklist, **kwargs)[0]
+
+    def publish_many(self, locations, user_id, blacklist=None, **kwargs):
+        """
+        Publishes the subtrees under each of the locations, which must all be in the same course,
+        from the draft branch to the published branch in a single copy: this creates one new
+        published structure version and signals course_published once.
+        Returns the list of newly published items.
+        """
+        if not locations:
+            return []
+        course_key = locations[0].course_key
+        if any(location.course_key.for_branch(None) != course_key.for_branch(None) for location in locations):
+            raise ValueError(u"Cannot publish locations from several courses at once: {}".format(locations))
+
         super(DraftVersioningModuleStore, self).copy(
             user_id,
             # Directly using the replace function rather than the for_branch function
             # because for_branch obliterates the version_guid and will lead to missed version conflicts.
             # TODO Instead, the for_branch implementation should be fixed in the Opaque Keys library.
-            location.course_key.replace(branch=ModuleStoreEnum.BranchName.draft),
+            course_key.replace(branch=ModuleStoreEnum.BranchName.draft),
             # We clear out the version_guid here because the location here is from the draft branch, and that
             # won't have the same version guid
-            location.course_key.replace(branch=ModuleStoreEnum.BranchName.published, version_guid=None),
-            [location],
+            course_key.replace(branch=ModuleStoreEnum.BranchName.published, version_guid=None),
+            locations,
             blacklist=blacklist
         )
 
-        self._flag_publish_event(location.course_key)
+        self._flag_publish_event(course_key)
 
-        return self.get_item(location.for_branch(ModuleStoreEnum.BranchName.published), **kwargs)
+        return [
+            self.get_item(location.for_branch(ModuleStoreEnum.BranchName.published), **kwargs)
+            for location in locations
+        ]
 
     def unpublish(self, location, user_id, **kwargs):
         """
@@ -12,6 +12,20 @@ SplitMongoKVSid = namedtuple('SplitMongoKVSid', 'id, def_id')
 new_contract('BlockUsageLocator', BlockUsageLocator)
 
 
+class FieldDecodeStats(object):
+    """
+    Counts how many locally set fields were handed to SplitMongoKVS instances
+    in their raw (json) form, and how many of those were actually decoded
+    because they were accessed.
+    """
+    def __init__(self):
+        self.deferred = 0
+        self.decoded = 0
+
+    def __repr__(self):
+        return "FieldDecodeStats(deferred={}, decoded={})".format(self.deferred, self.decoded)
+
+
 class SplitMongoKVS(InheritanceKeyValueStore):
     """
     A KeyValueStore that maps keyed data access to one of the 3 data areas
@@ -21,16 +35,32 @@ class SplitMongoKVS(InheritanceKeyValueStore):
     VALID_SCOPES = (Scope.parent, Scope.children, Scope.settings, Scope.content)
 
     @contract(parent="BlockUsageLocator | None")
-    def __init__(self, definition, initial_values, default_values, parent, field_decorator=None):
+    def __init__(
+            self, definition, initial_values, default_values, parent, field_decorator=None,
+            field_converter=None, decode_stats=None
+    ):
         """
 
         :param definition: either a lazyloader or definition id for the definition
         :param initial_values: a dictionary of the locally set values
         :param default_values: any Scope.settings field defaults that are set locally
             (copied from a template block with copy_from_template)
+        :param field_converter: if given, initial_values are the raw (json) values, which are only
+            converted with this function (taking and returning a dict of fields) when first accessed
+        :param decode_stats: an optional FieldDecodeStats to record lazily decoded fields in
         """
-        # deepcopy so that manipulations of fields does not pollute the source
-        super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
+        if field_converter is None:
+            # deepcopy so that manipulations of fields does not pollute the source
+            super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
+            self._raw_fields = {}
+        else:
+            super(SplitMongoKVS, self).__init__({})
+            # shallow copy so that materializing fields does not pollute the source
+            self._raw_fields = dict(initial_values)
+        self._field_converter = field_converter
+        self._decode_stats = decode_stats
+        if decode_stats is not None:
+            decode_stats.deferred += len(self._raw_fields)
         self._definition = definition  # either a DefinitionLazyLoader or the db id of the definition.
         # if the db id, then the definition is presumed to be loaded into _fields
 
@@ -44,6 +74,9 @@ class SplitMongoKVS(InheritanceKeyValueStore):
         self.parent = parent
 
     def get(self, key):
+        # decode the raw field, if needed
+        self._materialize_field(key.field_name)
+
         # load the field, if needed
         if key.field_name not in self._fields:
             # parent undefined in editing runtime (I think)
@@ -78,7 +111,8 @@ class SplitMongoKVS(InheritanceKeyValueStore):
         if key.scope == Scope.content:
             self._load_definition()
 
-        # set the field
+        # set the field, discarding any raw value that was never decoded
+        self._raw_fields.pop(key.field_name, None)
         self._fields[key.field_name] = value
 
         # This function is currently incomplete: it doesn't handle side effects.
@@ -98,6 +132,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
             self._load_definition()
 
         # delete the field value
+        self._raw_fields.pop(key.field_name, None)
         if key.field_name in self._fields:
             del self._fields[key.field_name]
 
@@ -113,7 +148,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
 
         # it's not clear whether inherited values should return True. Right now they don't
         # if someone changes it so that they do, then change any tests of field.name in xx._field_data
-        return key.field_name in self._fields
+        return key.field_name in self._fields or key.field_name in self._raw_fields
 
     def default(self, key):
         """
@@ -125,6 +160,17 @@ class SplitMongoKVS(InheritanceKeyValueStore):
         # If not, try inheriting from a parent, then use the XBlock type's normal default value:
         return super(SplitMongoKVS, self).default(key)
 
+    def _materialize_field(self, field_name):
+        """
+        Decode the raw value of the given locally set field, if it hasn't been decoded yet
+        """
+        if field_name in self._raw_fields:
+            # deepcopy before converting so that manipulations of the field do not pollute the source
+            raw_value = copy.deepcopy(self._raw_fields.pop(field_name))
+            self._fields[field_name] = self._field_converter({field_name: raw_value})[field_name]
+            if self._decode_stats is not None:
+                self._decode_stats.decoded += 1
+
     def _load_definition(self):
         """
         Update fields w/ the lazily loaded definitions
@@ -0,0 +1,78 @@
+"""
+Differences between two versions of a split structure.
+
+Every block in a structure records, in edit_info.update_version, the structure
+version in which it was last changed. Two versions of a block with the same
+update_version are the same, so only the blocks whose markers differ have to
+be compared field by field.
+"""
+from collections import namedtuple
+
+
+class StructureDiff(namedtuple('StructureDiff', 'added removed modified')):
+    """
+    The changes from one structure version to another:
+
+        added: frozenset of the BlockKeys of the blocks only in the new version
+        removed: frozenset of the BlockKeys of the blocks only in the old version
+        modified: {BlockKey: BlockChanges} of the blocks changed in the new version
+    """
+    __slots__ = ()
+
+    @property
+    def changed(self):
+        """
+        The frozenset of the BlockKeys of all the added, removed and modified blocks.
+        """
+        return self.added | self.removed | frozenset(self.modified)
+
+
+class BlockChanges(namedtuple('BlockChanges', 'fields definition defaults')):
+    """
+    How a block changed between two structure versions:
+
+        fields: frozenset of the names of the settings fields (including 'children')
+            whose values changed, were set or were unset
+        definition: whether the block points to another definition (its content changed)
+        defaults: whether its default settings values (see BlockData.defaults) changed
+    """
+    __slots__ = ()
+
+
+_MISSING = object()
+
+
+def _changed_fields(old_fields, new_fields):
+    """
+    Returns the frozenset of the names of the fields which differ between the two field dicts.
+    """
+    return frozenset(
+        field_name
+        for field_name in set(old_fields) | set(new_fields)
+        if old_fields.get(field_name, _MISSING) != new_fields.get(field_name, _MISSING)
+    )
+
+
+def diff_structures(old_structure, new_structure):
+    """
+    Returns the :class:`StructureDiff` from old_structure to new_structure.
+    """
+    old_blocks = old_structure['blocks']
+    new_blocks = new_structure['blocks']
+
+    modified = {}
+    for block_key, new_block in new_blocks.iteritems():
+        old_block = old_blocks.get(block_key)
+        if old_block is None or old_block.edit_info.update_version == new_block.edit_info.update_version:
+            continue
+        modified[block_key] = BlockChanges(
+            fields=_changed_fields(old_block.fields, new_block.fields),
+            definition=old_block.definition != new_block.definition,
+            defaults=old_block.defaults != new_block.defaults,
+        )
+
+    return StructureDiff(
+        added=frozenset(block_key for block_key in new_blocks if block_key not in old_blocks),
+        removed=frozenset(block_key for block_key in old_blocks if block_key not in new_blocks),
+        modified=modified,
+    )
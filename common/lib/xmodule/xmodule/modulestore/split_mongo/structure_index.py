@@ -0,0 +1,181 @@
+"""
+In-memory secondary indexes over the blocks of a split structure.
+
+Structures are immutable once they've been written, so an index built for a
+structure version stays valid for as long as that version is around. The
+indexes only narrow down the set of blocks which get_items has to check: every
+candidate they return is still matched against the full query.
+
+The index also maps each block to its parents, for get_parent_location.
+"""
+import re
+from collections import defaultdict
+
+from xmodule.modulestore.split_mongo import BlockKey
+
+
+def _is_indexable(criteria):
+    """
+    Can blocks matching the criteria be found through a value lookup? Regexes,
+    functions and dicts ($in, $nin, $exists) have to be evaluated per block.
+    """
+    if isinstance(criteria, (dict, list, re._pattern_type)) or callable(criteria):  # pylint: disable=protected-access
+        return False
+    try:
+        hash(criteria)
+    except TypeError:
+        return False
+    return True
+
+
+def _lookup_values(criteria):
+    """
+    Returns the list of values a field must equal (or contain) to match the
+    criteria, or None if the criteria can't be answered through a value lookup.
+    """
+    if isinstance(criteria, dict) and criteria.keys() == ['$in']:
+        values = criteria['$in']
+        if all(_is_indexable(value) for value in values):
+            return values
+        return None
+    if _is_indexable(criteria):
+        return [criteria]
+    return None
+
+
+def _indexed_values(value):
+    """
+    Yields the values under which a field value is indexed: the value itself,
+    or each of its elements if it's a list (get_items matches lists on any element).
+    """
+    if isinstance(value, list):
+        for element in value:
+            for indexed_value in _indexed_values(element):
+                yield indexed_value
+    elif _is_indexable(value):
+        yield value
+
+
+class StructureIndex(object):
+    """
+    Indexes the blocks of one structure by block type, by block id, and
+    (built on first use) by the value of individual settings fields and
+    by child.
+
+    The index doesn't keep a reference to the structure itself: methods which
+    may need to index a settings field take the structure's blocks as argument.
+    """
+    def __init__(self, blocks):
+        """
+        Arguments:
+            blocks (dict): the structure's {BlockKey: BlockData} mapping
+        """
+        self.block_keys = []
+        self.by_type = defaultdict(list)
+        self.by_id = defaultdict(list)
+        for block_key in blocks:
+            self.block_keys.append(block_key)
+            self.by_type[block_key.type].append(block_key)
+            self.by_id[block_key.id].append(block_key)
+
+        # {field_name: set of the BlockKeys which set the field}
+        self._field_presence = {}
+        # {field_name: {value: set of the BlockKeys whose field equals or contains value}}
+        self._field_values = {}
+        # {BlockKey: list of the BlockKeys of its parents}
+        self._parents = None
+        # {name: (key, value)} of the values memoized through memoize()
+        self._memoized = {}
+
+    def memoize(self, name, key, compute):
+        """
+        Returns compute(), memoized along with the index under name as long as key is
+        unchanged. Used for data derived from the structure and one other immutable
+        input (identified by key); only the value for the latest key is kept.
+        """
+        memoized = self._memoized.get(name)
+        if memoized is not None and memoized[0] == key:
+            return memoized[1]
+        value = compute()
+        self._memoized[name] = (key, value)
+        return value
+
+    def parents(self, blocks):
+        """
+        Returns the {BlockKey: list of the BlockKeys of its parents} mapping of the structure.
+        Blocks without parents aren't in the mapping.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for block_key, block in blocks.iteritems():
+                for child in block.fields.get('children', []):
+                    parents[BlockKey(*child)].append(block_key)
+            self._parents = dict(parents)
+        return self._parents
+
+    def blocks_with_field(self, blocks, field_name):
+        """
+        Returns the set of BlockKeys of the blocks which explicitly set the settings field.
+        """
+        if field_name not in self._field_presence:
+            self._index_field(blocks, field_name)
+        return self._field_presence[field_name]
+
+    def blocks_with_value(self, blocks, field_name, value):
+        """
+        Returns the set of BlockKeys of the blocks whose settings field equals value,
+        or is a list containing value.
+        """
+        if field_name not in self._field_values:
+            self._index_field(blocks, field_name)
+        return self._field_values[field_name].get(value, frozenset())
+
+    def candidates(self, blocks, block_type=None, block_id=None, settings=None):
+        """
+        Returns the BlockKeys, in structure order, of the blocks which may match a get_items
+        query with the given block_type criteria, block id, and settings criteria. This is a
+        superset of the matching blocks: the caller still has to check each candidate.
+        """
+        if block_id is not None:
+            block_keys = self.by_id.get(block_id, []) if _is_indexable(block_id) else []
+        else:
+            block_types = _lookup_values(block_type) if block_type is not None else None
+            if block_types is None:
+                block_keys = self.block_keys
+            elif len(block_types) == 1:
+                block_keys = self.by_type.get(block_types[0], [])
+            else:
+                block_types = set(block_types)
+                block_keys = [block_key for block_key in self.block_keys if block_key.type in block_types]
+
+        for field_name, criteria in (settings or {}).iteritems():
+            if not block_keys:
+                break
+            values = _lookup_values(criteria)
+            if values is not None:
+                matching = set()
+                for value in values:
+                    matching.update(self.blocks_with_value(blocks, field_name, value))
+            elif isinstance(criteria, dict) and '$exists' in criteria and not criteria['$exists']:
+                continue
+            else:
+                # regexes, functions, $nin and $exists can only match fields which are set
+                matching = self.blocks_with_field(blocks, field_name)
+            block_keys = [block_key for block_key in block_keys if block_key in matching]
+
+        return block_keys
+
+    def _index_field(self, blocks, field_name):
+        """
+        Builds the presence and value indexes of the settings field.
+        """
+        presence = set()
+        values = defaultdict(set)
+        for block_key, block_data in blocks.iteritems():
+            if field_name not in block_data.fields:
+                continue
+            presence.add(block_key)
+            for value in _indexed_values(block_data.fields[field_name]):
+                values[value].add(block_key)
+        self._field_values[field_name] = dict(values)
+        self._field_presence[field_name] = presence
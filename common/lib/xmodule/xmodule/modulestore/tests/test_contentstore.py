@@ -1,6 +1,7 @@
 """
  Test contentstore.mongo functionality
 """
+import calendar
 import logging
 from uuid import uuid4
 import unittest
@@ -8,6 +9,7 @@ import mimetypes
 from tempfile import mkdtemp
 import path
 import shutil
+import tarfile
 
 from opaque_keys.edx.locator import CourseLocator, AssetLocator
 from opaque_keys.edx.keys import AssetKey
@@ -146,6 +148,38 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tarball(self, deprecated):
+        """
+        Test exporting the assets into an open tarball
+        """
+        self.set_up_assets(deprecated)
+        root_dir = path.Path(mkdtemp())
+        try:
+            with tarfile.open(root_dir / "export.tar.gz", 'w:gz') as tar_file:
+                self.contentstore.export_all_for_course(
+                    self.course1_key, "course/static",
+                    path.Path(root_dir / "policy.json"),
+                    tar_file=tar_file,
+                )
+            self.assertTrue(path.Path(root_dir / "policy.json").isfile())
+            with tarfile.open(root_dir / "export.tar.gz") as tar_file:
+                names = tar_file.getnames()
+                self.assertItemsEqual(names, ["course/static/" + filename for filename in self.course1_files])
+                for filename in self.course1_files:
+                    asset_key = self.course1_key.make_asset_key('asset', filename)
+                    content = self.contentstore.find(asset_key)
+                    self.assertEqual(tar_file.extractfile("course/static/" + filename).read(), content.data)
+                    # the member's mtime is the asset's UTC modification time
+                    self.assertEqual(
+                        tar_file.getmember("course/static/" + filename).mtime,
+                        calendar.timegm(content.last_modified_at.utctimetuple())
+                    )
+            # nothing but the policy file was written to disk
+            self.assertFalse(path.Path(root_dir / "course").exists())
+        finally:
+            shutil.rmtree(root_dir)
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -436,11 +436,12 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
                 revision=ModuleStoreEnum.RevisionOption.draft_preferred
             )
 
-    # draft: get draft, get ancestors up to course (2-6), compute inheritance
+    # draft: get draft, get ancestors up to course (2-6)
+    #    (editing a leaf doesn't change the inheritance tree, so it isn't recomputed)
     #    sends: update problem and then each ancestor up to course (edit info)
     # split: active_versions, definitions (calculator field), structures
     #  2 sends to update index & structure (note, it would also be definition if a content field changed)
-    @ddt.data((ModuleStoreEnum.Type.mongo, 7, 5), (ModuleStoreEnum.Type.split, 3, 2))
+    @ddt.data((ModuleStoreEnum.Type.mongo, 6, 5), (ModuleStoreEnum.Type.split, 3, 2))
     @ddt.unpack
     def test_update_item(self, default_ms, max_find, max_send):
         """
@@ -1092,6 +1093,28 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         parent = self.store.get_parent_location(self.xml_chapter_location)
         self.assertEqual(parent, self.course_locations[self.XML_COURSEID1])
 
+    # Draft: one get_parent query for all the locations
+    # Split: active_versions, structure
+    @ddt.data((ModuleStoreEnum.Type.mongo, 1, 0), (ModuleStoreEnum.Type.split, 2, 0))
+    @ddt.unpack
+    def test_get_parent_locations_batch(self, default_ms, max_find, max_send):
+        """
+        Test getting the parents of several locations of a course at once
+        """
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+
+        with check_mongo_calls(max_find, max_send):
+            parents = self.store.get_parent_locations([
+                self.problem_x1a_1, self.problem_x1a_2, self.vertical_x1a, self.problem_y1a_1,
+            ])
+        self.assertEqual(parents, {
+            self.problem_x1a_1: self.vertical_x1a,
+            self.problem_x1a_2: self.vertical_x1a,
+            self.vertical_x1a: self.sequential_x1,
+            self.problem_y1a_1: self.vertical_y1a,
+        })
+
     def verify_get_parent_locations_results(self, expected_results):
         """
         Verifies the results of calling get_parent_locations matches expected_results.
@@ -1101,6 +1124,10 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
                 parent_location,
                 self.store.get_parent_location(child_location, revision=revision)
             )
+            self.assertEqual(
+                {child_location: parent_location},
+                self.store.get_parent_locations([child_location], revision=revision)
+            )
 
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_get_parent_locations_moved_child(self, default_ms):
@@ -2330,6 +2357,43 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
                 self.store.delete_item(unit.location, self.user_id)
                 signal_handler.send.assert_called_with('course_published', course_key=course.id)
 
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_publish_many(self, default):
+        with MongoContentstoreBuilder().build() as contentstore:
+            signal_handler = Mock(name='signal_handler')
+            self.store = MixedModuleStore(
+                contentstore=contentstore,
+                create_modulestore_instance=create_modulestore_instance,
+                mappings={},
+                signal_handler=signal_handler,
+                **self.OPTIONS
+            )
+            self.addCleanup(self.store.close_all_connections)
+
+            with self.store.default_store(default):
+                course = self.store.create_course('org_x', 'course_y', 'run_z', self.user_id)
+                section = self.store.create_child(self.user_id, course.location, 'chapter')
+                subsection = self.store.create_child(self.user_id, section.location, 'sequential')
+                units = [self.store.create_child(self.user_id, subsection.location, 'vertical') for __ in range(3)]
+                problem = self.store.create_child(self.user_id, units[0].location, 'problem')
+
+                signal_handler.reset_mock()
+                published = self.store.publish_many([unit.location for unit in units[:2]], self.user_id)
+                self.assertEqual([item.location for item in published], [unit.location for unit in units[:2]])
+                # all the units are published by a single signalled publish
+                self.assertEqual(
+                    signal_handler.send.call_args_list.count(call('course_published', course_key=course.id)), 1
+                )
+
+                self.assertFalse(self._has_changes(units[0].location))
+                self.assertFalse(self._has_changes(units[1].location))
+                self.assertFalse(self._has_changes(problem.location))
+                self.assertTrue(self._has_changes(units[2].location))
+
+                signal_handler.reset_mock()
+                self.assertEqual(self.store.publish_many([], self.user_id), [])
+                signal_handler.send.assert_not_called()
+
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_bulk_course_publish_signal_direct_firing(self, default):
         with MongoContentstoreBuilder().build() as contentstore:
@@ -39,9 +39,9 @@ from nose.tools import assert_in
 from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
-from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.mongo.base import as_draft, as_published
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
-from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
+from xmodule.modulestore.tests.utils import LocationMixin, MemoryCache, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import InheritanceMixin
@@ -689,6 +689,38 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
         # Clean up the data so we don't break other tests which apparently expect a particular state
         self.draft_store.delete_course(course.id, self.dummy_user)
 
+    def test_metadata_inheritance_subtree_refresh(self):
+        """
+        Editing a container updates the cached inheritance tree of its subtree, with the
+        same result as recomputing the whole tree.
+        """
+        course = self.draft_store.create_course("TestX", "InheritanceTree", "1234_A1", self.dummy_user)
+        chapter = self.draft_store.create_child(self.dummy_user, course.location, "chapter")
+        sequential = self.draft_store.create_child(self.dummy_user, chapter.location, "sequential")
+        vertical = self.draft_store.create_child(self.dummy_user, sequential.location, "vertical")
+        html = self.draft_store.create_child(self.dummy_user, vertical.location, "html")
+
+        with patch.object(self.draft_store, 'metadata_inheritance_cache_subsystem', MemoryCache()):
+            # prime the cache
+            self.draft_store._get_cached_metadata_inheritance_tree(course.id)  # pylint: disable=protected-access
+
+            sequential = self.draft_store.get_item(sequential.location)
+            sequential.visible_to_staff_only = True
+            with patch.object(self.draft_store, 'refresh_cached_metadata_inheritance_tree') as mock_refresh:
+                self.draft_store.update_item(sequential, self.dummy_user)
+            self.assertFalse(mock_refresh.called)
+
+            tree = self.draft_store._lookup_cached_metadata_inheritance_tree(course.id)  # pylint: disable=protected-access
+            self.assertTrue(tree[unicode(as_published(vertical.location))]['visible_to_staff_only'])
+            self.assertTrue(tree[unicode(as_published(html.location))]['visible_to_staff_only'])
+            self.assertEqual(
+                tree,
+                self.draft_store._compute_metadata_inheritance_tree(course.id)  # pylint: disable=protected-access
+            )
+
+        # Clean up the data so we don't break other tests which apparently expect a particular state
+        self.draft_store.delete_course(course.id, self.dummy_user)
+
     def test_make_course_usage_key(self):
         """Test that we get back the appropriate usage key for the root of a course key."""
         course_key = CourseLocator(org="edX", course="101", run="2015")
@@ -3,13 +3,15 @@ Tests for split_migrator
 
 """
 import random
+import shutil
 import uuid
+from tempfile import mkdtemp
 
 import mock
 from nose.plugins.attrib import attr
 
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict, UNIQUE_ID
-from xmodule.modulestore.split_migrator import SplitMigrator
+from xmodule.modulestore.split_migrator import SplitMigrator, MigrationCheckpoints
 from xmodule.modulestore.tests.test_split_w_old_mongo import SplitWMongoCourseBootstrapper
 
 
@@ -198,3 +200,40 @@ class TestMigration(SplitWMongoCourseBootstrapper):
         # now compare the migrated to the original course
         self.compare_courses(self.draft_mongo, new_course_key, True)  # published
         self.compare_courses(self.draft_mongo, new_course_key, False)  # draft
+
+    def test_migrator_resumes(self):
+        """
+        Test that a migration interrupted after the published branch is resumed from its checkpoint
+        """
+        user = mock.Mock(id=1)
+        checkpoint_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir)
+        checkpoints = MigrationCheckpoints(checkpoint_dir)
+
+        with mock.patch.object(SplitMigrator, '_add_draft_modules_to_course', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                self.migrator.migrate_mongo_course(
+                    self.old_course_key, user.id, new_run='new_run', checkpoints=checkpoints
+                )
+        self.assertEqual(checkpoints.get(self.old_course_key)['phase'], MigrationCheckpoints.PUBLISHED)
+
+        with mock.patch.object(SplitMigrator, '_copy_published_modules_to_course') as mock_copy:
+            new_course_key = self.migrator.migrate_mongo_course(
+                self.old_course_key, user.id, new_run='new_run', checkpoints=checkpoints
+            )
+        self.assertFalse(mock_copy.called)
+        record = checkpoints.get(self.old_course_key)
+        self.assertEqual(record['phase'], MigrationCheckpoints.COMPLETE)
+        self.assertEqual(record['new_course_key'], unicode(new_course_key))
+        self.compare_courses(self.draft_mongo, new_course_key, True)  # published
+        self.compare_courses(self.draft_mongo, new_course_key, False)  # draft
+
+        # a completed migration isn't done again
+        with mock.patch.object(SplitMigrator, '_add_draft_modules_to_course') as mock_add_drafts:
+            self.assertEqual(
+                self.migrator.migrate_mongo_course(
+                    self.old_course_key, user.id, new_run='new_run', checkpoints=checkpoints
+                ),
+                new_course_key
+            )
+        self.assertFalse(mock_add_drafts.called)
@@ -30,6 +30,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import DefinitionCache
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -911,6 +912,48 @@ class SplitModuleCourseTests(SplitModuleTest):
         version_history = modulestore().get_block_generations(second_problem.location)
         self.assertNotEqual(version_history.locator.version_guid, first_problem.location.version_guid)
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_diff_structures(self, _from_json):
+        """
+        Test diff_structures
+        """
+        test_course = modulestore().create_course(
+            org='edu.harvard', course='diff', run='diff101', user_id='testbot',
+            master_branch=ModuleStoreEnum.BranchName.draft
+        )
+        chapter = modulestore().create_child(
+            'testbot', test_course.location, block_type='chapter', block_id='chapter1',
+        )
+        problem = modulestore().create_child(
+            'testbot', chapter.location, block_type='problem', block_id='problem1',
+            fields={'display_name': 'problem 1', 'data': '<problem></problem>'}
+        )
+        old_version = problem.location.course_key
+
+        problem = modulestore().get_item(problem.location.version_agnostic())
+        problem.display_name = 'problem one'
+        problem = modulestore().update_item(problem, 'testbot')
+        modulestore().create_child(
+            'testbot', chapter.location.version_agnostic(), block_type='html', block_id='html1',
+        )
+        new_version = test_course.id.version_agnostic()
+
+        diff = modulestore().diff_structures(old_version, new_version)
+        self.assertEqual(diff.added, {BlockKey('html', 'html1')})
+        self.assertEqual(diff.removed, frozenset())
+        # the course root is unchanged: its update_version marker is the same in both versions
+        self.assertItemsEqual(diff.modified.keys(), [BlockKey('problem', 'problem1'), BlockKey('chapter', 'chapter1')])
+        self.assertEqual(diff.modified[BlockKey('problem', 'problem1')].fields, {'display_name'})
+        self.assertFalse(diff.modified[BlockKey('problem', 'problem1')].definition)
+        self.assertEqual(diff.modified[BlockKey('chapter', 'chapter1')].fields, {'children'})
+
+        # the diff between the same versions is cached
+        self.assertIs(modulestore().diff_structures(old_version, new_version), diff)
+
+        reverse_diff = modulestore().diff_structures(new_version, old_version)
+        self.assertEqual(reverse_diff.removed, diff.added)
+        self.assertEqual(reverse_diff.changed, diff.changed)
+
     @ddt.data(
         ("course-v1:edx+test_course+test_run", BlockUsageLocator),
         ("ccx-v1:edX+test_course+test_run+ccx@1", CCXBlockUsageLocator),
@@ -1001,6 +1044,93 @@ class TestCourseStructureCache(SplitModuleTest):
         )
 
 
+class TestDefinitionCache(SplitModuleTest):
+    """Tests for the DefinitionCache"""
+
+    def setUp(self):
+        super(TestDefinitionCache, self).setUp()
+        # use the default cache as the shared tier, since there's no `definition_cache` during testing
+        self.cache = caches['default']
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+
+        patcher = patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.db_connection = modulestore().db_connection
+        patcher = patch.object(self.db_connection, 'definition_cache', DefinitionCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = random.getrandbits(32)
+        self.new_course = modulestore().create_course(
+            'org', 'course', 'test_run', self.user, BRANCH_NAME_DRAFT,
+        )
+        self.chapter = modulestore().create_child(self.user, self.new_course.location, 'chapter')
+        self.definition_ids = [
+            self.new_course.definition_locator.definition_id,
+            self.chapter.definition_locator.definition_id,
+        ]
+        # start from empty caches
+        self.cache.clear()
+        self.db_connection.definition_cache = DefinitionCache()
+
+    def test_get_definition(self):
+        with check_mongo_calls(1):
+            not_cached_definition = self.db_connection.get_definition(self.definition_ids[0])
+
+        # the definition is cached in both tiers
+        with check_mongo_calls(0):
+            cached_definition = self.db_connection.get_definition(self.definition_ids[0])
+        self.assertEqual(cached_definition, not_cached_definition)
+
+        # each get returns a new copy of the definition
+        cached_definition['fields']['display_name'] = 'Changed'
+        self.assertNotEqual(self.db_connection.get_definition(self.definition_ids[0]), cached_definition)
+
+        # another process reads it from the shared tier
+        self.db_connection.definition_cache = DefinitionCache()
+        with check_mongo_calls(0):
+            shared_definition = self.db_connection.get_definition(self.definition_ids[0])
+        self.assertEqual(shared_definition, not_cached_definition)
+
+    def test_get_definitions(self):
+        not_cached_definition = self.db_connection.get_definition(self.definition_ids[0])
+
+        # only the definition which isn't cached is read from the db
+        with check_mongo_calls(1):
+            definitions = self.db_connection.get_definitions(self.definition_ids)
+        self.assertItemsEqual([definition['_id'] for definition in definitions], self.definition_ids)
+        self.assertIn(not_cached_definition, definitions)
+
+        with check_mongo_calls(0):
+            self.db_connection.get_definitions(self.definition_ids)
+
+        self.assertEqual(self.db_connection.definition_cache.hits, 3)
+        self.assertEqual(self.db_connection.definition_cache.misses, 2)
+        self.assertEqual(self.db_connection.definition_cache.hit_rate, 0.6)
+
+    def test_local_tier_size(self):
+        definition_cache = DefinitionCache(local_size=1)
+        definitions = list(self.db_connection.definitions.find({'_id': {'$in': self.definition_ids}}))
+        definition_cache.set_many(definitions)
+
+        # the definitions are larger than the in-process tier: they're only in the shared tier
+        self.assertEqual(len(definition_cache._local), 0)  # pylint: disable=protected-access
+        self.assertItemsEqual(definition_cache.get_many(self.definition_ids).keys(), self.definition_ids)
+
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_definition_cache_no_cache_configured(self, mock_get_cache):
+        mock_get_cache.side_effect = InvalidCacheBackendError
+        self.db_connection.definition_cache = DefinitionCache()
+
+        with check_mongo_calls(1):
+            self.db_connection.get_definition(self.definition_ids[0])
+        with check_mongo_calls(1):
+            self.db_connection.get_definition(self.definition_ids[0])
+
+
 class SplitModuleItemTests(SplitModuleTest):
     '''
     Item read tests including inheritance
@@ -1198,6 +1328,10 @@ class SplitModuleItemTests(SplitModuleTest):
         self.assertEqual(len(matches), 3)
         matches = modulestore().get_items(locator, qualifiers={'category': 'garbage'})
         self.assertEqual(len(matches), 0)
+        matches = modulestore().get_items(locator, qualifiers={'category': {'$in': ['chapter', 'course']}})
+        self.assertEqual(len(matches), 4)
+        matches = modulestore().get_items(locator, qualifiers={'name': 'chapter1'})
+        self.assertEqual(len(matches), 1)
         matches = modulestore().get_items(
             locator,
             qualifiers={'category': 'chapter'},
@@ -0,0 +1,61 @@
+"""
+Tests for the lazy field materialization of SplitMongoKVS.
+"""
+import unittest
+
+from mock import Mock
+from xblock.fields import Scope
+from xblock.runtime import KeyValueStore
+
+from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS, FieldDecodeStats
+
+
+def settings_key(field_name):
+    """
+    Returns a KeyValueStore key for the Scope.settings field with the given name.
+    """
+    return KeyValueStore.Key(Scope.settings, None, None, field_name)
+
+
+class TestSplitMongoKVSLazyFields(unittest.TestCase):
+    """
+    Tests for SplitMongoKVS with a field_converter.
+    """
+    def setUp(self):
+        super(TestSplitMongoKVSLazyFields, self).setUp()
+        self.raw_fields = {'display_name': u'Unit', 'start': u'raw start', 'graded': True}
+        self.converter = Mock(side_effect=lambda fields: {name: ('converted', value) for name, value in fields.items()})
+        self.stats = FieldDecodeStats()
+        self.kvs = SplitMongoKVS(
+            None, self.raw_fields, {}, parent=None, field_converter=self.converter, decode_stats=self.stats,
+        )
+
+    def test_fields_decoded_on_first_read(self):
+        self.assertEqual(self.stats.deferred, 3)
+        self.assertEqual(self.stats.decoded, 0)
+        self.assertFalse(self.converter.called)
+
+        self.assertEqual(self.kvs.get(settings_key('start')), ('converted', u'raw start'))
+        self.assertEqual(self.kvs.get(settings_key('start')), ('converted', u'raw start'))
+        self.converter.assert_called_once_with({'start': u'raw start'})
+        self.assertEqual(self.stats.decoded, 1)
+
+        # the source fields aren't modified
+        self.assertEqual(self.raw_fields['start'], u'raw start')
+
+    def test_has_without_decoding(self):
+        self.assertTrue(self.kvs.has(settings_key('graded')))
+        self.assertFalse(self.kvs.has(settings_key('due')))
+        self.assertEqual(self.stats.decoded, 0)
+
+    def test_set_and_delete_skip_decoding(self):
+        self.kvs.set(settings_key('display_name'), u'New name')
+        self.assertEqual(self.kvs.get(settings_key('display_name')), u'New name')
+
+        self.kvs.delete(settings_key('graded'))
+        self.assertFalse(self.kvs.has(settings_key('graded')))
+        with self.assertRaises(KeyError):
+            self.kvs.get(settings_key('graded'))
+
+        self.assertEqual(self.stats.decoded, 0)
+        self.assertFalse(self.converter.called)
@@ -0,0 +1,62 @@
+"""
+Tests for the diffs between versions of split structures.
+"""
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_diff import BlockChanges, diff_structures
+
+
+class TestDiffStructures(unittest.TestCase):
+    """
+    Tests for diff_structures.
+    """
+    def setUp(self):
+        super(TestDiffStructures, self).setUp()
+        self.old_version = ObjectId()
+        self.new_version = ObjectId()
+        self.course = BlockKey('course', 'course')
+        self.problem = BlockKey('problem', 'problem')
+        self.video = BlockKey('video', 'video')
+        self.html = BlockKey('html', 'html')
+
+    def block(self, update_version, definition='definition', defaults=None, **fields):
+        """
+        Returns the BlockData of a block last changed in update_version.
+        """
+        return BlockData(
+            block_type='problem', definition=definition, defaults=defaults or {}, fields=fields,
+            edit_info={'update_version': update_version},
+        )
+
+    def test_diff(self):
+        old_structure = {'blocks': {
+            self.course: self.block(self.old_version, children=[self.problem, self.video]),
+            self.problem: self.block(self.old_version, display_name='Problem', weight=1),
+            self.video: self.block(self.old_version),
+        }}
+        new_structure = {'blocks': {
+            self.course: self.block(self.new_version, children=[self.problem, self.html]),
+            self.problem: self.block(self.new_version, definition='new definition', display_name='Edited'),
+            self.html: self.block(self.new_version),
+        }}
+
+        diff = diff_structures(old_structure, new_structure)
+        self.assertEqual(diff.added, {self.html})
+        self.assertEqual(diff.removed, {self.video})
+        self.assertEqual(diff.modified, {
+            self.course: BlockChanges(fields={'children'}, definition=False, defaults=False),
+            self.problem: BlockChanges(fields={'display_name', 'weight'}, definition=True, defaults=False),
+        })
+        self.assertEqual(diff.changed, {self.course, self.problem, self.video, self.html})
+
+    def test_unchanged_markers(self):
+        # blocks with the same update_version aren't compared: they can't differ
+        old_structure = {'blocks': {self.problem: self.block(self.old_version, display_name='Problem')}}
+        new_structure = {'blocks': {self.problem: self.block(self.old_version, display_name='Problem')}}
+
+        diff = diff_structures(old_structure, new_structure)
+        self.assertEqual(diff.changed, frozenset())
@@ -0,0 +1,96 @@
+"""
+Tests for the get_items indexes of split structures.
+"""
+import re
+import unittest
+
+from mock import Mock
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+
+
+class TestStructureIndex(unittest.TestCase):
+    """
+    Tests for StructureIndex.candidates.
+    """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.course = BlockKey('course', 'course')
+        self.chapter = BlockKey('chapter', 'chapter')
+        self.problem = BlockKey('problem', 'problem')
+        self.video = BlockKey('video', 'video')
+        self.other_problem = BlockKey('problem', 'other')
+        self.blocks = {
+            self.course: BlockData(block_type='course', fields={'children': [self.chapter]}),
+            self.chapter: BlockData(
+                block_type='chapter',
+                fields={'display_name': 'Intro', 'children': [self.problem, self.video, self.other_problem]},
+            ),
+            self.problem: BlockData(block_type='problem', fields={'group_access': {1: [2]}, 'weight': 1}),
+            self.video: BlockData(block_type='video', fields={'display_name': 'Intro'}),
+            self.other_problem: BlockData(block_type='problem', fields={'display_name': 'Other', 'weight': 2}),
+        }
+        self.index = StructureIndex(self.blocks)
+
+    def candidates(self, **kwargs):
+        """
+        Returns the set of candidates for the query.
+        """
+        return set(self.index.candidates(self.blocks, **kwargs))
+
+    def test_all_blocks(self):
+        self.assertEqual(self.candidates(), set(self.blocks))
+
+    def test_block_type(self):
+        self.assertEqual(self.candidates(block_type='problem'), {self.problem, self.other_problem})
+        self.assertEqual(self.candidates(block_type='garbage'), set())
+        self.assertEqual(
+            self.candidates(block_type={'$in': ['video', 'chapter']}), {self.video, self.chapter}
+        )
+        # criteria which can't be looked up don't narrow down the candidates
+        self.assertEqual(self.candidates(block_type=re.compile('prob')), set(self.blocks))
+
+    def test_block_id(self):
+        self.assertEqual(self.candidates(block_id='other'), {self.other_problem})
+        self.assertEqual(self.candidates(block_id='garbage'), set())
+
+    def test_settings_values(self):
+        self.assertEqual(self.candidates(settings={'display_name': 'Intro'}), {self.chapter, self.video})
+        self.assertEqual(
+            self.candidates(block_type='video', settings={'display_name': 'Intro'}), {self.video}
+        )
+        self.assertEqual(self.candidates(settings={'weight': {'$in': [1, 2]}}), {self.problem, self.other_problem})
+        # list values are indexed by each of their elements
+        self.assertEqual(self.candidates(settings={'children': self.video}), {self.chapter})
+
+    def test_settings_presence(self):
+        self.assertEqual(self.candidates(settings={'group_access': {'$exists': True}}), {self.problem})
+        self.assertEqual(self.candidates(settings={'group_access': {'$exists': False}}), set(self.blocks))
+        self.assertEqual(
+            self.candidates(settings={'display_name': re.compile('Int')}),
+            {self.chapter, self.video, self.other_problem},
+        )
+
+    def test_memoize(self):
+        compute = Mock(return_value='value')
+        self.assertEqual(self.index.memoize('name', 'key', compute), 'value')
+        self.assertEqual(self.index.memoize('name', 'key', compute), 'value')
+        self.assertEqual(compute.call_count, 1)
+
+        # a new key replaces the memoized value
+        self.assertEqual(self.index.memoize('name', 'other key', compute), 'value')
+        self.assertEqual(self.index.memoize('name', 'key', compute), 'value')
+        self.assertEqual(compute.call_count, 3)
+
+    def test_parents(self):
+        parents = self.index.parents(self.blocks)
+        self.assertEqual(parents, {
+            self.chapter: [self.course],
+            self.problem: [self.chapter],
+            self.video: [self.chapter],
+            self.other_problem: [self.chapter],
+        })
+        # the map is built once
+        self.assertIs(self.index.parents(self.blocks), parents)
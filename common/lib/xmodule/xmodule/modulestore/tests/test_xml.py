@@ -3,8 +3,10 @@ Tests around our XML modulestore, including importing
 well-formed and not-well-formed XML.
 """
 import os.path
+import shutil
 import unittest
 from glob import glob
+from tempfile import mkdtemp
 from mock import patch, Mock
 
 from xmodule.modulestore.xml import XMLModuleStore
@@ -120,6 +122,65 @@ class TestXMLModuleStore(unittest.TestCase):
                 # verify that the above context manager raises a ValueError
                 pass  # pragma: no cover
 
+    def assert_same_courses(self, expected_store, store):
+        """
+        Asserts that both stores loaded the same courses, with the same blocks and field values.
+        """
+        self.assertEqual(
+            sorted(course.id for course in expected_store.get_courses()),
+            sorted(course.id for course in store.get_courses()),
+        )
+        for course in expected_store.get_courses():
+            expected_items = {item.location: item for item in expected_store.get_items(course.id)}
+            items = {item.location: item for item in store.get_items(course.id)}
+            self.assertEqual(set(expected_items), set(items))
+            for location, expected_item in expected_items.iteritems():
+                item = items[location]
+                self.assertEqual(expected_item.__class__.__name__, item.__class__.__name__)
+                for field_name, field in expected_item.fields.iteritems():
+                    self.assertEqual(field.read_json(expected_item), field.read_json(item), (location, field_name))
+
+    def test_cached_courses(self):
+        """
+        Test that courses loaded from the on-disk cache are the same as parsed ones,
+        and that unchanged course directories aren't parsed again
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        source_dirs = ['toy', 'simple']
+
+        store = XMLModuleStore(DATA_DIR, source_dirs=source_dirs, xblock_mixins=(XModuleMixin,), cache_dir=cache_dir)
+        with patch.object(XMLModuleStore, 'load_course') as mock_load_course:
+            cached_store = XMLModuleStore(
+                DATA_DIR, source_dirs=source_dirs, xblock_mixins=(XModuleMixin,), cache_dir=cache_dir
+            )
+        self.assertFalse(mock_load_course.called)
+        self.assert_same_courses(store, cached_store)
+
+        # a different configuration doesn't use the cached courses
+        with patch.object(XMLModuleStore, 'load_course', return_value=None) as mock_load_course:
+            XMLModuleStore(DATA_DIR, source_dirs=source_dirs, cache_dir=cache_dir)
+        self.assertEqual(mock_load_course.call_count, len(source_dirs))
+
+    def test_courses_loaded_in_processes(self):
+        """
+        Test loading course directories in a pool of processes
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        source_dirs = ['toy', 'simple']
+
+        store = XMLModuleStore(DATA_DIR, source_dirs=source_dirs, xblock_mixins=(XModuleMixin,))
+        load_course = XMLModuleStore.load_course
+        with patch.object(XMLModuleStore, 'load_course', side_effect=load_course, autospec=True) as mock_load_course:
+            parallel_store = XMLModuleStore(
+                DATA_DIR, source_dirs=source_dirs, xblock_mixins=(XModuleMixin,),
+                cache_dir=cache_dir, load_processes=2,
+            )
+        # the courses were parsed by the worker processes, not by this one
+        self.assertFalse(mock_load_course.called)
+        self.assert_same_courses(store, parallel_store)
+
     @patch('xmodule.modulestore.xml.log')
     def test_dag_course(self, mock_logging):
         """
@@ -2,6 +2,7 @@ import hashlib
 import itertools
 import json
 import logging
+import multiprocessing
 import os
 import re
 import sys
@@ -30,13 +31,16 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey, Location
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator, BlockUsageLocator
 
 from xblock.field_data import DictFieldData
-from xblock.runtime import DictKeyValueStore
+from xblock.runtime import DictKeyValueStore, KeyValueStore, KvsFieldData
 from xblock.fields import ScopeIds
 
 import dogstats_wrapper as dog_stats_api
 
 from .exceptions import ItemNotFoundError
-from .inheritance import compute_inherited_metadata, inheriting_field_data, InheritanceKeyValueStore
+from .inheritance import (
+    compute_inherited_metadata, inheriting_field_data, InheritanceKeyValueStore, InheritingFieldData
+)
+from .xml_course_cache import course_cache_key, has_cached_course, read_cached_course, write_cached_course
 
 
 edx_xml_parser = etree.XMLParser(dtd_validation=False, load_dtd=False,
@@ -46,6 +50,18 @@ etree.set_default_parser(edx_xml_parser)
 
 log = logging.getLogger(__name__)
 
+# The XMLModuleStore which is loading courses in a process pool: forked workers inherit it.
+_LOADING_STORE = None
+
+
+def _cache_course_in_process(args):
+    """
+    Process pool worker: loads a course directory into the worker's copy of the loading
+    store, which caches the loaded course on disk for the parent process to read.
+    """
+    course_dir, course_ids, target_course_id = args
+    _LOADING_STORE.try_load_course(course_dir, course_ids, target_course_id)
+
 
 # VS[compat]
 # TODO (cpennington): Remove this once all fall 2012 courses have been imported
@@ -335,7 +351,8 @@ class XMLModuleStore(ModuleStoreReadBase):
     def __init__(
             self, data_dir, default_class=None, source_dirs=None, course_ids=None,
             load_error_modules=True, i18n_service=None, fs_service=None, user_service=None,
-            signal_handler=None, target_course_id=None, **kwargs   # pylint: disable=unused-argument
+            signal_handler=None, target_course_id=None, cache_dir=None, load_processes=None,
+            **kwargs   # pylint: disable=unused-argument
     ):
         """
         Initialize an XMLModuleStore from data_dir
@@ -348,6 +365,12 @@ class XMLModuleStore(ModuleStoreReadBase):
 
             source_dirs or course_ids (list of str): If specified, the list of source_dirs or course_ids to load.
                 Otherwise, load all courses. Note, providing both
+
+            cache_dir (str): If specified, the directory in which to cache the loaded courses, so that
+                unchanged course directories aren't parsed again. See xml_course_cache.
+
+            load_processes (int): If specified along with cache_dir, the number of processes in which
+                to parse the course directories which aren't cached yet.
         """
         super(XMLModuleStore, self).__init__(**kwargs)
 
@@ -369,7 +392,10 @@ class XMLModuleStore(ModuleStoreReadBase):
             self.default_class = class_
 
         # All field data will be stored in an inheriting field data.
-        self.field_data = inheriting_field_data(kvs=DictKeyValueStore())
+        self._field_kvs = DictKeyValueStore()
+        self.field_data = inheriting_field_data(kvs=self._field_kvs)
+
+        self.cache_dir = path(cache_dir) if cache_dir is not None else None
 
         self.i18n_service = i18n_service
         self.fs_service = fs_service
@@ -384,9 +410,47 @@ class XMLModuleStore(ModuleStoreReadBase):
         if source_dirs is None:
             source_dirs = sorted([d for d in os.listdir(self.data_dir) if
                                   os.path.exists(self.data_dir / d / self.parent_xml)])
+        if self.cache_dir is not None and load_processes:
+            self._cache_courses_in_processes(source_dirs, course_ids, target_course_id, load_processes)
         for course_dir in source_dirs:
             self.try_load_course(course_dir, course_ids, target_course_id)
 
+    def _cache_courses_in_processes(self, source_dirs, course_ids, target_course_id, processes):
+        """
+        Loads the course directories which aren't cached yet in a pool of processes, each of
+        which caches the courses it loaded. The courses are then read from the cache, in order,
+        by try_load_course; any course which couldn't be cached is simply loaded again there.
+        """
+        global _LOADING_STORE  # pylint: disable=global-statement
+
+        uncached_dirs = [
+            course_dir for course_dir in source_dirs
+            if not has_cached_course(
+                self.cache_dir, self.data_dir / course_dir, self._course_cache_key(course_dir, target_course_id)
+            )
+        ]
+        if len(uncached_dirs) < 2:
+            return
+
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        _LOADING_STORE = self
+        try:
+            pool = multiprocessing.Pool(min(processes, len(uncached_dirs)))
+            try:
+                pool.map(
+                    _cache_course_in_process,
+                    [(course_dir, course_ids, target_course_id) for course_dir in uncached_dirs],
+                    chunksize=1,
+                )
+            finally:
+                pool.close()
+                pool.join()
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed to load courselikes in parallel; loading them sequentially.")
+        finally:
+            _LOADING_STORE = None
+
     def try_load_course(self, course_dir, course_ids=None, target_course_id=None):
         '''
         Load a course, keeping track of errors as we go along. If course_ids is not None,
@@ -398,7 +462,18 @@ class XMLModuleStore(ModuleStoreReadBase):
         # place after the course loads and we have its location
         errorlog = make_error_tracker()
         course_descriptor = None
+        cache_key = None
         try:
+            if self.cache_dir is not None:
+                cache_key = self._course_cache_key(course_dir, target_course_id)
+                course_descriptor = self._load_cached_course(
+                    course_dir, cache_key, course_ids, errorlog, target_course_id
+                )
+                if course_descriptor is not None:
+                    # already set up when the course was cached
+                    self.courses[course_dir] = course_descriptor
+                    self._course_errors[self.id_from_descriptor(course_descriptor)] = errorlog
+                    return
             course_descriptor = self.load_course(course_dir, course_ids, errorlog.tracker, target_course_id)
         except Exception as exc:  # pylint: disable=broad-except
             msg = "ERROR: Failed to load courselike '{0}': {1}".format(
@@ -418,6 +493,98 @@ class XMLModuleStore(ModuleStoreReadBase):
             course_descriptor.parent = None
             course_id = self.id_from_descriptor(course_descriptor)
             self._course_errors[course_id] = errorlog
+            if cache_key is not None:
+                self._cache_course(course_dir, cache_key, course_descriptor, errorlog)
+
+    def _course_cache_key(self, course_dir, target_course_id):
+        """
+        Returns the key under which the course loaded from course_dir is cached.
+        """
+        default_class = self.default_class
+        config = (
+            self.__class__.__name__,
+            self.parent_xml,
+            self.load_error_modules,
+            default_class and '{}.{}'.format(default_class.__module__, default_class.__name__),
+            tuple('{}.{}'.format(mixin.__module__, mixin.__name__) for mixin in self.xblock_mixins),
+            unicode(target_course_id),
+        )
+        return course_cache_key(self.data_dir / course_dir, config)
+
+    def _cache_course(self, course_dir, cache_key, course_descriptor, errorlog):
+        """
+        Caches a snapshot of the course loaded from course_dir: for each of its blocks, the block's
+        class, scope ids and field storage. Courses with blocks whose fields aren't stored in one
+        of the ways the loader stores them aren't cached.
+        """
+        course_id = self.id_from_descriptor(course_descriptor)
+        blocks = []
+        shared_block_ids = set()
+        for block in self.modules[course_id].itervalues():
+            field_data = block._field_data  # pylint: disable=protected-access
+            if field_data is self.field_data:
+                # pure XBlocks store their fields in the store's shared key value store
+                storage = ('shared', None, None)
+                shared_block_ids.update([block.scope_ids.usage_id, block.scope_ids.def_id])
+            elif isinstance(field_data, DictFieldData):
+                storage = ('dict', field_data._data, None)  # pylint: disable=protected-access
+            elif isinstance(field_data, KvsFieldData) and isinstance(field_data._kvs, InheritanceKeyValueStore):  # pylint: disable=protected-access
+                kvs = field_data._kvs  # pylint: disable=protected-access
+                # library roots get an inheriting field data (see LibraryXMLModuleStore.patch_descriptor_kvs)
+                kind = 'inheriting_kvs' if isinstance(field_data, InheritingFieldData) else 'kvs'
+                storage = (kind, kvs._fields, kvs.inherited_settings)  # pylint: disable=protected-access
+            else:
+                return
+            block_class = getattr(block, 'unmixed_class', block.__class__)
+            blocks.append(
+                ((block_class.__module__, block_class.__name__), block.scope_ids) + storage
+            )
+
+        snapshot = {
+            'course_id': course_id,
+            'course_usage_id': course_descriptor.scope_ids.usage_id,
+            'errors': list(errorlog.errors),
+            'blocks': blocks,
+            'shared_fields': [
+                (tuple(key), value) for key, value in self._field_kvs.db_dict.iteritems()
+                if key.block_scope_id in shared_block_ids
+            ],
+        }
+        write_cached_course(self.cache_dir, self.data_dir / course_dir, cache_key, snapshot)
+
+    def _load_cached_course(self, course_dir, cache_key, course_ids, errorlog, target_course_id):
+        """
+        Returns the course descriptor of the course cached for course_dir, after adding its blocks
+        to this store, or None if the course isn't cached (or isn't one of the course_ids).
+        """
+        snapshot = read_cached_course(self.cache_dir, self.data_dir / course_dir, cache_key)
+        if snapshot is None:
+            return None
+        course_id = snapshot['course_id']
+        if course_ids is not None and course_id not in course_ids:
+            return None
+
+        log.debug('========> Loading cached courselike from %s', course_dir)
+        system = self._import_system(course_dir, course_id, errorlog.tracker, lambda usage_id: {}, target_course_id)
+        modules = {}
+        for (module_name, class_name), scope_ids, storage, fields, inherited_settings in snapshot['blocks']:
+            block_class = getattr(import_module(module_name), class_name)
+            if storage == 'shared':
+                field_data = None
+            elif storage == 'dict':
+                field_data = DictFieldData(fields)
+            else:
+                kvs = InheritanceKeyValueStore(initial_values=fields, inherited_settings=inherited_settings)
+                field_data = inheriting_field_data(kvs) if storage == 'inheriting_kvs' else KvsFieldData(kvs)
+            block = system.construct_xblock_from_class(block_class, scope_ids, field_data)
+            block.data_dir = course_dir
+            modules[scope_ids.usage_id] = block
+
+        for key, value in snapshot['shared_fields']:
+            self._field_kvs.db_dict[KeyValueStore.Key(*key)] = value
+        self.modules[course_id] = modules
+        errorlog.errors.extend(snapshot['errors'])
+        return modules[snapshot['course_usage_id']]
 
     def __unicode__(self):
         '''
@@ -549,30 +716,7 @@ class XMLModuleStore(ModuleStoreReadBase):
                 """
                 return policy.get(policy_key(usage_id), {})
 
-            services = {}
-            if self.i18n_service:
-                services['i18n'] = self.i18n_service
-
-            if self.fs_service:
-                services['fs'] = self.fs_service
-
-            if self.user_service:
-                services['user'] = self.user_service
-
-            system = ImportSystem(
-                xmlstore=self,
-                course_id=course_id,
-                course_dir=course_dir,
-                error_tracker=tracker,
-                load_error_modules=self.load_error_modules,
-                get_policy=get_policy,
-                mixins=self.xblock_mixins,
-                default_class=self.default_class,
-                select=self.xblock_select,
-                field_data=self.field_data,
-                services=services,
-                target_course_id=target_course_id,
-            )
+            system = self._import_system(course_dir, course_id, tracker, get_policy, target_course_id)
             course_descriptor = system.process_xml(etree.tostring(course_data, encoding='unicode'))
             # If we fail to load the course, then skip the rest of the loading steps
             if isinstance(course_descriptor, ErrorDescriptor):
@@ -583,6 +727,35 @@ class XMLModuleStore(ModuleStoreReadBase):
             log.debug('========> Done with courselike import from %s', course_dir)
             return course_descriptor
 
+    def _import_system(self, course_dir, course_id, tracker, get_policy, target_course_id):
+        """
+        Returns the ImportSystem used to load the course in course_dir.
+        """
+        services = {}
+        if self.i18n_service:
+            services['i18n'] = self.i18n_service
+
+        if self.fs_service:
+            services['fs'] = self.fs_service
+
+        if self.user_service:
+            services['user'] = self.user_service
+
+        return ImportSystem(
+            xmlstore=self,
+            course_id=course_id,
+            course_dir=course_dir,
+            error_tracker=tracker,
+            load_error_modules=self.load_error_modules,
+            get_policy=get_policy,
+            mixins=self.xblock_mixins,
+            default_class=self.default_class,
+            select=self.xblock_select,
+            field_data=self.field_data,
+            services=services,
+            target_course_id=target_course_id,
+        )
+
     def content_importers(self, system, course_descriptor, course_dir, url_name):
         """
         Load all extra non-course content, and calculate metadata inheritance.
@@ -0,0 +1,98 @@
+"""
+On-disk cache of the courses loaded by the XMLModuleStore.
+
+Each cached course is a snapshot of its loaded blocks (their classes, scope ids and
+field storage), stored in one file per course directory along with the key it was
+built for. The key hashes the loader's configuration and the path, mtime and size
+of every file in the course directory, so editing any file invalidates the snapshot.
+
+The key doesn't cover the code which parses the xml: the cache directory must be
+emptied when the xmodule code changes (e.g. by using a new directory per release).
+"""
+import cPickle as pickle
+import hashlib
+import logging
+import os
+
+log = logging.getLogger(__name__)
+
+# Bump when changing the snapshot format: snapshots in any other format are ignored.
+CACHE_FORMAT = 1
+
+
+def course_cache_key(course_path, config):
+    """
+    Returns the key of the cached snapshot of the course at course_path, loaded with
+    the given configuration (a tuple of strings).
+    """
+    key = hashlib.sha1(repr((CACHE_FORMAT, config)))
+    for dirpath, dirnames, filenames in os.walk(course_path):
+        # walk in a stable order, so that the key only depends on the files
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # e.g. a dangling symlink: it can't be loaded either
+                continue
+            key.update(repr((os.path.relpath(file_path, course_path), stat.st_mtime, stat.st_size)))
+    return key.hexdigest()
+
+
+def _cache_file_path(cache_dir, course_path):
+    """
+    Returns the path of the file which caches the course at course_path.
+    """
+    return os.path.join(cache_dir, hashlib.sha1(os.path.abspath(course_path)).hexdigest() + '.pickle')
+
+
+def has_cached_course(cache_dir, course_path, key):
+    """
+    Returns whether the course at course_path has a snapshot cached for key.
+    """
+    try:
+        with open(_cache_file_path(cache_dir, course_path), 'rb') as cache_file:
+            return pickle.load(cache_file) == key
+    except Exception:  # pylint: disable=broad-except
+        return False
+
+
+def read_cached_course(cache_dir, course_path, key):
+    """
+    Returns the snapshot of the course at course_path cached for key, or None.
+    """
+    try:
+        with open(_cache_file_path(cache_dir, course_path), 'rb') as cache_file:
+            if pickle.load(cache_file) != key:
+                return None
+            return pickle.load(cache_file)
+    except IOError:
+        return None
+    except Exception:  # pylint: disable=broad-except
+        log.warning("Ignoring unreadable cached course for %s", course_path, exc_info=True)
+        return None
+
+
+def write_cached_course(cache_dir, course_path, key, snapshot):
+    """
+    Caches the snapshot of the course at course_path for key, replacing any snapshot
+    previously cached for the course. Returns whether the snapshot could be cached.
+    """
+    cache_file_path = _cache_file_path(cache_dir, course_path)
+    # write to a temporary file then rename it, so that concurrent readers never see a partial file
+    temp_file_path = '{}.{}.tmp'.format(cache_file_path, os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(temp_file_path, 'wb') as cache_file:
+            pickle.dump(key, cache_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(snapshot, cache_file, pickle.HIGHEST_PROTOCOL)
+        os.rename(temp_file_path, cache_file_path)
+    except Exception:  # pylint: disable=broad-except
+        # e.g. a field value which can't be pickled
+        log.warning("Could not cache course %s", course_path, exc_info=True)
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        return False
+    return True
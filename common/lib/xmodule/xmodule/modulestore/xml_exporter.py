@@ -106,7 +106,7 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, tar_file=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -115,12 +115,16 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `tar_file`: An open `tarfile.TarFile` to export into, under `target_dir`, or None. The static
+            assets are then streamed into the archive instead of being written to `root_dir`, which
+            only holds the xml until it's added to the archive at the end of the export.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = target_dir
+        self.tar_file = tar_file
 
     @abstractmethod
     def get_key(self):
@@ -179,6 +183,25 @@ class ExportManager(object):
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+        if self.tar_file is not None:
+            self.tar_file.add(self.root_dir + '/' + self.target_dir, arcname=self.target_dir)
+
+    def export_static_assets(self):
+        """
+        Export the contentstore's static assets, and their policy file.
+        """
+        root_courselike_dir = self.root_dir + '/' + self.target_dir
+        if self.tar_file is None:
+            static_dir = root_courselike_dir + '/static/'
+        else:
+            static_dir = self.target_dir + '/static/'
+        self.contentstore.export_all_for_course(
+            self.courselike_key,
+            static_dir,
+            root_courselike_dir + '/policies/assets.json',
+            tar_file=self.tar_file,
+        )
+
 
 class CourseExportManager(ExportManager):
     """
@@ -218,15 +241,15 @@ class CourseExportManager(ExportManager):
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_assets()
 
             # If we are using the default course image, export it to the
-            # legacy location to support backwards compatibility.
-            if courselike.course_image == courselike.fields['course_image'].default:
+            # legacy location to support backwards compatibility, unless an
+            # asset was already streamed into the archive at that path.
+            legacy_course_image_path = self.target_dir + '/static/images/course_image.jpg'
+            if courselike.course_image == courselike.fields['course_image'].default and not (
+                    self.tar_file is not None and legacy_course_image_path in self.tar_file.getnames()
+            ):
                 try:
                     course_image = self.contentstore.find(
                         StaticContent.compute_location(
@@ -322,11 +345,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makeopendir('policies')
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_assets()
 
     def post_process(self, root, export_fs):
         """
@@ -341,18 +360,18 @@ class LibraryExportManager(ExportManager):
         xml_file.close()
 
 
-def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
+def export_course_to_xml(modulestore, contentstore, course_key, root_dir, course_dir, tar_file=None):
     """
     Thin wrapper for the Course Export Manager. See ExportManager for details.
     """
-    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir).export()
+    CourseExportManager(modulestore, contentstore, course_key, root_dir, course_dir, tar_file).export()
 
 
-def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir):
+def export_library_to_xml(modulestore, contentstore, library_key, root_dir, library_dir, tar_file=None):
     """
     Thin wrapper for the Library Export Manager. See ExportManager for details.
     """
-    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
+    LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir, tar_file).export()
 
 
 def adapt_references(subtree, destination_course_key, export_fs):
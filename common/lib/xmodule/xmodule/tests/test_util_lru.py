@@ -0,0 +1,59 @@
+"""
+Tests for the thread-safe LRU cache.
+"""
+import threading
+import unittest
+
+from ..util.lru import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """
+    Test `LRUCache`.
+    """
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        self.assertEqual(lru.get('a'), 1)
+        lru.set('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('a'), 1)
+        self.assertEqual(lru.get('c'), 3)
+        self.assertEqual(len(lru), 2)
+
+    def test_bounded_by_size(self):
+        lru = LRUCache(10, size_of=len)
+        lru.set('a', 'x' * 4)
+        lru.set('b', 'x' * 4)
+        lru.set('c', 'x' * 4)
+        self.assertNotIn('a', lru)
+        self.assertIn('b', lru)
+
+        # replacing a value accounts for the size of the previous one
+        lru.set('b', 'x' * 6)
+        self.assertIn('c', lru)
+
+        # values larger than the cache aren't stored
+        lru.set('d', 'x' * 11)
+        self.assertNotIn('d', lru)
+        self.assertEqual(lru.pop('b'), 'x' * 6)
+        self.assertEqual(len(lru), 1)
+
+    def test_concurrent_use(self):
+        lru = LRUCache(50)
+
+        def use():
+            """
+            Sets and gets overlapping keys.
+            """
+            for index in range(2000):
+                lru.set(index % 100, index)
+                lru.get((index + 50) % 100)
+
+        threads = [threading.Thread(target=use) for __ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(lru), 50)
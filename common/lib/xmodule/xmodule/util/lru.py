@@ -0,0 +1,93 @@
+"""
+Thread-safe least recently used cache, for the in-process caches shared by the
+requests of a process.
+"""
+import threading
+from collections import OrderedDict
+
+
+def _one(_value):
+    """
+    Counts every value as one, bounding the number of entries.
+    """
+    return 1
+
+
+class LRUCache(object):
+    """
+    Least recently used mapping bounded by the total size of its values, which
+    may be used by several threads at once.
+
+    Arguments:
+        max_size (int): the maximum total size of the values.
+        size_of (callable): returns the size of a value; every value counts as
+            one by default, so max_size is the maximum number of entries.
+    """
+    def __init__(self, max_size, size_of=_one):
+        self.max_size = max_size
+        self.size_of = size_of
+        self._size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the value for key, marking it as the most recently used.
+        """
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                return default
+            self._items[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Stores the value for key, evicting the least recently used entries to
+        stay within max_size. A value larger than max_size isn't stored.
+        """
+        size = self.size_of(value)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_size:
+                return
+            self._items[key] = value
+            self._size += size
+            while self._size > self.max_size:
+                __, evicted = self._items.popitem(last=False)
+                self._size -= self.size_of(evicted)
+
+    def pop(self, key, default=None):
+        """
+        Removes the entry for key, returning its value.
+        """
+        with self._lock:
+            return self._pop(key, default)
+
+    def _pop(self, key, default=None):
+        """
+        Removes the entry for key, returning its value. The lock must be held.
+        """
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            return default
+        self._size -= self.size_of(value)
+        return value
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
@@ -4,6 +4,7 @@ Utility functions for transcripts.
 """
 import os
 import copy
+import hashlib
 import json
 import requests
 import logging
@@ -14,6 +15,7 @@ from HTMLParser import HTMLParser
 from xmodule.exceptions import NotFoundError
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.django import contentstore
+from xmodule.util.lru import LRUCache
 
 from .bumper_utils import get_bumper_settings
 
@@ -37,6 +39,51 @@ class TranscriptsRequestValidationException(Exception):  # pylint: disable=missi
     pass
 
 
+# Total length of the converted transcripts kept in memory by each process.
+CONVERTED_TRANSCRIPTS_CACHE_SIZE = 16 * 1024 * 1024
+
+
+class ConvertedTranscriptsCache(object):
+    """
+    Least recently used cache of converted transcripts, bounded by their total length.
+
+    The conversions are keyed by the digest of their source transcript, so a
+    transcript uploaded again under the same name is converted again.
+    """
+    def __init__(self, max_size=CONVERTED_TRANSCRIPTS_CACHE_SIZE):
+        self._conversions = LRUCache(max_size, size_of=len)
+
+    @staticmethod
+    def digest(content):
+        """
+        Returns the digest of the transcript content.
+        """
+        if isinstance(content, unicode):
+            content = content.encode('utf8')
+        return hashlib.sha1(content).hexdigest()
+
+    def get_or_convert(self, content, input_format, output_format, speed, convert):
+        """
+        Returns the conversion of content from input_format to output_format at speed,
+        calling convert() to compute it if it isn't cached.
+        """
+        key = (self.digest(content), input_format, output_format, speed)
+        converted = self._conversions.get(key)
+        if converted is None:
+            converted = convert()
+            self._conversions.set(key, converted)
+        return converted
+
+    def clear(self):
+        """
+        Empties the cache.
+        """
+        self._conversions.clear()
+
+
+CONVERTED_TRANSCRIPTS = ConvertedTranscriptsCache()
+
+
 def generate_subs(speed, source_speed, source_subs):
     """
     Generate transcripts from one speed to another speed.
@@ -213,6 +260,28 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
     _ = item.runtime.service(item, "i18n").ugettext
     if subs_type.lower() != 'srt':
         raise TranscriptsGenerationException(_("We support only SubRip (*.srt) transcripts format."))
+    subs = subs_from_srt(subs_filedata, _)
+
+    for speed, subs_id in speed_subs.iteritems():
+        save_subs_to_store(
+            generate_subs(speed, 1, subs),
+            subs_id,
+            item,
+            language
+        )
+
+    return subs
+
+
+def subs_from_srt(subs_filedata, ugettext=lambda text: text):
+    """
+    Parse SubRip transcripts into "sjson" subs, at the same speed.
+
+    :param subs_filedata: unicode, content of the SubRip transcripts.
+    :param ugettext: translation function of the error messages.
+    :returns: "sjson" subs.
+    """
+    _ = ugettext
     try:
         srt_subs_obj = SubRipFile.from_string(subs_filedata)
     except Exception as ex:
@@ -232,21 +301,11 @@ def generate_subs_from_source(speed_subs, subs_type, subs_filedata, item, langua
         sub_ends.append(sub.end.ordinal)
         sub_texts.append(sub.text.replace('\n', ' '))
 
-    subs = {
+    return {
         'start': sub_starts,
         'end': sub_ends,
         'text': sub_texts}
 
-    for speed, subs_id in speed_subs.iteritems():
-        save_subs_to_store(
-            generate_subs(speed, 1, subs),
-            subs_id,
-            item,
-            language
-        )
-
-    return subs
-
 
 def generate_srt_from_sjson(sjson_subs, speed):
     """Generate transcripts with speed = 1.0 from sjson to SubRip (*.srt).
@@ -329,9 +388,10 @@ def manage_video_subtitles_save(item, user, old_metadata=None, generate_translat
     # 3. Generate transcripts translation only  when user clicks `save` button, not while switching tabs.
     a) delete sjson translation for those languages, which were removed from `item.transcripts`.
         Note: we are not deleting old SRT files to give user more flexibility.
-    b) For all SRT files in`item.transcripts` regenerate new SJSON files.
-        (To avoid confusing situation if you attempt to correct a translation by uploading
-        a new version of the SRT file with same name).
+    b) Check that all SRT files in`item.transcripts` exist and can be parsed. The SJSON
+        translations are converted from them when requested (see `get_or_create_sjson`),
+        so a translation corrected by uploading a new version of the SRT file with the
+        same name is served right away.
     """
 
     _ = item.runtime.service(item, "i18n").ugettext
@@ -376,12 +436,7 @@ def manage_video_subtitles_save(item, user, old_metadata=None, generate_translat
         reraised_message = ''
         for lang in new_langs:  # 3b
             try:
-                generate_sjson_for_all_speeds(
-                    item,
-                    item.transcripts[lang],
-                    {speed: subs_id for subs_id, speed in youtube_speed_dict(item).iteritems()},
-                    lang,
-                )
+                generate_sjson_for_all_speeds(item, item.transcripts[lang], {}, lang)
             except TranscriptException as ex:
                 # remove key from transcripts because proper srt file does not exist in assets.
                 item.transcripts.pop(lang)
@@ -413,7 +468,8 @@ def subs_filename(subs_id, lang='en'):
 
 def generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, lang):
     """
-    Generates sjson from srt for given lang.
+    Generates sjson from srt for given lang, saved for each {speed: subs_id} of
+    `result_subs_dict`. With an empty `result_subs_dict`, only checks the srt.
 
     `item` is module object.
     """
@@ -440,31 +496,38 @@ def generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, lang):
     )
 
 
-def get_or_create_sjson(item, transcripts):
+def get_or_create_sjson(item, transcripts, subs_id=None, speed=1.0):
     """
-    Get sjson if already exists, otherwise generate it.
+    Get the sjson of the transcript at `speed`, converted from the srt uploaded
+    by the user (see `Transcript.sjson_at_speed`).
 
-    Generate sjson with subs_id name, from user uploaded srt.
-    Subs_id is extracted from srt filename, which was set by user.
+    If the srt doesn't exist, fall back to the sjson previously generated from it
+    under the `subs_id` name (by default, the name of the srt without its extension).
 
     Args:
         transcipts (dict): dictionary of (language: file) pairs.
 
     Raises:
-        TranscriptException: when srt subtitles do not exist,
-        and exceptions from generate_subs_from_source.
+        TranscriptException: when neither the srt nor the sjson subtitles exist,
+        and exceptions from subs_from_srt.
 
     `item` is module object.
     """
+    _ = item.runtime.service(item, "i18n").ugettext
     user_filename = transcripts[item.transcript_language]
-    user_subs_id = os.path.splitext(user_filename)[0]
-    source_subs_id, result_subs_dict = user_subs_id, {1.0: user_subs_id}
     try:
-        sjson_transcript = Transcript.asset(item.location, source_subs_id, item.transcript_language).data
-    except NotFoundError:  # generating sjson from srt
-        generate_sjson_for_all_speeds(item, user_filename, result_subs_dict, item.transcript_language)
-    sjson_transcript = Transcript.asset(item.location, source_subs_id, item.transcript_language).data
-    return sjson_transcript
+        srt_transcripts = Transcript.get_asset(item.location, user_filename)
+    except NotFoundError as ex:
+        if subs_id is None:
+            subs_id = os.path.splitext(user_filename)[0]
+        try:
+            return Transcript.asset(item.location, subs_id, item.transcript_language).data
+        except NotFoundError:
+            raise TranscriptException(_("{exception_message}: Can't find uploaded transcripts: {user_filename}").format(
+                exception_message=ex.message,
+                user_filename=user_filename
+            ))
+    return Transcript.sjson_at_speed(srt_transcripts.data, 'srt', speed)
 
 
 class Transcript(object):
@@ -491,6 +554,16 @@ class Transcript(object):
         if input_format == output_format:
             return content
 
+        return CONVERTED_TRANSCRIPTS.get_or_convert(
+            content, input_format, output_format, 1.0,
+            lambda: Transcript._convert(content, input_format, output_format)
+        )
+
+    @staticmethod
+    def _convert(content, input_format, output_format):
+        """
+        Uncached implementation of `convert`.
+        """
         if input_format == 'srt':
 
             if output_format == 'txt':
@@ -509,6 +582,30 @@ class Transcript(object):
             elif output_format == 'srt':
                 return generate_srt_from_sjson(json.loads(content), speed=1.0)
 
+    @staticmethod
+    def sjson_at_speed(content, input_format, speed=1.0):
+        """
+        Return the sjson of transcript `content`, in `input_format` (srt or sjson)
+        at speed 1.0, with its timings scaled to `speed`.
+
+        Conversions are cached, so a transcript is parsed once however many times
+        and at whichever speeds it's requested.
+        """
+        assert input_format in ('srt', 'sjson')
+
+        def convert():
+            """
+            Parses the transcript and scales it.
+            """
+            if input_format == 'srt':
+                # Used utf-8-sig encoding type instead of utf-8 to remove BOM(Byte Order Mark), e.g. U+FEFF
+                subs = subs_from_srt(content.decode('utf-8-sig'))
+            else:
+                subs = json.loads(content)
+            return json.dumps(generate_subs(speed, 1, subs), indent=2)
+
+        return CONVERTED_TRANSCRIPTS.get_or_convert(content, input_format, 'sjson', speed, convert)
+
     @staticmethod
     def asset(location, subs_id, lang='en', filename=None):
         """
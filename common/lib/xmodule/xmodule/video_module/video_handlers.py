@@ -95,15 +95,14 @@ class VideoStudentViewHandlers(object):
             If english -> give back youtube_id subtitles:
                 Return what we have in contentstore for given youtube_id.
             If non-english:
-                a) extract youtube_id from srt file name.
-                b) try to find sjson by youtube_id and return if successful.
-                c) generate sjson from srt for all youtube speeds.
+                a) convert the srt to sjson at the speed of youtube_id (conversions are cached).
+                b) if there's no srt, return the sjson previously generated for youtube_id.
         if non-youtube:
             If english -> give back `sub` subtitles:
                 Return what we have in contentstore for given subs_if that is stored in self.sub.
             If non-english:
-                a) try to find previously generated sjson.
-                b) otherwise generate sjson from srt and return it.
+                a) convert the srt to sjson (conversions are cached).
+                b) if there's no srt, return the previously generated sjson.
 
         Filenames naming:
             en: subs_videoid.srt.sjson
@@ -124,19 +123,7 @@ class VideoStudentViewHandlers(object):
                 log.info("Youtube_id %s does not exist", youtube_id)
                 raise NotFoundError
 
-            try:
-                sjson_transcript = Transcript.asset(self.location, youtube_id, self.transcript_language).data
-            except NotFoundError:
-                log.info("Can't find content in storage for %s transcript: generating.", youtube_id)
-                generate_sjson_for_all_speeds(
-                    self,
-                    other_lang[self.transcript_language],
-                    {speed: youtube_id for youtube_id, speed in youtube_ids.iteritems()},
-                    self.transcript_language
-                )
-                sjson_transcript = Transcript.asset(self.location, youtube_id, self.transcript_language).data
-
-            return sjson_transcript
+            return get_or_create_sjson(self, other_lang, subs_id=youtube_id, speed=youtube_ids[youtube_id])
         else:
             # HTML5 case
             if self.transcript_language == 'en':
@@ -6,6 +6,8 @@ import logging
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.utils.timezone import UTC
 
 from lazy import lazy
@@ -121,3 +123,15 @@ class CcxFieldOverride(models.Model):
         unique_together = (('ccx', 'location', 'field'),)
 
     value = models.TextField(default='null')
+
+
+@receiver(post_save, sender=CustomCourseForEdX)
+def start_overrides_version(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Start a new version of the overrides of a new CCX, so that it never reads
+    the cached overrides of a deleted CCX which had the same id.
+    """
+    if created:
+        # avoid circular import problems
+        from .overrides import bump_overrides_version
+        bump_overrides_version(instance)
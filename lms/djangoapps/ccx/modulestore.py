@@ -167,6 +167,15 @@ class CCXModulestoreWrapper(object):
                 self._modulestore.get_parent_location(location, **kwargs)
             )
 
+    def get_parent_locations(self, locations, **kwargs):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        stripped = [strip_ccx(location) for location in locations]
+        parents = self._modulestore.get_parent_locations([location for location, __ in stripped], **kwargs)
+        return {
+            location: restore_ccx_collection(parents[stripped_location], ccx_id)
+            for location, (stripped_location, ccx_id) in zip(locations, stripped)
+        }
+
     def get_block_original_usage(self, usage_key):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(usage_key) as (usage_key, restore):
@@ -259,6 +268,15 @@ class CCXModulestoreWrapper(object):
                 self._modulestore.publish(location, user_id, **kwargs)
             )
 
+    def publish_many(self, locations, user_id, **kwargs):
+        """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
+        stripped = [strip_ccx(location) for location in locations]
+        ccx_id = stripped[0][1] if stripped else None
+        return restore_ccx_collection(
+            self._modulestore.publish_many([location for location, __ in stripped], user_id, **kwargs),
+            ccx_id
+        )
+
     def unpublish(self, location, user_id, **kwargs):
         """See the docs for xmodule.modulestore.mixed.MixedModuleStore"""
         with remove_ccx(location) as (location, restore):
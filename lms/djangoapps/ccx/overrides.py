@@ -4,7 +4,10 @@ by the individual custom courses feature.
 """
 import json
 import logging
+import uuid
+from collections import defaultdict
 
+from django.core.cache import cache
 from django.db import transaction, IntegrityError
 
 import request_cache
@@ -18,6 +21,9 @@ from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+# How long the compiled snapshots of the overrides of the CCXs are cached.
+OVERRIDES_SNAPSHOT_TIMEOUT = 24 * 60 * 60
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -101,64 +107,163 @@ def get_override_for_ccx(ccx, block, name, default=None):
         return default
 
 
+def _overrides_version_key(ccx):
+    """
+    Returns the cache key of the version of the overrides of the `ccx`.
+    """
+    return u'ccx-overrides-version.{}'.format(ccx.id)
+
+
+def _get_overrides_version(ccx):
+    """
+    Returns the version of the overrides of the `ccx`, a token which changes
+    whenever they are written.
+    """
+    version_key = _overrides_version_key(ccx)
+    version = cache.get(version_key)
+    if version is None:
+        # Never set or evicted: start a new version, as the snapshots cached
+        # under the old one may be out of date.
+        cache.add(version_key, uuid.uuid4().hex, None)
+        version = cache.get(version_key)
+    return version
+
+
+def bump_overrides_version(ccx):
+    """
+    Starts a new version of the overrides of the `ccx`, so that their snapshot
+    gets compiled again from the database on next access.
+
+    Until the transaction writing the overrides commits, concurrent requests
+    still read the old overrides and may cache them under the new version.
+    So inside a transaction, the version is bumped again by
+    bump_pending_overrides_versions once it has committed.
+    """
+    cache.set(_overrides_version_key(ccx), uuid.uuid4().hex, None)
+    if transaction.get_connection().in_atomic_block:
+        request_cache.get_cache('ccx-overrides-pending-bumps')[ccx.id] = ccx
+
+
+def bump_pending_overrides_versions():
+    """
+    Bumps again the versions of the overrides written in transactions of the
+    current request. To be called once they have committed.
+    """
+    pending_bumps = request_cache.get_cache('ccx-overrides-pending-bumps')
+    for ccx in pending_bumps.values():
+        cache.set(_overrides_version_key(ccx), uuid.uuid4().hex, None)
+    pending_bumps.clear()
+
+
 def _get_overrides_for_ccx(ccx):
     """
-    Returns a dictionary mapping field name to overriden value for any
-    overrides set on this block for this CCX.
+    Returns a dictionary mapping each block location to the overrides set on
+    the block for this CCX: the overridden JSON values by field name, and the
+    ids of the overrides by field name + "_id".
+
+    The dictionary is compiled once per version of the overrides of the CCX
+    and shared across requests through the cache.
     """
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
+        snapshot_key = u'ccx-overrides.{}.{}'.format(ccx.id, _get_overrides_version(ccx))
+        overrides = cache.get(snapshot_key)
+
+        if overrides is None:
+            overrides = {}
+            query = CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            )
+
+            for override in query:
+                block_overrides = overrides.setdefault(override.location, {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
 
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+            cache.set(snapshot_key, overrides, OVERRIDES_SNAPSHOT_TIMEOUT)
 
         overrides_cache[ccx] = overrides
 
     return overrides_cache[ccx]
 
 
-@transaction.atomic
 def override_field_for_ccx(ccx, block, name, value):
     """
     Overrides a field for the `ccx`.  `block` and `name` specify the block
     and the name of the field on that block to override.  `value` is the
     value to set for the given field.
     """
+    if _override_field_for_ccx(ccx, block, name, value):
+        bump_overrides_version(ccx)
+
+
+@transaction.atomic
+def _override_field_for_ccx(ccx, block, name, value):
+    """
+    Writes the override of a field for the `ccx`, returns whether it changed.
+    """
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
-
-    override = get_override_for_ccx(ccx, block, name + "_instance")
-    if override:
-        override_has_changes = serialized_value != override.value
+    block_overrides = _get_overrides_for_ccx(ccx).setdefault(block.location, {})
 
-    if not override:
+    override_id = block_overrides.get(name + "_id")
+    if override_id:
+        override_has_changes = value_json != block_overrides.get(name)
+        if override_has_changes:
+            CcxFieldOverride.objects.filter(id=override_id).update(value=serialized_value)
+    else:
         override, created = CcxFieldOverride.objects.get_or_create(
             ccx=ccx,
             location=block.location,
             field=name,
             defaults={'value': serialized_value},
         )
-        if created:
-            _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name + "_id"] = override.id
-        else:
-            override_has_changes = serialized_value != override.value
+        override_has_changes = created or serialized_value != override.value
+        if override_has_changes and not created:
+            override.value = serialized_value
+            override.save()
+        block_overrides[name + "_id"] = override.id
 
-    if override_has_changes:
-        override.value = serialized_value
-        override.save()
+    block_overrides[name] = value_json
+    return override_has_changes
 
-    _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name] = value_json
-    _get_overrides_for_ccx(ccx).setdefault(block.location, {})[name + "_instance"] = override
+
+def bulk_override_fields(ccx, overrides):
+    """
+    Overrides several fields for the `ccx` at once.  `overrides` maps the
+    (block, field name) pairs to override to the values to set.
+
+    The existing overrides are read in a single query, the missing ones are
+    inserted in a single query and the changed ones are updated in one query
+    per distinct value.
+    """
+    serialized_values = {
+        (block.location, name): json.dumps(block.fields[name].to_json(value))
+        for (block, name), value in overrides.iteritems()
+    }
+
+    with transaction.atomic():
+        ids_by_changed_value = defaultdict(list)
+        for override in CcxFieldOverride.objects.filter(ccx=ccx):
+            serialized_value = serialized_values.pop((override.location, override.field), None)
+            if serialized_value is not None and serialized_value != override.value:
+                ids_by_changed_value[serialized_value].append(override.id)
+
+        # what's left in serialized_values isn't overridden yet
+        CcxFieldOverride.objects.bulk_create([
+            CcxFieldOverride(ccx=ccx, location=location, field=name, value=value)
+            for (location, name), value in serialized_values.iteritems()
+        ])
+        for serialized_value, ids in ids_by_changed_value.iteritems():
+            CcxFieldOverride.objects.filter(id__in=ids).update(value=serialized_value)
+
+    if serialized_values or ids_by_changed_value:
+        bump_overrides_version(ccx)
+        # The ids of the inserted overrides aren't known, so the overrides are
+        # compiled again on next access.
+        request_cache.get_cache('ccx-overrides').pop(ccx, None)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -175,6 +280,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        bump_overrides_version(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -188,7 +294,6 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
         ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(block.location, {})
         ccx_override_map.pop(name)
         ccx_override_map.pop(name + "_id")
-        ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
 
@@ -201,3 +306,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        bump_overrides_version(ccx)
@@ -18,7 +18,7 @@ from xmodule.modulestore.tests.django_utils import (
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import bulk_override_fields, override_field_for_ccx
 
 from lms.djangoapps.ccx.tests.test_views import flatten, iter_blocks
 
@@ -160,3 +160,63 @@ class TestFieldOverrides(ModuleStoreTestCase):
         override_field_for_ccx(self.ccx, chapter, 'due', ccx_due)
         vertical = chapter.get_children()[0].get_children()[0]
         self.assertEqual(vertical.due, ccx_due)
+
+    def test_overrides_cached_across_requests(self):
+        """
+        Test that the overrides are read from the database once until they change.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEquals(chapter.start, ccx_start)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertEquals(chapter.start, ccx_start)
+
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assertEquals(chapter.start, new_ccx_start)
+
+    def test_bulk_override_fields(self):
+        """
+        Test that bulk overriding fields inserts the new overrides in one query.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx.course.get_children()[0]
+        sequentials = chapter.get_children()
+        overrides = {(sequential, 'visible_to_staff_only'): True for sequential in sequentials}
+        overrides[(chapter, 'start')] = ccx_start
+        # One SAVEPOINT/RELEASE SAVEPOINT pair, one SELECT and one INSERT.
+        with self.assertNumQueries(4):
+            bulk_override_fields(self.ccx, overrides)
+
+        self.assertEquals(chapter.start, ccx_start)
+        self.assertEquals(sequentials[0].start, ccx_start)
+        for sequential in sequentials:
+            self.assertTrue(sequential.visible_to_staff_only)
+
+    def test_bulk_override_fields_updates_changed_fields(self):
+        """
+        Test that bulk overriding fields updates only the changed overrides,
+        in one query per value.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx.course.get_children()
+        bulk_override_fields(self.ccx, {(chapter, 'start'): ccx_start for chapter in chapters})
+
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        overrides = {(chapter, 'start'): new_ccx_start for chapter in chapters}
+        # One SAVEPOINT/RELEASE SAVEPOINT pair, one SELECT and one UPDATE.
+        with self.assertNumQueries(4):
+            bulk_override_fields(self.ccx, overrides)
+        for chapter in chapters:
+            self.assertEquals(chapter.start, new_ccx_start)
+
+        # Nothing changed: only the SELECT.
+        with self.assertNumQueries(3):
+            bulk_override_fields(self.ccx, overrides)
@@ -56,8 +56,10 @@ from lms.djangoapps.ccx.models import CustomCourseForEdX
 from lms.djangoapps.ccx.overrides import (
     get_override_for_ccx,
     override_field_for_ccx,
+    bulk_override_fields,
     clear_ccx_field_info_from_ccx_map,
     bulk_delete_ccx_override_fields,
+    bump_pending_overrides_versions,
 )
 
 log = logging.getLogger(__name__)
@@ -109,6 +111,25 @@ def coach_dashboard(view):
     return wrapper
 
 
+def commit_ccx_overrides(view):
+    """
+    View decorator for the views writing CCX overrides, to be used with
+    transaction.non_atomic_requests: runs the view in a transaction, then
+    bumps the versions of the overrides once it has committed, so that no
+    concurrent request keeps a snapshot of the old overrides.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        """
+        Wraps the view function in a transaction.
+        """
+        with transaction.atomic():
+            response = view(*args, **kwargs)
+        bump_pending_overrides_versions()
+        return response
+    return wrapper
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -158,9 +179,11 @@ def dashboard(request, course, ccx=None):
     return render_to_response('ccx/coach_dashboard.html', context)
 
 
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
+@commit_ccx_overrides
 def create_ccx(request, course, ccx=None):
     """
     Create a new CCX
@@ -184,20 +207,23 @@ def create_ccx(request, course, ccx=None):
 
     # Make sure start/due are overridden for entire course
     start = TODAY().replace(tzinfo=pytz.UTC)
-    override_field_for_ccx(ccx, course, 'start', start)
-    override_field_for_ccx(ccx, course, 'due', None)
-
-    # Enforce a static limit for the maximum amount of students that can be enrolled
-    override_field_for_ccx(ccx, course, 'max_student_enrollments_allowed', settings.CCX_MAX_STUDENTS_ALLOWED)
+    overrides = {
+        (course, 'start'): start,
+        (course, 'due'): None,
+        # Enforce a static limit for the maximum amount of students that can be enrolled
+        (course, 'max_student_enrollments_allowed'): settings.CCX_MAX_STUDENTS_ALLOWED,
+    }
 
     # Hide anything that can show up in the schedule
     hidden = 'visible_to_staff_only'
     for chapter in course.get_children():
-        override_field_for_ccx(ccx, chapter, hidden, True)
+        overrides[(chapter, hidden)] = True
         for sequential in chapter.get_children():
-            override_field_for_ccx(ccx, sequential, hidden, True)
+            overrides[(sequential, hidden)] = True
             for vertical in sequential.get_children():
-                override_field_for_ccx(ccx, vertical, hidden, True)
+                overrides[(vertical, hidden)] = True
+
+    bulk_override_fields(ccx, overrides)
 
     ccx_id = CCXLocator.from_course_locator(course.id, ccx.id)
 
@@ -238,9 +264,11 @@ def assign_coach_role_to_ccx(ccx_locator, user, master_course_id):
                 allow_access(course, user, "ccx_coach", send_email=False)
 
 
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
+@commit_ccx_overrides
 def save_ccx(request, course, ccx=None):
     """
     Save changes to CCX.
@@ -248,11 +276,13 @@ def save_ccx(request, course, ccx=None):
     if not ccx:
         raise Http404
 
+    overrides = {}
+
     def override_fields(parent, data, graded, earliest=None, ccx_ids_to_delete=None):
         """
-        Recursively apply CCX schedule data to CCX by overriding the
-        `visible_to_staff_only`, `start` and `due` fields for units in the
-        course.
+        Recursively collect the overrides of the `visible_to_staff_only`,
+        `start` and `due` fields for units in the course which apply CCX
+        schedule data to CCX.
         """
         if ccx_ids_to_delete is None:
             ccx_ids_to_delete = []
@@ -262,14 +292,13 @@ def save_ccx(request, course, ccx=None):
 
         for unit in data:
             block = blocks[unit['location']]
-            override_field_for_ccx(
-                ccx, block, 'visible_to_staff_only', unit['hidden'])
+            overrides[(block, 'visible_to_staff_only')] = unit['hidden']
 
             start = parse_date(unit['start'])
             if start:
                 if not earliest or start < earliest:
                     earliest = start
-                override_field_for_ccx(ccx, block, 'start', start)
+                overrides[(block, 'start')] = start
             else:
                 ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'start_id'))
                 clear_ccx_field_info_from_ccx_map(ccx, block, 'start')
@@ -278,7 +307,7 @@ def save_ccx(request, course, ccx=None):
             if 'due' in unit:  # checking that the key (due) exist in dict (unit).
                 due = parse_date(unit['due'])
                 if due:
-                    override_field_for_ccx(ccx, block, 'due', due)
+                    overrides[(block, 'due')] = due
                 else:
                     ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'due_id'))
                     clear_ccx_field_info_from_ccx_map(ccx, block, 'due')
@@ -296,10 +325,10 @@ def save_ccx(request, course, ccx=None):
                 for component in block.get_children():
                     # override start and due date of problem (Copy dates of vertical into problems)
                     if start:
-                        override_field_for_ccx(ccx, component, 'start', start)
+                        overrides[(component, 'start')] = start
 
                     if due:
-                        override_field_for_ccx(ccx, component, 'due', due)
+                        overrides[(component, 'due')] = due
 
             if children:
                 override_fields(block, children, graded, earliest, ccx_ids_to_delete)
@@ -309,7 +338,8 @@ def save_ccx(request, course, ccx=None):
     earliest, ccx_ids_to_delete = override_fields(course, json.loads(request.body), graded, [])
     bulk_delete_ccx_override_fields(ccx, ccx_ids_to_delete)
     if earliest:
-        override_field_for_ccx(ccx, course, 'start', earliest)
+        overrides[(course, 'start')] = earliest
+    bulk_override_fields(ccx, overrides)
 
     # Attempt to automatically adjust grading policy
     changed = False
@@ -334,9 +364,11 @@ def save_ccx(request, course, ccx=None):
     )
 
 
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
+@commit_ccx_overrides
 def set_grading_policy(request, course, ccx=None):
     """
     Set grading policy for the CCX.
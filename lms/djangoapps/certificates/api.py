@@ -126,6 +126,52 @@ def generate_user_certificates(student, course_key, course=None, insecure=False,
     return cert.status
 
 
+def generate_user_certificates_in_bulk(students, course_key, course=None, insecure=False, generation_mode='batch',
+                                       forced_grade=None):
+    """
+    The batch version of generate_user_certificates: adds the add-cert requests
+    of many students of a course into the xqueue, with the bulk lookups and the
+    concurrent XQueue submissions of XQueueCertInterface.add_certs.
+
+    Pass chunks of students small enough for their scores to be held in memory.
+
+    Args:
+        students (list of User)
+        course_key (CourseKey)
+
+    Keyword Arguments:
+        course, insecure, generation_mode, forced_grade: see generate_user_certificates.
+
+    Returns a list of (student, certificate status) pairs in the order of students.
+    The status is None if no certificate could be requested for the student.
+    """
+    xqueue = XQueueCertInterface()
+    if insecure:
+        xqueue.use_https = False
+    generate_pdf = not has_html_certificates_enabled(course_key, course)
+    results = []
+    for student, cert in xqueue.add_certs(
+            students,
+            course_key,
+            course=course,
+            generate_pdf=generate_pdf,
+            forced_grade=forced_grade
+    ):
+        if cert is None:
+            results.append((student, None))
+            continue
+        if cert.status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
+            emit_certificate_event('created', student, course_key, course, {
+                'user_id': student.id,
+                'course_id': unicode(course_key),
+                'certificate_id': cert.verify_uuid,
+                'enrollment_mode': cert.mode,
+                'generation_mode': generation_mode
+            })
+        results.append((student, cert.status))
+    return results
+
+
 def regenerate_user_certificates(student, course_key, course=None,
                                  forced_grade=None, template_file=None, insecure=False):
     """
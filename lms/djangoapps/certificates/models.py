@@ -351,6 +351,23 @@ def handle_post_cert_generated(sender, instance, **kwargs):  # pylint: disable=u
         fulfill_course_milestone(instance.course_id, instance.user)
 
 
+def certificate_display_status(generated_certificate, get_course_mode_slugs):
+    """
+    Returns the status of the certificate as reported for its student.
+
+    Arguments:
+        generated_certificate (GeneratedCertificate): the student's certificate.
+        get_course_mode_slugs (callable): returns the slugs of the modes of the
+            certificate's course; only called for audit certificates.
+    """
+    if generated_certificate.mode == 'audit':
+        # Short term fix to make sure old audit users with certs still see their certs
+        # only do this if there if no honor mode
+        if 'honor' not in get_course_mode_slugs():
+            return CertificateStatuses.auditing
+    return generated_certificate.status
+
+
 def certificate_status_for_student(student, course_id):
     '''
     This returns a dictionary with a key for status, and other information.
@@ -384,22 +401,17 @@ def certificate_status_for_student(student, course_id):
         generated_certificate = GeneratedCertificate.objects.get(  # pylint: disable=no-member
             user=student, course_id=course_id)
         cert_status = {
-            'status': generated_certificate.status,
+            'status': certificate_display_status(
+                generated_certificate,
+                lambda: [mode.slug for mode in CourseMode.modes_for_course(course_id)],
+            ),
             'mode': generated_certificate.mode,
             'uuid': generated_certificate.verify_uuid,
         }
         if generated_certificate.grade:
             cert_status['grade'] = generated_certificate.grade
 
-        if generated_certificate.mode == 'audit':
-            course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
-            # Short term fix to make sure old audit users with certs still see their certs
-            # only do this if there if no honor mode
-            if 'honor' not in course_mode_slugs:
-                cert_status['status'] = CertificateStatuses.auditing
-                return cert_status
-
-        if generated_certificate.status == CertificateStatuses.downloadable:
+        if cert_status['status'] == CertificateStatuses.downloadable:
             cert_status['download_url'] = generated_certificate.download_url
 
         return cert_status
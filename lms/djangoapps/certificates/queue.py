@@ -2,6 +2,10 @@
 import json
 import random
 import logging
+import threading
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
 import lxml.html
 from lxml.etree import XMLSyntaxError, ParserError
 from uuid import uuid4
@@ -9,6 +13,7 @@ from uuid import uuid4
 from django.test.client import RequestFactory
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db import IntegrityError, transaction
 from requests.auth import HTTPBasicAuth
 
 from courseware import grades
@@ -22,6 +27,7 @@ from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
+    certificate_display_status,
     certificate_status_for_student,
     CertificateStatuses as status,
     CertificateWhitelist,
@@ -31,6 +37,9 @@ from certificates.models import (
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of threads submitting certificate tasks to the XQueue in add_certs.
+XQUEUE_SUBMIT_WORKERS = 4
+
 
 class XQueueAddToQueueError(Exception):
     """An error occurred when adding a certificate task to the queue. """
@@ -50,6 +59,185 @@ class XQueueAddToQueueError(Exception):
         )
 
 
+class _StudentLookups(object):
+    """
+    The data about a student that add_cert needs besides their grade, looked up one
+    student at a time.
+    """
+    def __init__(self, course_id, whitelist, restricted):
+        self.course_id = course_id
+        self.whitelist = whitelist
+        self.restricted = restricted
+
+    def cert_status(self, student):
+        """The status of the student's certificate (see certificate_status_for_student)."""
+        return certificate_status_for_student(student, self.course_id)['status']
+
+    def profile_name(self, student):
+        """The student's full name."""
+        return UserProfile.objects.get(user=student).name
+
+    def is_whitelisted(self, student):
+        """Whether the student is whitelisted for a certificate in the course."""
+        return self.whitelist.filter(user=student, course_id=self.course_id, whitelist=True).exists()
+
+    def enrollment_mode(self, student):
+        """The student's enrollment mode in the course."""
+        return CourseEnrollment.enrollment_mode_for_user(student, self.course_id)[0]
+
+    def is_verified(self, student):
+        """Whether the student has verified their identity."""
+        return SoftwareSecurePhotoVerification.user_is_verified(student)
+
+    def is_restricted(self, student):
+        """Whether the student is on the embargoed country restricted list."""
+        return self.restricted.filter(user=student).exists()
+
+    def certificate(self, student):
+        """The student's GeneratedCertificate in the course, created if needed."""
+        cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=self.course_id)  # pylint: disable=no-member
+        return cert
+
+
+class _BulkStudentLookups(_StudentLookups):
+    """
+    The same data, looked up for a list of students with one query per kind of data.
+    The students who have no certificate yet get one, created in bulk.
+    """
+    def __init__(self, course_id, whitelist, restricted, students):
+        super(_BulkStudentLookups, self).__init__(course_id, whitelist, restricted)
+        user_ids = [student.id for student in students]
+
+        self._certificates = {
+            cert.user_id: cert
+            for cert in GeneratedCertificate.objects.filter(course_id=course_id, user_id__in=user_ids)  # pylint: disable=no-member
+        }
+        missing_user_ids = [user_id for user_id in user_ids if user_id not in self._certificates]
+        if missing_user_ids:
+            try:
+                with transaction.atomic():
+                    GeneratedCertificate.objects.bulk_create([  # pylint: disable=no-member
+                        GeneratedCertificate(user_id=user_id, course_id=course_id) for user_id in missing_user_ids
+                    ])
+            except IntegrityError:
+                # Another process created some of these certificates since we looked;
+                # create the rest one at a time.
+                for user_id in missing_user_ids:
+                    GeneratedCertificate.objects.get_or_create(  # pylint: disable=no-member
+                        user_id=user_id, course_id=course_id
+                    )
+            # read them back, as bulk_create doesn't set their primary keys
+            self._certificates.update({
+                cert.user_id: cert
+                for cert in GeneratedCertificate.objects.filter(  # pylint: disable=no-member
+                    course_id=course_id, user_id__in=missing_user_ids
+                )
+            })
+        self._course_mode_slugs = [mode.slug for mode in CourseMode.modes_for_course(course_id)]
+
+        self._profile_names = dict(UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'name'))
+        self._whitelisted = set(whitelist.filter(
+            course_id=course_id, whitelist=True, user_id__in=user_ids
+        ).values_list('user_id', flat=True))
+        self._enrollment_modes = dict(CourseEnrollment.objects.filter(
+            course_id=course_id, user_id__in=user_ids
+        ).values_list('user_id', 'mode'))
+        self._verified = SoftwareSecurePhotoVerification.verified_user_ids(user_ids)
+        self._restricted = set(restricted.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+
+    def cert_status(self, student):
+        return certificate_display_status(self._certificates[student.id], lambda: self._course_mode_slugs)
+
+    def profile_name(self, student):
+        try:
+            return self._profile_names[student.id]
+        except KeyError:
+            raise UserProfile.DoesNotExist
+
+    def is_whitelisted(self, student):
+        return student.id in self._whitelisted
+
+    def enrollment_mode(self, student):
+        return self._enrollment_modes.get(student.id)
+
+    def is_verified(self, student):
+        return student.id in self._verified
+
+    def is_restricted(self, student):
+        return student.id in self._restricted
+
+    def certificate(self, student):
+        return self._certificates[student.id]
+
+
+class _PipelinedSubmissions(object):
+    """
+    Sends certificate tasks to the XQueue from a pool of threads while the caller
+    prepares the next certificates. Each thread has its own XQueue interface, as
+    their requests sessions can't be shared between threads.
+
+    The outcome of each submission is handled (on the caller's thread, which owns
+    the database connection) once a window of submissions is in flight, and when
+    the submissions are closed.
+    """
+    def __init__(self, cert_interface, workers=XQUEUE_SUBMIT_WORKERS):
+        self._cert_interface = cert_interface
+        self._pool = ThreadPool(workers)
+        self._window = 2 * workers
+        self._pending = deque()
+        self._local = threading.local()
+
+    def _xqueue_interface(self):
+        """
+        Returns the XQueue interface of the current thread, created on first use
+        with the same settings as the certificate interface's own.
+        """
+        xqueue_interface = getattr(self._local, 'xqueue_interface', None)
+        if xqueue_interface is None:
+            shared = self._cert_interface.xqueue_interface
+            xqueue_interface = self._local.xqueue_interface = XQueueInterface(
+                shared.url, shared.auth, shared.session.auth
+            )
+        return xqueue_interface
+
+    def _send(self, contents, key):
+        """
+        Sends the task, returning the XQueueAddToQueueError raised if any.
+        """
+        try:
+            self._cert_interface._send_to_xqueue(  # pylint: disable=protected-access
+                contents, key, xqueue_interface=self._xqueue_interface()
+            )
+        except XQueueAddToQueueError as exc:
+            return exc
+        return None
+
+    def submit(self, cert, contents, key):
+        """
+        Queues the certificate's task for submission.
+        """
+        self._pending.append((cert, key, self._pool.apply_async(self._send, (contents, key))))
+        while len(self._pending) > self._window:
+            self._finish(*self._pending.popleft())
+
+    def _finish(self, cert, key, result):
+        """
+        Waits for the certificate's task to be submitted, and records the outcome.
+        """
+        self._cert_interface._record_submission(cert, key, result.get())  # pylint: disable=protected-access
+
+    def close(self):
+        """
+        Waits for all the queued tasks to be submitted, and records their outcome.
+        """
+        try:
+            while self._pending:
+                self._finish(*self._pending.popleft())
+        finally:
+            self._pool.close()
+            self._pool.join()
+
+
 class XQueueCertInterface(object):
     """
     XQueueCertificateInterface provides an
@@ -81,6 +269,19 @@ class XQueueCertInterface(object):
 
     """
 
+    # The certificate statuses from which a new certificate can be requested.
+    VALID_STATUSES = [
+        status.generating,
+        status.unavailable,
+        status.deleted,
+        status.error,
+        status.notpassing,
+        status.downloadable,
+        status.auditing,
+        status.audit_passing,
+        status.audit_notpassing,
+    ]
+
     def __init__(self, request=None):
 
         # Get basic auth (username/password) for
@@ -213,20 +414,92 @@ class XQueueCertInterface(object):
 
         Returns the newly created certificate instance
         """
+        # The caller can optionally pass a course in to avoid
+        # re-fetching it from Mongo. If they have not provided one,
+        # get it from the modulestore.
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
+
+        # Needed for access control in grading.
+        self.request.user = student
+        self.request.session = {}
+
+        return self._add_cert(
+            student,
+            course_id,
+            course,
+            _StudentLookups(course_id, self.whitelist, self.restricted),
+            lambda: grades.grade(student, self.request, course),
+            forced_grade=forced_grade,
+            template_file=template_file,
+            generate_pdf=generate_pdf,
+        )
+
+    def add_certs(self, students, course_id, course=None, forced_grade=None, template_file=None, generate_pdf=True):
+        """
+        Request new certificates for many students of a course: the batch
+        version of add_cert, for a chunk of students at a time.
+
+        The students are graded in one pass, the data about them is looked up
+        with one query per kind of data (certificates missing are created in
+        bulk), and the tasks are submitted to the XQueue by a pool of threads
+        while the next students are processed.
+
+        Returns a list of (student, certificate) pairs in the order of students. The
+        certificate is None if the student couldn't be graded or their certificate
+        status doesn't allow generating one.
+        """
+        if course is None:
+            course = modulestore().get_course(course_id, depth=0)
 
-        valid_statuses = [
-            status.generating,
-            status.unavailable,
-            status.deleted,
-            status.error,
-            status.notpassing,
-            status.downloadable,
-            status.auditing,
-            status.audit_passing,
-            status.audit_notpassing,
-        ]
-
-        cert_status = certificate_status_for_student(student, course_id)['status']
+        students = list(students)
+        lookups = _BulkStudentLookups(course_id, self.whitelist, self.restricted, students)
+        submissions = _PipelinedSubmissions(self) if generate_pdf else None
+
+        # {student id: certificate}
+        certs = {}
+        # only grade the students who can get a certificate
+        gradable_students = []
+        for student in students:
+            if lookups.cert_status(student) in self.VALID_STATUSES:
+                gradable_students.append(student)
+            else:
+                # logs why no certificate can be requested
+                certs[student.id] = self._add_cert(student, course_id, course, lookups, None)
+
+        try:
+            for student, grade, error in grades.iterate_grades_for(course, gradable_students, prefetch_scores=True):
+                if error:
+                    certs[student.id] = None
+                    continue
+                certs[student.id] = self._add_cert(
+                    student,
+                    course_id,
+                    course,
+                    lookups,
+                    lambda: grade,  # pylint: disable=cell-var-from-loop
+                    forced_grade=forced_grade,
+                    template_file=template_file,
+                    generate_pdf=generate_pdf,
+                    submissions=submissions,
+                )
+        finally:
+            if submissions is not None:
+                submissions.close()
+        return [(student, certs.get(student.id)) for student in students]
+
+    def _add_cert(self, student, course_id, course, lookups, get_grade, forced_grade=None, template_file=None,
+                  generate_pdf=True, submissions=None):
+        """
+        Implementation of add_cert and add_certs, given the lookups of the data
+        about the student, and a function returning their grade.
+
+        If submissions is a _PipelinedSubmissions, the certificate task is queued
+        there rather than sent to the XQueue right away.
+        """
+        valid_statuses = self.VALID_STATUSES
+
+        cert_status = lookups.cert_status(student)
         cert = None
 
         if cert_status not in valid_statuses:
@@ -243,24 +516,13 @@ class XQueueCertInterface(object):
             )
             return None
 
-        # The caller can optionally pass a course in to avoid
-        # re-fetching it from Mongo. If they have not provided one,
-        # get it from the modulestore.
-        if course is None:
-            course = modulestore().get_course(course_id, depth=0)
-
-        profile = UserProfile.objects.get(user=student)
-        profile_name = profile.name
+        profile_name = lookups.profile_name(student)
 
-        # Needed for access control in grading.
-        self.request.user = student
-        self.request.session = {}
-
-        is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
-        grade = grades.grade(student, self.request, course)
-        enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
+        is_whitelisted = lookups.is_whitelisted(student)
+        grade = get_grade()
+        enrollment_mode = lookups.enrollment_mode(student)
         mode_is_verified = enrollment_mode in GeneratedCertificate.VERIFIED_CERTS_MODES
-        user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
+        user_is_verified = lookups.is_verified(student)
         cert_mode = enrollment_mode
         is_eligible_for_certificate = is_whitelisted or CourseMode.is_eligible_for_certificate(enrollment_mode)
 
@@ -281,7 +543,7 @@ class XQueueCertInterface(object):
         if forced_grade:
             grade['grade'] = forced_grade
 
-        cert, created = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)  # pylint: disable=no-member
+        cert = lookups.certificate(student)
 
         cert.mode = cert_mode
         cert.user = student
@@ -356,7 +618,7 @@ class XQueueCertInterface(object):
         # Check to see whether the student is on the the embargoed
         # country restricted list. If so, they should not receive a
         # certificate -- set their status to restricted and log it.
-        if self.restricted.filter(user=student).exists():
+        if lookups.is_restricted(student):
             cert.status = status.restricted
             cert.save()
 
@@ -374,12 +636,12 @@ class XQueueCertInterface(object):
             return cert
 
         # Finally, generate the certificate and send it off.
-        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf)
+        return self._generate_cert(cert, course, student, grade_contents, template_pdf, generate_pdf, submissions)
 
-    def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf):
+    def _generate_cert(self, cert, course, student, grade_contents, template_pdf, generate_pdf, submissions=None):
         """
         Generate a certificate for the student. If `generate_pdf` is True,
-        sends a request to XQueue.
+        sends a request to XQueue (through submissions, if given).
         """
         course_id = unicode(course.id)
 
@@ -403,32 +665,45 @@ class XQueueCertInterface(object):
         cert.save()
 
         if generate_pdf:
-            try:
-                self._send_to_xqueue(contents, key)
-            except XQueueAddToQueueError as exc:
-                cert.status = ExampleCertificate.STATUS_ERROR
-                cert.error_reason = unicode(exc)
-                cert.save()
-                LOGGER.critical(
-                    (
-                        u"Could not add certificate task to XQueue.  "
-                        u"The course was '%s' and the student was '%s'."
-                        u"The certificate task status has been marked as 'error' "
-                        u"and can be re-submitted with a management command."
-                    ), course_id, student.id
-                )
+            if submissions is not None:
+                submissions.submit(cert, contents, key)
             else:
-                LOGGER.info(
-                    (
-                        u"The certificate status has been set to '%s'.  "
-                        u"Sent a certificate grading task to the XQueue "
-                        u"with the key '%s'. "
-                    ),
-                    cert.status,
-                    key
-                )
+                try:
+                    self._send_to_xqueue(contents, key)
+                except XQueueAddToQueueError as exc:
+                    self._record_submission(cert, key, exc)
+                else:
+                    self._record_submission(cert, key, None)
         return cert
 
+    def _record_submission(self, cert, key, exc):
+        """
+        Records the outcome of sending the certificate's task to the XQueue: on
+        an XQueueAddToQueueError exc, the certificate is marked as 'error'.
+        """
+        if exc is not None:
+            cert.status = ExampleCertificate.STATUS_ERROR
+            cert.error_reason = unicode(exc)
+            cert.save()
+            LOGGER.critical(
+                (
+                    u"Could not add certificate task to XQueue.  "
+                    u"The course was '%s' and the student was '%s'."
+                    u"The certificate task status has been marked as 'error' "
+                    u"and can be re-submitted with a management command."
+                ), unicode(cert.course_id), cert.user_id
+            )
+        else:
+            LOGGER.info(
+                (
+                    u"The certificate status has been set to '%s'.  "
+                    u"Sent a certificate grading task to the XQueue "
+                    u"with the key '%s'. "
+                ),
+                cert.status,
+                key
+            )
+
     def add_example_cert(self, example_cert):
         """Add a task to create an example certificate.
 
@@ -491,7 +766,8 @@ class XQueueCertInterface(object):
                 ), example_cert.uuid, unicode(exc)
             )
 
-    def _send_to_xqueue(self, contents, key, task_identifier=None, callback_url_path='/update_certificate'):
+    def _send_to_xqueue(self, contents, key, task_identifier=None, callback_url_path='/update_certificate',
+                        xqueue_interface=None):
         """Create a new task on the XQueue.
 
         Arguments:
@@ -505,6 +781,8 @@ class XQueueCertInterface(object):
             callback_url_path (str): The path of the callback URL.
                 If not provided, use the default end-point for student-generated
                 certificates.
+            xqueue_interface (XQueueInterface): The interface to send the task
+                with, if not this object's.
 
         """
         callback_url = u'{protocol}://{base_url}{path}'.format(
@@ -534,7 +812,9 @@ class XQueueCertInterface(object):
 
         xheader = make_xheader(callback_url, key, settings.CERT_QUEUE)
 
-        (error, msg) = self.xqueue_interface.send_to_queue(
+        if xqueue_interface is None:
+            xqueue_interface = self.xqueue_interface
+        (error, msg) = xqueue_interface.send_to_queue(
             header=xheader, body=json.dumps(contents))
         if error:
             exc = XQueueAddToQueueError(error, msg)
@@ -7,6 +7,7 @@ import json
 from mock import patch, Mock
 from nose.plugins.attrib import attr
 
+from django.conf import settings
 from django.test import TestCase
 from django.test.utils import override_settings
 import freezegun
@@ -17,6 +18,7 @@ from opaque_keys.edx.locator import CourseLocator
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
 from xmodule.modulestore.tests.factories import CourseFactory
+from terrain.stubs.xqueue import StubXQueueService
 
 
 # It is really unfortunate that we are using the XQueue client
@@ -32,7 +34,7 @@ from certificates.models import (
     GeneratedCertificate,
     CertificateStatuses,
 )
-from certificates.queue import XQueueCertInterface
+from certificates.queue import XQUEUE_SUBMIT_WORKERS, XQueueCertInterface
 from certificates.tests.factories import CertificateWhitelistFactory, GeneratedCertificateFactory
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 
@@ -281,6 +283,105 @@ class XQueueCertInterfaceAddCertificateTest(ModuleStoreTestCase):
         )
 
 
+@attr('shard_1')
+@override_settings(CERT_QUEUE='certificates')
+class XQueueCertInterfaceAddCertificatesTest(ModuleStoreTestCase):
+    """Test adding the certificates of many students to the queue at once. """
+
+    def setUp(self):
+        super(XQueueCertInterfaceAddCertificatesTest, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [UserFactory.create() for __ in range(5)]
+        for student in self.students:
+            CourseEnrollmentFactory(user=student, course_id=self.course.id, is_active=True, mode='honor')
+        self.xqueue = XQueueCertInterface()
+
+    def add_certs(self, xqueue_reply=(0, None)):
+        """
+        Adds the certificates of all the students, returning the results and
+        the mock of `XQueueInterface.send_to_queue`.
+        """
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                mock_send.return_value = xqueue_reply
+                results = self.xqueue.add_certs(self.students, self.course.id)
+        return results, mock_send
+
+    def test_add_certs(self):
+        # a student whose certificate can't be regenerated
+        GeneratedCertificateFactory(
+            user=self.students[0], course_id=self.course.id, status=CertificateStatuses.restricted
+        )
+
+        results, mock_send = self.add_certs()
+
+        self.assertEqual([student for student, __ in results], self.students)
+        self.assertIsNone(results[0][1])
+        for student, cert in results[1:]:
+            self.assertEqual(cert.status, CertificateStatuses.generating)
+            self.assertEqual(
+                GeneratedCertificate.objects.get(user=student, course_id=self.course.id).status,  # pylint: disable=no-member
+                CertificateStatuses.generating
+            )
+        self.assertEqual(mock_send.call_count, len(self.students) - 1)
+        # each task has its own key
+        keys = set(json.loads(kwargs['header'])['lms_key'] for __, kwargs in mock_send.call_args_list)
+        self.assertEqual(len(keys), len(self.students) - 1)
+
+    def test_add_certs_session_per_thread(self):
+        with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+            with patch.object(XQueueInterface, 'send_to_queue', autospec=True) as mock_send:
+                mock_send.return_value = (0, None)
+                self.xqueue.add_certs(self.students, self.course.id)
+
+        # the worker threads don't share the interface's requests session
+        interfaces = [args[0] for args, __ in mock_send.call_args_list]
+        self.assertEqual(len(interfaces), len(self.students))
+        self.assertNotIn(self.xqueue.xqueue_interface, interfaces)
+        self.assertLessEqual(len(set(interface.session for interface in interfaces)), XQUEUE_SUBMIT_WORKERS)
+
+    def test_add_certs_xqueue_error(self):
+        results, __ = self.add_certs(xqueue_reply=(1, 'Kaboom!'))
+
+        for student, __ in results:
+            certificate = GeneratedCertificate.objects.get(user=student, course_id=self.course.id)  # pylint: disable=no-member
+            self.assertEqual(certificate.status, ExampleCertificate.STATUS_ERROR)
+            self.assertIn('Kaboom!', certificate.error_reason)
+
+    def test_add_certs_like_add_cert(self):
+        CertificateWhitelistFactory(course_id=self.course.id, user=self.students[1])
+        results, __ = self.add_certs()
+
+        for student, cert in results:
+            with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+                with patch.object(XQueueInterface, 'send_to_queue') as mock_send:
+                    mock_send.return_value = (0, None)
+                    single_cert = self.xqueue.add_cert(student, self.course.id)
+            self.assertEqual(
+                (single_cert.status, single_cert.mode, single_cert.grade, single_cert.name),
+                (cert.status, cert.mode, cert.grade, cert.name),
+            )
+
+    def test_add_certs_to_stub_xqueue(self):
+        server = StubXQueueService()
+        self.addCleanup(server.shutdown)
+        xqueue_settings = dict(settings.XQUEUE_INTERFACE, url='http://127.0.0.1:{}'.format(server.port))
+
+        # Don't post the grades back
+        with patch('terrain.stubs.xqueue.Timer'):
+            with override_settings(XQUEUE_INTERFACE=xqueue_settings):
+                xqueue = XQueueCertInterface()
+            with patch('courseware.grades.grade', Mock(return_value={'grade': 'Pass', 'percent': 0.75})):
+                results = xqueue.add_certs(self.students, self.course.id)
+
+        for student, cert in results:
+            self.assertEqual(cert.status, CertificateStatuses.generating)
+            self.assertEqual(
+                GeneratedCertificate.objects.get(user=student, course_id=self.course.id).status,  # pylint: disable=no-member
+                CertificateStatuses.generating
+            )
+
+
 @attr('shard_1')
 @override_settings(CERT_QUEUE='certificates')
 class XQueueCertInterfaceExampleCertificateTest(TestCase):
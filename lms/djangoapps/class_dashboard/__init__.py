@@ -1,3 +1,4 @@
 """
 init.py file for class_dashboard
 """
+default_app_config = 'class_dashboard.apps.ClassDashboardConfig'  # pylint: disable=invalid-name
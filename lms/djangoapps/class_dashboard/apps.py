@@ -0,0 +1,34 @@
+"""
+Class dashboard Application Configuration
+"""
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save
+
+
+class ClassDashboardConfig(AppConfig):
+    """
+    Application Configuration for the class dashboard.
+    """
+    name = 'class_dashboard'
+
+    def ready(self):
+        """
+        Keep the Metrics aggregates up to date as student modules change, only
+        when the Metrics tab is enabled: the receivers add queries to every
+        student module save.
+        """
+        if not settings.FEATURES.get('CLASS_DASHBOARD'):
+            return
+
+        from courseware.models import StudentModule
+        from class_dashboard.models import (
+            count_saved_student_module,
+            remember_saved_score,
+            uncount_deleted_student_module,
+        )
+        post_init.connect(remember_saved_score, sender=StudentModule, dispatch_uid='class_dashboard.post_init')
+        post_save.connect(count_saved_student_module, sender=StudentModule, dispatch_uid='class_dashboard.post_save')
+        post_delete.connect(
+            uncount_deleted_student_module, sender=StudentModule, dispatch_uid='class_dashboard.post_delete'
+        )
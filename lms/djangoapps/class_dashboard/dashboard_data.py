@@ -11,6 +11,8 @@ from django.utils.translation import ugettext as _
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.inheritance import own_metadata
 from instructor_analytics.csvs import create_csv_response
+from class_dashboard.models import NO_MAX_GRADE, ProblemGradeCount, SequentialOpenCount
+from class_dashboard.tasks import ensure_course_aggregates
 
 from opaque_keys.edx.locations import Location
 
@@ -18,6 +20,55 @@ from opaque_keys.edx.locations import Location
 MAX_SCREEN_LIST_LENGTH = 250
 
 
+def _problem_grade_counts(course_id, **filters):
+    """
+    Returns the rows of ('module_state_key', 'grade', 'max_grade', 'count') of the
+    problems of the course matching the filters, ordered by problem and grade.
+
+    They are read from the aggregates of the course once these were computed,
+    and from the studentmodule table until then.
+    """
+    if not ensure_course_aggregates(course_id):
+        # Aggregate query on studentmodule table for grade data
+        return models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            grade__isnull=False,
+            module_type__exact="problem",
+            **filters
+        ).values(
+            'module_state_key', 'grade', 'max_grade',
+        ).annotate(count=Count('grade')).order_by('module_state_key', 'grade')
+
+    rows = list(ProblemGradeCount.objects.filter(
+        course_id__exact=course_id,
+        count__gt=0,
+        **filters
+    ).values('module_state_key', 'grade', 'max_grade', 'count').order_by('module_state_key', 'grade'))
+    for row in rows:
+        if row['max_grade'] == NO_MAX_GRADE:
+            row['max_grade'] = None
+    return rows
+
+
+def _sequential_open_counts(course_id):
+    """
+    Returns the rows of ('module_state_key', 'count') of the subsections of the
+    course, read from the aggregates of the course once these were computed,
+    and from the studentmodule table until then.
+    """
+    if not ensure_course_aggregates(course_id):
+        # Aggregate query on studentmodule table for "opening a subsection" data
+        return models.StudentModule.objects.filter(
+            course_id__exact=course_id,
+            module_type__exact="sequential",
+        ).values('module_state_key').annotate(count=Count('module_state_key'))
+
+    return SequentialOpenCount.objects.filter(
+        course_id__exact=course_id,
+        count__gt=0,
+    ).values('module_state_key', 'count')
+
+
 def get_problem_grade_distribution(course_id):
     """
     Returns the grade distribution per problem for the course
@@ -32,12 +83,8 @@ def get_problem_grade_distribution(course_id):
         attempting the problem
     """
 
-    # Aggregate query on studentmodule table for grade data for all problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-    ).values('module_state_key', 'grade', 'max_grade').annotate(count_grade=Count('grade'))
+    # Grade counts of all problems in course, aggregated from the studentmodule table
+    db_query = _problem_grade_counts(course_id)
 
     prob_grade_distrib = {}
     total_student_count = {}
@@ -48,7 +95,7 @@ def get_problem_grade_distribution(course_id):
 
         # Build set of grade distributions for each problem that has student responses
         if curr_problem in prob_grade_distrib:
-            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count_grade']))
+            prob_grade_distrib[curr_problem]['grade_distrib'].append((row['grade'], row['count']))
 
             if (prob_grade_distrib[curr_problem]['max_grade'] != row['max_grade']) and \
                     (prob_grade_distrib[curr_problem]['max_grade'] < row['max_grade']):
@@ -57,11 +104,11 @@ def get_problem_grade_distribution(course_id):
         else:
             prob_grade_distrib[curr_problem] = {
                 'max_grade': row['max_grade'],
-                'grade_distrib': [(row['grade'], row['count_grade'])]
+                'grade_distrib': [(row['grade'], row['count'])]
             }
 
         # Build set of total students attempting each problem
-        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count_grade']
+        total_student_count[curr_problem] = total_student_count.get(curr_problem, 0) + row['count']
 
     return prob_grade_distrib, total_student_count
 
@@ -75,17 +122,14 @@ def get_sequential_open_distrib(course_id):
     Outputs a dict mapping the 'module_id' to the number of students that have opened that subsection/sequential.
     """
 
-    # Aggregate query on studentmodule table for "opening a subsection" data
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        module_type__exact="sequential",
-    ).values('module_state_key').annotate(count_sequential=Count('module_state_key'))
+    # "Opening a subsection" counts, aggregated from the studentmodule table
+    db_query = _sequential_open_counts(course_id)
 
     # Build set of "opened" data for each subsection that has "opened" data
     sequential_open_distrib = {}
     for row in db_query:
         row_loc = course_id.make_usage_key_from_deprecated_string(row['module_state_key'])
-        sequential_open_distrib[row_loc] = row['count_sequential']
+        sequential_open_distrib[row_loc] = row['count']
 
     return sequential_open_distrib
 
@@ -105,17 +149,8 @@ def get_problem_set_grade_distrib(course_id, problem_set):
       'grade_distrib' - array of tuples (`grade`,`count`) ordered by `grade`
     """
 
-    # Aggregate query on studentmodule table for grade data for set of problems in course
-    db_query = models.StudentModule.objects.filter(
-        course_id__exact=course_id,
-        grade__isnull=False,
-        module_type__exact="problem",
-        module_state_key__in=problem_set,
-    ).values(
-        'module_state_key',
-        'grade',
-        'max_grade',
-    ).annotate(count_grade=Count('grade')).order_by('module_state_key', 'grade')
+    # Grade counts of the set of problems in course, aggregated from the studentmodule table
+    db_query = _problem_grade_counts(course_id, module_state_key__in=problem_set)
 
     prob_grade_distrib = {}
 
@@ -129,7 +164,7 @@ def get_problem_set_grade_distrib(course_id, problem_set):
             }
 
         curr_grade_distrib = prob_grade_distrib[row_loc]
-        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count_grade']))
+        curr_grade_distrib['grade_distrib'].append((row['grade'], row['count']))
 
         if curr_grade_distrib['max_grade'] < row['max_grade']:
             curr_grade_distrib['max_grade'] = row['max_grade']
@@ -0,0 +1,191 @@
+"""
+Per-course aggregates of the student module data shown in the Metrics tab of
+the instructor dashboard.
+
+The aggregates hold one row per problem grade and per subsection rather than
+per student, so reading them takes the same time whatever the enrollment.
+They are kept up to date as student modules are saved and deleted, when the
+CLASS_DASHBOARD feature is enabled (see apps.py). Bulk updates of the
+student modules don't send the model signals, so the aggregates of each
+course are also recomputed from the student modules in the background the
+first time they are read, and then periodically (see tasks.py).
+"""
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from courseware.models import StudentModule
+from xmodule_django.models import CourseKeyField, LocationKeyField
+
+# The max_grade of the ProblemGradeCount rows of scores without a max_grade:
+# the unique index doesn't prevent duplicate rows with a NULL column.
+NO_MAX_GRADE = -1.0
+
+
+class ProblemGradeCount(models.Model):
+    """
+    The number of students with a grade out of max_grade for a problem.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    grade = models.FloatField()
+    max_grade = models.FloatField(default=NO_MAX_GRADE)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = "class_dashboard"
+        unique_together = (('course_id', 'module_state_key', 'grade', 'max_grade'),)
+
+
+class SequentialOpenCount(models.Model):
+    """
+    The number of students who opened a subsection.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = LocationKeyField(max_length=255, db_column='module_id')
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        app_label = "class_dashboard"
+        unique_together = (('course_id', 'module_state_key'),)
+
+
+class CourseAggregatesReconciliation(models.Model):
+    """
+    When the aggregates of a course were last recomputed from the student
+    modules, or None until they first were.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    reconciled = models.DateTimeField(null=True)
+
+    class Meta(object):
+        app_label = "class_dashboard"
+
+
+def reconcile_course_aggregates(course_id):
+    """
+    Recompute the aggregates of the course from its student modules.
+    """
+    grade_rows = StudentModule.objects.filter(
+        course_id__exact=course_id,
+        grade__isnull=False,
+        module_type__exact="problem",
+    ).values('module_state_key', 'grade', 'max_grade').annotate(count=Count('grade'))
+
+    open_rows = StudentModule.objects.filter(
+        course_id__exact=course_id,
+        module_type__exact="sequential",
+    ).values('module_state_key').annotate(count=Count('module_state_key'))
+
+    with transaction.atomic():
+        ProblemGradeCount.objects.filter(course_id=course_id).delete()
+        ProblemGradeCount.objects.bulk_create([
+            ProblemGradeCount(
+                course_id=course_id,
+                module_state_key=row['module_state_key'],
+                grade=row['grade'],
+                max_grade=_stored_max_grade(row['max_grade']),
+                count=row['count'],
+            )
+            for row in grade_rows
+        ])
+        SequentialOpenCount.objects.filter(course_id=course_id).delete()
+        SequentialOpenCount.objects.bulk_create([
+            SequentialOpenCount(
+                course_id=course_id,
+                module_state_key=row['module_state_key'],
+                count=row['count'],
+            )
+            for row in open_rows
+        ])
+        CourseAggregatesReconciliation.objects.update_or_create(
+            course_id=course_id, defaults={'reconciled': timezone.now()}
+        )
+
+
+def _add_to_count(model, delta, **key):
+    """
+    Add delta to the count of the aggregate row identified by key, creating it if needed.
+    """
+    if model.objects.filter(**key).update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=delta, **key)
+    except IntegrityError:
+        # created concurrently
+        model.objects.filter(**key).update(count=F('count') + delta)
+
+
+def _stored_max_grade(max_grade):
+    """
+    Returns the max_grade of the ProblemGradeCount row of a score.
+    """
+    return NO_MAX_GRADE if max_grade is None else max_grade
+
+
+def _add_to_grade_count(module, score, delta):
+    """
+    Add delta to the count of the (grade, max_grade) score of the module's problem.
+    """
+    grade, max_grade = score
+    _add_to_count(
+        ProblemGradeCount, delta,
+        course_id=module.course_id, module_state_key=module.module_state_key,
+        grade=grade, max_grade=_stored_max_grade(max_grade),
+    )
+
+
+# The attribute of the StudentModule instances holding their score as last loaded or saved.
+_SAVED_SCORE = '_class_dashboard_saved_score'
+
+
+def remember_saved_score(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember the score of the student module, to count its change when it's saved.
+    """
+    fields = instance.__dict__
+    # Don't trigger the loading of deferred fields: the score is then unknown
+    if 'grade' in fields and 'max_grade' in fields:
+        setattr(instance, _SAVED_SCORE, (fields['grade'], fields['max_grade']))
+
+
+def count_saved_student_module(sender, instance, created, raw=False, **kwargs):  # pylint: disable=unused-argument
+    """
+    Count the subsection opened, or the problem's change of score.
+    """
+    if raw:
+        return
+
+    if instance.module_type == 'sequential':
+        if created:
+            _add_to_count(
+                SequentialOpenCount, 1, course_id=instance.course_id, module_state_key=instance.module_state_key
+            )
+
+    elif instance.module_type == 'problem':
+        # If the saved score is unknown, leave the change to the next reconciliation.
+        old_score = (None, None) if created else getattr(instance, _SAVED_SCORE, None)
+        new_score = (instance.grade, instance.max_grade)
+        setattr(instance, _SAVED_SCORE, new_score)
+        if old_score is None or old_score == new_score:
+            return
+        if old_score[0] is not None:
+            _add_to_grade_count(instance, old_score, -1)
+        if new_score[0] is not None:
+            _add_to_grade_count(instance, new_score, 1)
+
+
+def uncount_deleted_student_module(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Uncount the subsection opened, or the problem's score.
+    """
+    if instance.module_type == 'sequential':
+        _add_to_count(
+            SequentialOpenCount, -1, course_id=instance.course_id, module_state_key=instance.module_state_key
+        )
+
+    elif instance.module_type == 'problem':
+        score = getattr(instance, _SAVED_SCORE, None)
+        if score is not None and score[0] is not None:
+            _add_to_grade_count(instance, score, -1)
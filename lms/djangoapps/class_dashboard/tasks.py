@@ -0,0 +1,52 @@
+"""
+Asynchronous tasks for the class dashboard app.
+"""
+import logging
+
+from celery.task import task
+from opaque_keys.edx.keys import CourseKey
+
+from class_dashboard.models import CourseAggregatesReconciliation, reconcile_course_aggregates
+
+log = logging.getLogger(__name__)
+
+
+@task(name='class_dashboard.reconcile_aggregates')
+def reconcile_aggregates():
+    """
+    Recompute the aggregates of all the courses whose metrics were displayed, to
+    catch up with the student module changes which weren't counted as they happened.
+
+    This task should be run periodically, e.g. daily.
+    """
+    course_ids = [reconciliation.course_id for reconciliation in CourseAggregatesReconciliation.objects.all()]
+    for course_id in course_ids:
+        try:
+            reconcile_course_aggregates(course_id)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u"Failed to reconcile the class dashboard aggregates of %s", course_id)
+
+
+@task(name='class_dashboard.reconcile_course_aggregates')
+def reconcile_course_aggregates_task(course_id):
+    """
+    Recompute the aggregates of the course from its student modules.
+    """
+    reconcile_course_aggregates(CourseKey.from_string(course_id))
+
+
+def ensure_course_aggregates(course_id):
+    """
+    Returns whether the aggregates of the course were computed, starting to
+    compute them in the background if they never were. Until they have been
+    computed once, the aggregates of the course are partial.
+    """
+    reconciliation = CourseAggregatesReconciliation.objects.filter(course_id=course_id).first()
+    if reconciliation is None:
+        reconciliation, created = CourseAggregatesReconciliation.objects.get_or_create(course_id=course_id)
+        if created:
+            log.info(u"Computing the class dashboard aggregates of %s", course_id)
+            reconcile_course_aggregates_task.delay(unicode(course_id))
+            # the task may have run eagerly
+            reconciliation = CourseAggregatesReconciliation.objects.get(course_id=course_id)
+    return reconciliation.reconciled is not None
@@ -0,0 +1,129 @@
+"""
+Tests for the class dashboard aggregates.
+"""
+from django.test import TestCase
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+
+from courseware.models import StudentModule
+from courseware.tests.factories import StudentModuleFactory
+
+from class_dashboard.dashboard_data import get_problem_grade_distribution, get_sequential_open_distrib
+from class_dashboard.models import (
+    NO_MAX_GRADE,
+    CourseAggregatesReconciliation,
+    ProblemGradeCount,
+    reconcile_course_aggregates,
+)
+from class_dashboard.tasks import ensure_course_aggregates, reconcile_aggregates
+
+
+@attr('shard_1')
+class TestCourseAggregates(TestCase):
+    """
+    Tests that the aggregates follow the student modules.
+    """
+    def setUp(self):
+        super(TestCourseAggregates, self).setUp()
+        self.course_id = SlashSeparatedCourseKey('MITx', '999', 'Robot_Super_Course')
+        self.problem = self.course_id.make_usage_key('problem', 'problem')
+        self.sequential = self.course_id.make_usage_key('sequential', 'sequential')
+        self.modules = [
+            StudentModuleFactory.create(course_id=self.course_id, module_state_key=self.problem, grade=1, max_grade=2)
+            for __ in range(3)
+        ]
+        ensure_course_aggregates(self.course_id)
+
+    def assert_grade_distrib(self, expected_distrib):
+        """
+        Asserts the grade distribution of the problem, as a {(grade, max_grade): count} dict.
+        """
+        self.assertEqual(
+            {
+                (count.grade, count.max_grade): count.count
+                for count in ProblemGradeCount.objects.filter(course_id=self.course_id, count__gt=0)
+            },
+            expected_distrib
+        )
+
+    def test_reconciled_on_first_read(self):
+        self.assertTrue(CourseAggregatesReconciliation.objects.filter(
+            course_id=self.course_id, reconciled__isnull=False
+        ).exists())
+        self.assert_grade_distrib({(1, 2): 3})
+
+    def test_read_from_student_modules_until_reconciled(self):
+        ProblemGradeCount.objects.filter(course_id=self.course_id).delete()
+        CourseAggregatesReconciliation.objects.filter(course_id=self.course_id).update(reconciled=None)
+
+        prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course_id)
+        self.assertEqual(prob_grade_distrib[self.problem]['grade_distrib'], [(1, 3)])
+        self.assertEqual(total_student_count[self.problem], 3)
+
+    def test_scores_without_max_grade(self):
+        for __ in range(2):
+            StudentModuleFactory.create(
+                course_id=self.course_id, module_state_key=self.problem, grade=1, max_grade=None
+            )
+        self.assertEqual(
+            ProblemGradeCount.objects.get(course_id=self.course_id, grade=1, max_grade=NO_MAX_GRADE).count, 2
+        )
+
+        prob_grade_distrib, __ = get_problem_grade_distribution(self.course_id)
+        self.assertEqual(prob_grade_distrib[self.problem]['max_grade'], 2)
+        self.assertEqual(sorted(prob_grade_distrib[self.problem]['grade_distrib']), [(1, 2), (1, 3)])
+
+    def test_score_changes(self):
+        self.modules[0].grade = 2
+        self.modules[0].save()
+        self.assert_grade_distrib({(1, 2): 2, (2, 2): 1})
+
+        # saving without changing the score
+        self.modules[0].save()
+        self.assert_grade_distrib({(1, 2): 2, (2, 2): 1})
+
+        # loaded from the database
+        module = StudentModule.objects.get(id=self.modules[1].id)
+        module.grade = 0
+        module.save()
+        self.assert_grade_distrib({(0, 2): 1, (1, 2): 1, (2, 2): 1})
+
+        self.modules[2].delete()
+        self.assert_grade_distrib({(0, 2): 1, (2, 2): 1})
+
+        StudentModuleFactory.create(course_id=self.course_id, module_state_key=self.problem, grade=0, max_grade=2)
+        self.assert_grade_distrib({(0, 2): 2, (2, 2): 1})
+
+        prob_grade_distrib, total_student_count = get_problem_grade_distribution(self.course_id)
+        self.assertEqual(sorted(prob_grade_distrib[self.problem]['grade_distrib']), [(0, 2), (2, 1)])
+        self.assertEqual(total_student_count[self.problem], 3)
+
+    def test_sequential_opens(self):
+        for __ in range(2):
+            StudentModuleFactory.create(
+                course_id=self.course_id, module_type='sequential', module_state_key=self.sequential
+            )
+        self.assertEqual(get_sequential_open_distrib(self.course_id), {self.sequential: 2})
+
+        StudentModule.objects.filter(module_state_key=self.sequential)[0].delete()
+        self.assertEqual(get_sequential_open_distrib(self.course_id), {self.sequential: 1})
+
+    def test_reconciliation(self):
+        # bulk updates aren't counted until the next reconciliation
+        StudentModule.objects.filter(course_id=self.course_id).update(grade=2)
+        self.assert_grade_distrib({(1, 2): 3})
+
+        reconcile_aggregates()
+        self.assert_grade_distrib({(2, 2): 3})
+
+    def test_constant_queries(self):
+        with self.assertNumQueries(2):
+            get_problem_grade_distribution(self.course_id)
+
+        for __ in range(10):
+            StudentModuleFactory.create(course_id=self.course_id, module_state_key=self.problem, grade=1, max_grade=2)
+        with self.assertNumQueries(2):
+            get_problem_grade_distribution(self.course_id)
+
+        reconcile_course_aggregates(self.course_id)
+        self.assert_grade_distrib({(1, 2): 13})
@@ -30,7 +30,6 @@ from xmodule.course_module import (
 from xmodule.error_module import ErrorDescriptor
 from xmodule.x_module import XModule, DEPRECATION_VSCOMPAT_EVENT
 from xmodule.split_test_module import get_split_user_partitions
-from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPartitionGroupError
 
 from external_auth.models import ExternalAuthMap
 from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
@@ -61,7 +60,7 @@ from courseware.access_response import (
     VisibilityError,
 )
 from courseware.access_utils import (
-    adjust_start_date, check_start_date, debug, ACCESS_GRANTED, ACCESS_DENIED,
+    adjust_start_date, check_group_access, check_start_date, debug, ACCESS_GRANTED, ACCESS_DENIED,
     in_preview_mode
 )
 
@@ -445,64 +444,7 @@ def _has_group_access(descriptor, user, course_key):
 
     # use merged_group_access which takes group access on the block's
     # parents / ancestors into account
-    merged_access = descriptor.merged_group_access
-    # check for False in merged_access, which indicates that at least one
-    # partition's group list excludes all students.
-    if False in merged_access.values():
-        log.warning("Group access check excludes all students, access will be denied.", exc_info=True)
-        return ACCESS_DENIED
-
-    # resolve the partition IDs in group_access to actual
-    # partition objects, skipping those which contain empty group directives.
-    # If a referenced partition could not be found, it will be denied
-    # If the partition is found but is no longer active (meaning it's been disabled)
-    # then skip the access check for that partition.
-    partitions = []
-    for partition_id, group_ids in merged_access.items():
-        try:
-            partition = descriptor._get_user_partition(partition_id)  # pylint: disable=protected-access
-            if partition.active:
-                if group_ids is not None:
-                    partitions.append(partition)
-            else:
-                log.debug(
-                    "Skipping partition with ID %s in course %s because it is no longer active",
-                    partition.id, course_key
-                )
-        except NoSuchUserPartitionError:
-            log.warning("Error looking up user partition, access will be denied.", exc_info=True)
-            return ACCESS_DENIED
-
-    # next resolve the group IDs specified within each partition
-    partition_groups = []
-    try:
-        for partition in partitions:
-            groups = [
-                partition.get_group(group_id)
-                for group_id in merged_access[partition.id]
-            ]
-            if groups:
-                partition_groups.append((partition, groups))
-    except NoSuchUserPartitionGroupError:
-        log.warning("Error looking up referenced user partition group, access will be denied.", exc_info=True)
-        return ACCESS_DENIED
-
-    # look up the user's group for each partition
-    user_groups = {}
-    for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
-
-    # finally: check that the user has a satisfactory group assignment
-    # for each partition.
-    if not all(user_groups.get(partition.id) in groups for partition, groups in partition_groups):
-        return ACCESS_DENIED
-
-    # all checks passed.
-    return ACCESS_GRANTED
+    return check_group_access(user, descriptor.user_partitions, descriptor.merged_group_access, course_key)
 
 
 def _has_access_descriptor(user, action, descriptor, course_key=None):
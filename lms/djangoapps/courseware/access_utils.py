@@ -10,6 +10,7 @@ from logging import getLogger
 from student.roles import CourseBetaTesterRole
 from courseware.masquerade import is_masquerading_as_student
 from courseware.access_response import AccessResponse, StartDateError
+from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPartitionGroupError
 from xmodule.util.django import get_current_request_hostname
 
 
@@ -77,3 +78,84 @@ def in_preview_mode():
     hostname = get_current_request_hostname()
     preview_lms_base = settings.FEATURES.get('PREVIEW_LMS_BASE', None)
     return bool(preview_lms_base and hostname and hostname.split(':')[0] == preview_lms_base.split(':')[0])
+
+
+def _get_user_partition(user_partitions, user_partition_id):
+    """
+    Returns the user partition with the specified id.  Raises
+    `NoSuchUserPartitionError` if the lookup fails.
+    """
+    for user_partition in user_partitions:
+        if user_partition.id == user_partition_id:
+            return user_partition
+
+    raise NoSuchUserPartitionError("could not find a UserPartition with ID [{}]".format(user_partition_id))
+
+
+def check_group_access(user, user_partitions, merged_access, course_key):
+    """
+    Verifies whether the given user has sufficient group memberships to
+    load a block with the given merged group access (see
+    LmsBlockMixin.merged_group_access) in a course with the given user
+    partitions.
+
+    Returns:
+        AccessResponse: Either ACCESS_GRANTED or ACCESS_DENIED.
+    """
+    # check for False in merged_access, which indicates that at least one
+    # partition's group list excludes all students.
+    if False in merged_access.values():
+        log.warning("Group access check excludes all students, access will be denied.", exc_info=True)
+        return ACCESS_DENIED
+
+    # resolve the partition IDs in group_access to actual
+    # partition objects, skipping those which contain empty group directives.
+    # If a referenced partition could not be found, it will be denied
+    # If the partition is found but is no longer active (meaning it's been disabled)
+    # then skip the access check for that partition.
+    partitions = []
+    for partition_id, group_ids in merged_access.items():
+        try:
+            partition = _get_user_partition(user_partitions, partition_id)
+            if partition.active:
+                if group_ids is not None:
+                    partitions.append(partition)
+            else:
+                log.debug(
+                    "Skipping partition with ID %s in course %s because it is no longer active",
+                    partition.id, course_key
+                )
+        except NoSuchUserPartitionError:
+            log.warning("Error looking up user partition, access will be denied.", exc_info=True)
+            return ACCESS_DENIED
+
+    # next resolve the group IDs specified within each partition
+    partition_groups = []
+    try:
+        for partition in partitions:
+            groups = [
+                partition.get_group(group_id)
+                for group_id in merged_access[partition.id]
+            ]
+            if groups:
+                partition_groups.append((partition, groups))
+    except NoSuchUserPartitionGroupError:
+        log.warning("Error looking up referenced user partition group, access will be denied.", exc_info=True)
+        return ACCESS_DENIED
+
+    # look up the user's group for each partition
+    user_groups = {}
+    for partition, groups in partition_groups:
+        user_groups[partition.id] = partition.scheme.get_group_for_user(
+            course_key,
+            user,
+            partition,
+        )
+
+    # finally: check that the user has a satisfactory group assignment
+    # for each partition.
+    if not all(user_groups.get(partition.id) in groups for partition, groups in partition_groups):
+        return ACCESS_DENIED
+
+    # all checks passed.
+    return ACCESS_GRANTED
@@ -752,7 +752,7 @@ def get_score(user, problem_descriptor, module_creator, scores_client, submissio
     return weighted_score(correct, total, problem_descriptor.weight)
 
 
-def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
+def iterate_grades_for(course_or_id, students, keep_raw_scores=False, prefetch_scores=False):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
@@ -769,12 +769,21 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     - grade_breakdown : A breakdown of the major components that
         make up the final grade. (For display)
     - raw_scores: contains scores for every graded module
+
+    If prefetch_scores is True, the scores of all the students are fetched up front with
+    one query, rather than one query per student: pass chunks of students small enough
+    for all their scores to be held in memory.
     """
     if isinstance(course_or_id, (basestring, CourseKey)):
         course = courses.get_course_by_id(course_or_id)
     else:
         course = course_or_id
 
+    scores_clients = {}
+    if prefetch_scores:
+        students = list(students)
+        scores_clients = ScoresClient.for_users(course.id, [student.id for student in students])
+
     for student in students:
         with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
             try:
@@ -784,7 +793,9 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
                 # It's not pretty, but untangling that is currently beyond the
                 # scope of this feature.
                 request.session = {}
-                gradeset = grade(student, request, course, keep_raw_scores)
+                gradeset = grade(
+                    student, request, course, keep_raw_scores, scores_client=scores_clients.get(student.id)
+                )
                 yield student, gradeset, ""
             except Exception as exc:  # pylint: disable=broad-except
                 # Keep marching on even if this student couldn't be graded for
@@ -989,6 +989,27 @@ class ScoresClient(object):
         client.fetch_scores(fd_cache.scorable_locations)
         return client
 
+    @classmethod
+    def for_users(cls, course_key, user_ids):
+        """
+        Create a ScoresClient for each of the users, fetching all their scores in the
+        course with one query. Returns {user_id: ScoresClient}.
+        """
+        clients = {user_id: cls(course_key, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_key,
+        )
+        for user_id, location, correct, total in scores_qset.values_list(
+            'student_id', 'module_state_key', 'grade', 'max_grade'
+        ):
+            # See fetch_scores about adding the course run info back in.
+            location = UsageKey.from_string(location).map_into_course(course_key)
+            clients[user_id]._locations_to_scores[location] = cls.Score(correct, total)  # pylint: disable=protected-access
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -49,9 +49,7 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import UsageKey, CourseKey
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from openedx.core.lib.xblock_utils import (
-    replace_course_urls,
-    replace_jump_to_id_urls,
-    replace_static_urls,
+    replace_urls,
     add_staff_markup,
     wrap_xblock,
     request_token as xblock_request_token,
@@ -607,27 +605,20 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # prefix is going to have to be specific to the module, not the directory
     # that the xml was loaded from
 
-    # Rewrite urls beginning in /static to point to course-specific content
-    block_wrappers.append(partial(
-        replace_static_urls,
-        getattr(descriptor, 'data_dir', None),
-        course_id=course_id,
-        static_asset_path=static_asset_path or descriptor.static_asset_path
-    ))
-
-    # Allow URLs of the form '/course/' refer to the root of multicourse directory
-    #   hierarchy of this course
-    block_wrappers.append(partial(replace_course_urls, course_id))
-
-    # this will rewrite intra-courseware links (/jump_to_id/<id>). This format
-    # is an improvement over the /course/... format for studio authored courses,
-    # because it is agnostic to course-hierarchy.
+    # Rewrite urls beginning in /static to point to course-specific content,
+    # allow URLs of the form '/course/' refer to the root of multicourse directory
+    # hierarchy of this course, and rewrite intra-courseware links (/jump_to_id/<id>),
+    # all in a single pass over the fragment's content.
+    # The /jump_to_id/ format is an improvement over the /course/... format for studio
+    # authored courses, because it is agnostic to course-hierarchy.
     # NOTE: module_id is empty string here. The 'module_id' will get assigned in the replacement
     # function, we just need to specify something to get the reverse() to work.
     block_wrappers.append(partial(
-        replace_jump_to_id_urls,
+        replace_urls,
         course_id,
         reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
+        getattr(descriptor, 'data_dir', None),
+        static_asset_path=static_asset_path or descriptor.static_asset_path
     ))
 
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
@@ -2,6 +2,8 @@
 Test for split test XModule
 """
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from mock import MagicMock
 from nose.plugins.attrib import attr
 
@@ -315,3 +317,76 @@ class SplitTestPosition(ModuleStoreTestCase):
         # Now that we have the course, change the position and save, nothing should explode!
         course.position = 2
         course.save()
+
+
+@attr('shard_1')
+class SplitTestUserDataQueries(ModuleStoreTestCase):
+    """
+    Check that rendering a subsection with several split tests retrieves the
+    course tags and the preferences of the user once.
+    """
+    PARTITIONS = 3
+
+    def setUp(self):
+        super(SplitTestUserDataQueries, self).setUp()
+        partitions = [
+            UserPartition(index, 'partition_{}'.format(index), 'Partition', [Group(0, 'alpha'), Group(1, 'beta')])
+            for index in range(self.PARTITIONS)
+        ]
+        self.course = CourseFactory.create(user_partitions=partitions)
+        self.chapter = ItemFactory.create(parent_location=self.course.location, category="chapter")
+        self.sequential = ItemFactory.create(parent_location=self.chapter.location, category="sequential")
+        vertical = ItemFactory.create(parent_location=self.sequential.location, category="vertical")
+
+        self.student = UserFactory.create()
+        CourseEnrollmentFactory.create(user=self.student, course_id=self.course.id)
+        self.client.login(username=self.student.username, password='test')
+
+        for partition in partitions:
+            urls = [
+                self.course.id.make_usage_key("vertical", "split_{}_cond{}".format(partition.id, group.id))
+                for group in partition.groups
+            ]
+            split_test = ItemFactory.create(
+                parent_location=vertical.location,
+                category="split_test",
+                user_partition_id=str(partition.id),
+                group_id_to_child={str(group.id): url for group, url in zip(partition.groups, urls)},
+            )
+            for group, url in zip(partition.groups, urls):
+                condition = ItemFactory.create(
+                    parent_location=split_test.location,
+                    category="vertical",
+                    location=url,
+                )
+                ItemFactory.create(
+                    parent_location=condition.location,
+                    category="html",
+                    data="Some HTML for group {} of partition {}".format(group.id, partition.id),
+                )
+            # Assign the student to a group in advance, so that no tag is written
+            UserCourseTagFactory(
+                user=self.student,
+                course_id=self.course.id,
+                key='xblock.partition_service.partition_{0}'.format(partition.id),
+                value=str(partition.id % 2),
+            )
+
+    def test_user_data_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(reverse(
+                'courseware_section',
+                kwargs={'course_id': self.course.id.to_deprecated_string(),
+                        'chapter': self.chapter.url_name,
+                        'section': self.sequential.url_name}
+            ))
+        self.assertEqual(resp.status_code, 200)
+        for partition_id in range(self.PARTITIONS):
+            self.assertIn('Some HTML for group {} of partition {}'.format(partition_id % 2, partition_id), resp.content)
+
+        def count_queries(table):
+            """Returns the number of queries of the request reading the table."""
+            return len([query for query in queries if query['sql'].startswith('SELECT') and table in query['sql']])
+
+        self.assertEqual(count_queries('user_api_usercoursetag'), 1)
+        self.assertLessEqual(count_queries('user_api_userpreference'), 1)
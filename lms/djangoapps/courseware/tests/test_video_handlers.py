@@ -511,6 +511,21 @@ class TestTranscriptTranslationGetDispatch(TestVideo):
         response = self.item.transcript(request=request, dispatch='translation/uk')
         self.assertDictEqual(json.loads(response.body), subs)
 
+    def test_translation_non_en_srt_uploaded_again(self):
+        self.srt_file.seek(0)
+        srt_filename = os.path.split(self.srt_file.name)[1]
+        _upload_file(self.srt_file, self.item_descriptor.location, srt_filename)
+        self.item.youtube_id_1_0 = ""
+        request = Request.blank('/translation/uk')
+        response = self.item.transcript(request=request, dispatch='translation/uk')
+        self.assertEqual(json.loads(response.body)['end'], [100])
+
+        # the conversion of the previous version isn't served
+        new_srt_file = _create_srt_file(SRT_content.replace('00:00:00,100', '00:00:00,200'))
+        _upload_file(new_srt_file, self.item_descriptor.location, srt_filename)
+        response = self.item.transcript(request=request, dispatch='translation/uk')
+        self.assertEqual(json.loads(response.body)['end'], [200])
+
     def test_translation_static_transcript_xml_with_data_dirc(self):
         """
         Test id data_dir is set in XML course.
@@ -50,8 +50,7 @@ from courseware.courses import (
 )
 from courseware.masquerade import setup_masquerade
 from openedx.core.djangoapps.credit.api import (
-    get_credit_requirement_status,
-    is_user_eligible_for_credit,
+    get_credit_summaries_for_user,
     is_credit_course
 )
 from courseware.models import StudentModuleHistory
@@ -1011,17 +1010,13 @@ def _credit_course_requirements(course_key, student):
     if not (settings.FEATURES.get("ENABLE_CREDIT_ELIGIBILITY", False) and is_credit_course(course_key)):
         return None
 
-    # Credit requirement statuses for which user does not remain eligible to get credit.
-    non_eligible_statuses = ['failed', 'declined']
-
     # Retrieve the status of the user for each eligibility requirement in the course.
     # For each requirement, the user's status is either "satisfied", "failed", or None.
     # In this context, `None` means that we don't know the user's status, either because
     # the user hasn't done something (for example, submitting photos for verification)
     # or we're waiting on more information (for example, a response from the photo
     # verification service).
-    requirement_statuses = get_credit_requirement_status(course_key, student.username)
-
+    #
     # If the user has been marked as "eligible", then they are *always* eligible
     # unless someone manually intervenes.  This could lead to some strange behavior
     # if the requirements change post-launch.  For example, if the user was marked as eligible
@@ -1032,23 +1027,11 @@ def _credit_course_requirements(course_key, student):
     # marked as eligible to continue to be eligible.
     # If we need to, we can always manually move students back to ineligible by
     # deleting CreditEligibility records in the database.
-    if is_user_eligible_for_credit(student.username, course_key):
-        eligibility_status = "eligible"
-
+    #
     # If the user has *failed* any requirements (for example, if a photo verification is denied),
-    # then the user is NOT eligible for credit.
-    elif any(requirement['status'] in non_eligible_statuses for requirement in requirement_statuses):
-        eligibility_status = "not_eligible"
-
-    # Otherwise, the user may be eligible for credit, but the user has not
-    # yet completed all the requirements.
-    else:
-        eligibility_status = "partial_eligible"
-
-    return {
-        'eligibility_status': eligibility_status,
-        'requirements': requirement_statuses,
-    }
+    # then the user is NOT eligible for credit.  Otherwise, the user may be eligible for credit,
+    # but the user has not yet completed all the requirements.
+    return get_credit_summaries_for_user(student.username, [course_key])[course_key]
 
 
 @login_required
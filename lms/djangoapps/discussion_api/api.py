@@ -4,10 +4,14 @@ Discussion API internal interface
 from collections import defaultdict
 from urllib import urlencode
 from urlparse import urlunparse
+import sys
+import threading
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.http import Http404
+from django.utils import translation
 import itertools
 
 from rest_framework.exceptions import PermissionDenied
@@ -39,10 +43,53 @@ from django_comment_common.signals import (
 from django_comment_client.utils import get_accessible_discussion_modules, is_commentable_cohorted
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
+from lms.lib.comment_client.user import User as CommentClientUser
 from lms.lib.comment_client.utils import CommentClientRequestError
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id
 
 
+def _call_concurrently(first_call, second_call):
+    """
+    Returns the results of first_call() and second_call(), which are made
+    concurrently if DISCUSSION_SETTINGS['CONCURRENT_COMMENTS_SERVICE_REQUESTS']
+    is set, or else one after the other.
+
+    The calls are expected to be independent requests to the comments
+    service: first_call is made in another thread, in the current language.
+    """
+    if not settings.DISCUSSION_SETTINGS.get('CONCURRENT_COMMENTS_SERVICE_REQUESTS', False):
+        return first_call(), second_call()
+
+    language = translation.get_language()
+    outcome = {}
+
+    def make_first_call():
+        """Makes the first call, keeping its result or exception for the calling thread."""
+        try:
+            with translation.override(language):
+                outcome['result'] = first_call()
+        except Exception:  # pylint: disable=broad-except
+            outcome['exc_info'] = sys.exc_info()
+
+    first_call_thread = threading.Thread(target=make_first_call)
+    first_call_thread.start()
+    try:
+        second_result = second_call()
+    finally:
+        first_call_thread.join()
+    if 'exc_info' in outcome:
+        exc_type, exc_value, exc_traceback = outcome['exc_info']
+        raise exc_type, exc_value, exc_traceback
+    return outcome['result'], second_result
+
+
+def _retrieve_cc_requester(request):
+    """
+    Retrieve the comments service user of the requester.
+    """
+    return CommentClientUser.from_django_user(request.user).retrieve()
+
+
 def _get_course_or_404(course_key, user):
     """
     Get the course descriptor, raising Http404 if the course is not found,
@@ -67,10 +114,13 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
     try:
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        cc_thread, cc_requester = _call_concurrently(
+            lambda: Thread(id=thread_id).retrieve(**retrieve_kwargs),
+            lambda: _retrieve_cc_requester(request),
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course_or_404(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester)
         if (
                 not context["is_requester_privileged"] and
                 cc_thread["group_id"] and
@@ -298,7 +348,8 @@ def get_thread_list(
         })
 
     course = _get_course_or_404(course_key, request.user)
-    context = get_context(course, request)
+    # The requester is retrieved from the comments service along with the threads.
+    context = get_context(course, request, cc_requester=CommentClientUser.from_django_user(request.user))
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -313,8 +364,6 @@ def get_thread_list(
         "sort_order": order_direction,
     }
 
-    text_search_rewrite = None
-
     if view:
         if view in ["unread", "unanswered"]:
             query_params[view] = "true"
@@ -323,13 +372,24 @@ def get_thread_list(
                 "view": ["Invalid value. '{}' must be 'unread' or 'unanswered'".format(view)]
             })
 
-    if following:
-        threads, result_page, num_pages = context["cc_requester"].subscribed_threads(query_params)
-    else:
-        query_params["course_id"] = unicode(course.id)
-        query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
-        query_params["text"] = text_search
-        threads, result_page, num_pages, text_search_rewrite = Thread.search(query_params)
+    def search_threads():
+        """
+        Returns the threads, the page, the number of pages and the rewritten text search.
+        """
+        if following:
+            return context["cc_requester"].subscribed_threads(query_params) + (None,)
+        else:
+            query_params["course_id"] = unicode(course.id)
+            query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
+            query_params["text"] = text_search
+            return Thread.search(query_params)
+
+    cc_requester, (threads, result_page, num_pages, text_search_rewrite) = _call_concurrently(
+        lambda: _retrieve_cc_requester(request),
+        search_threads,
+    )
+    cc_requester["course_id"] = course.id
+    context["cc_requester"] = cc_requester
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a 404 in that case
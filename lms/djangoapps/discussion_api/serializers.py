@@ -30,10 +30,13 @@ from lms.lib.comment_client.utils import CommentClientRequestError
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_names
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    cc_requester is the comments service user of the requester, which is
+    retrieved if not provided.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -50,7 +53,8 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
     cc_requester["course_id"] = course.id
     return {
         "course": course,
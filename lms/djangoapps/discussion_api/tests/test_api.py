@@ -13,7 +13,10 @@ from pytz import UTC
 
 from django.core.exceptions import ValidationError
 from django.http import Http404
+from django.test import TestCase
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from django.utils import translation
 
 from rest_framework.exceptions import PermissionDenied
 
@@ -23,6 +26,7 @@ from common.test.utils import MockSignalHandlerMixin, disable_signal
 from courseware.tests.factories import BetaTesterFactory, StaffFactory
 from discussion_api import api
 from discussion_api.api import (
+    _call_concurrently,
     create_comment,
     create_thread,
     delete_comment,
@@ -2934,6 +2938,7 @@ class DeleteCommentTest(
 
 @ddt.ddt
 @mock.patch.dict("django.conf.settings.FEATURES", {"ENABLE_DISCUSSION_SERVICE": True})
+@mock.patch.dict("django.conf.settings.DISCUSSION_SETTINGS", {"CONCURRENT_COMMENTS_SERVICE_REQUESTS": True})
 class RetrieveThreadTest(
         CommentsServiceMockMixin,
         UrlResetMixin,
@@ -3110,3 +3115,27 @@ class RetrieveThreadTest(
             self.assertFalse(expected_error)
         except Http404:
             self.assertTrue(expected_error)
+
+
+@override_settings(DISCUSSION_SETTINGS={"CONCURRENT_COMMENTS_SERVICE_REQUESTS": True})
+class CallConcurrentlyTest(TestCase):
+    """Tests for _call_concurrently"""
+    def test_results(self):
+        self.assertEqual(_call_concurrently(lambda: 1, lambda: 2), (1, 2))
+
+    def test_language(self):
+        with translation.override("eo"):
+            first_language, second_language = _call_concurrently(translation.get_language, translation.get_language)
+        self.assertEqual(first_language, "eo")
+        self.assertEqual(second_language, "eo")
+
+    def test_first_call_error(self):
+        second_call = mock.Mock(return_value=2)
+
+        def first_call():
+            """Fails like an unavailable comments service"""
+            raise ValueError("comments service unavailable")
+
+        with self.assertRaisesRegexp(ValueError, "comments service unavailable"):
+            _call_concurrently(first_call, second_call)
+        self.assertTrue(second_call.called)
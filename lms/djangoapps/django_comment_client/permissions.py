@@ -13,8 +13,10 @@ from django_comment_common.models import all_permissions_for_user_in_course
 from lms.djangoapps.teams.models import CourseTeam
 
 
-def has_permission(user, permission, course_id=None):
-    assert isinstance(course_id, (NoneType, CourseKey))
+def _get_all_permissions(user, course_id):
+    """
+    Returns the set of the names of the user's forum permissions in the course, cached for the request.
+    """
     request_cache_dict = RequestCache.get_request_cache().data
     cache_key = "django_comment_client.permissions.has_permission.all_permissions.{}.{}".format(
         user.id, course_id
@@ -24,8 +26,12 @@ def has_permission(user, permission, course_id=None):
     else:
         all_permissions = all_permissions_for_user_in_course(user, course_id)
         request_cache_dict[cache_key] = all_permissions
+    return all_permissions
 
-    return permission in all_permissions
+
+def has_permission(user, permission, course_id=None):
+    assert isinstance(course_id, (NoneType, CourseKey))
+    return permission in _get_all_permissions(user, course_id)
 
 
 CONDITIONS = ['is_open', 'is_author', 'is_question_author', 'is_team_member_if_applicable']
@@ -118,19 +124,67 @@ def _check_conditions_permissions(user, permissions, course_id, content):
     "can_view" or "can_edit" permission. To use AND operator in between, wrap them in
     a list.
     """
+    return _check_compiled_permissions(user, _compile_permissions(permissions), course_id, [content])[0]
+
+
+def _flatten_permissions(per):
+    """ Returns the names of the permissions and conditions all required by per. """
+    if isinstance(per, basestring):
+        return [per]
+    return [name for item in per for name in _flatten_permissions(item)]
+
+
+def _compile_permissions(permissions):
+    """
+    Compiles a list of permissions (see _check_conditions_permissions) into a
+    tuple of alternative (permission_mask, other_permissions, conditions, strict)
+    clauses: a clause holds when the user has all the permissions of the mask
+    and the other permissions (those without a bit in PERMISSION_BITS), and the
+    content meets all its conditions. The condition of a clause which is a
+    single condition must be met strictly (be True), while the conditions of a
+    list are only failed by a False result.
+    """
+    clauses = []
+    for per in (permissions if isinstance(permissions, list) else [permissions]):
+        names = _flatten_permissions(per)
+        permission_mask = 0
+        other_permissions = []
+        for name in names:
+            if name in CONDITIONS:
+                continue
+            if name in PERMISSION_BITS:
+                permission_mask |= PERMISSION_BITS[name]
+            else:
+                other_permissions.append(name)
+        conditions = tuple(name for name in names if name in CONDITIONS)
+        clauses.append((permission_mask, tuple(other_permissions), conditions, isinstance(per, basestring)))
+    return tuple(clauses)
+
+
+def _check_compiled_permissions(user, clauses, course_id, contents):
+    """
+    Returns the list of whether the user passes any of the compiled clauses (see
+    _compile_permissions) for each of the contents.
+    """
+    permission_mask = get_permission_mask(user, course_id)
+    conditions_clauses = [
+        (conditions, strict) for clause_mask, other_permissions, conditions, strict in clauses
+        if clause_mask & permission_mask == clause_mask and all(
+            has_permission(user, permission, course_id) for permission in other_permissions
+        )
+    ]
+    if any(not conditions for conditions, __ in conditions_clauses):
+        return [True] * len(contents)
+
+    def check(content):
+        """ Check whether the content meets the conditions of any of the clauses. """
+        for conditions, strict in conditions_clauses:
+            results = (_check_condition(user, condition, content) for condition in conditions)
+            if all(result is True if strict else result is not False for result in results):
+                return True
+        return False
 
-    def test(user, per, operator="or"):
-        if isinstance(per, basestring):
-            if per in CONDITIONS:
-                return _check_condition(user, per, content)
-            return has_permission(user, per, course_id=course_id)
-        elif isinstance(per, list) and operator in ["and", "or"]:
-            results = [test(user, x, operator="and") for x in per]
-            if operator == "or":
-                return True in results
-            elif operator == "and":
-                return False not in results
-    return test(user, permissions, operator="or")
+    return [check(content) for content in contents]
 
 
 # Note: 'edit_content' is being used as a generic way of telling if someone is a privileged user
@@ -162,10 +216,49 @@ VIEW_PERMISSIONS = {
 }
 
 
+# The bits of the permissions used by VIEW_PERMISSIONS in the permission masks.
+PERMISSION_BITS = {
+    permission: 1 << index
+    for index, permission in enumerate(sorted({
+        name for permissions in VIEW_PERMISSIONS.itervalues() for name in _flatten_permissions(permissions)
+        if name not in CONDITIONS
+    }))
+}
+
+
+COMPILED_VIEW_PERMISSIONS = {
+    name: _compile_permissions(permissions) for name, permissions in VIEW_PERMISSIONS.iteritems()
+}
+
+
+def get_permission_mask(user, course_id):
+    """
+    Returns the mask of the PERMISSION_BITS of the permissions the user has in the course, cached for the request.
+    """
+    request_cache_dict = RequestCache.get_request_cache().data
+    cache_key = "django_comment_client.permissions.permission_mask.{}.{}".format(user.id, course_id)
+    if cache_key not in request_cache_dict:
+        all_permissions = _get_all_permissions(user, course_id)
+        request_cache_dict[cache_key] = sum(
+            bit for permission, bit in PERMISSION_BITS.iteritems() if permission in all_permissions
+        )
+    return request_cache_dict[cache_key]
+
+
 def check_permissions_by_view(user, course_id, content, name):
+    return check_permissions_by_view_for_contents(user, course_id, [content], name)[0]
+
+
+def check_permissions_by_view_for_contents(user, course_id, contents, name):
+    """
+    Returns the list of whether the user may use the view named name on each of
+    the contents. The user's permissions are resolved once into a permission
+    mask, and only the conditions are checked for each content.
+    """
     assert isinstance(course_id, CourseKey)
     try:
-        p = VIEW_PERMISSIONS[name]
+        clauses = COMPILED_VIEW_PERMISSIONS[name]
     except KeyError:
         logging.warning("Permission for view named %s does not exist in permissions.py", name)
-    return _check_conditions_permissions(user, p, course_id, content)
+        raise
+    return _check_compiled_permissions(user, clauses, course_id, contents)
@@ -0,0 +1,65 @@
+"""
+Performance test for building the discussion category map of a course with many inline discussions.
+"""
+import time
+import unittest
+from datetime import datetime
+
+from django.core.cache import cache
+from pytz import UTC
+
+import django_comment_client.utils as utils
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+# Shape of the generated course: 2000 inline discussions in 100 categories.
+DISCUSSIONS = 2000
+CATEGORIES = 100
+
+# Number of times the category map is built (as if by different requests).
+REQUESTS = 20
+
+
+@unittest.skip
+class CategoryMapPerformance(ModuleStoreTestCase):
+    """
+    Times building the category map of a student, as the forum pages do, with
+    the compiled discussion modules of the course built on every request or
+    kept in the cache.
+    """
+
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(CategoryMapPerformance, self).setUp()
+        self.course = CourseFactory.create(start=datetime(2012, 2, 3, tzinfo=UTC), discussion_topics={})
+        with self.store.bulk_operations(self.course.id):
+            for index in range(DISCUSSIONS):
+                ItemFactory.create(
+                    parent_location=self.course.location,
+                    category='discussion',
+                    discussion_id='discussion{}'.format(index),
+                    discussion_category='Week {} / Section'.format(index % CATEGORIES),
+                    discussion_target='Discussion {}'.format(index),
+                )
+        self.course = self.store.get_course(self.course.id)
+        self.student = UserFactory.create()
+
+    def _time(self, clear_cache):
+        """
+        Returns the seconds spent building the student's category map REQUESTS times.
+        """
+        start = time.time()
+        for __ in range(REQUESTS):
+            if clear_cache:
+                cache.clear()
+            utils.get_discussion_category_map(self.course, self.student)
+        return time.time() - start
+
+    def test_category_map(self):
+        uncached_seconds = self._time(clear_cache=True)
+        cached_seconds = self._time(clear_cache=False)
+
+        self.assertLess(cached_seconds, uncached_seconds)
@@ -0,0 +1,99 @@
+"""
+Tests for the permission checks of the django comment client views
+"""
+import ddt
+import mock
+from django.test import TestCase
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locator import CourseLocator
+
+from django_comment_client import permissions
+from request_cache.middleware import RequestCache
+from student.tests.factories import UserFactory
+
+
+@attr('shard_1')
+@ddt.ddt
+class CheckPermissionsByViewTestCase(TestCase):
+    """
+    Tests that checking the permissions of many contents at once gives the
+    results of checking them one by one.
+    """
+    def setUp(self):
+        super(CheckPermissionsByViewTestCase, self).setUp()
+        self.course_id = CourseLocator('org', 'course', 'run')
+        self.user = UserFactory.create()
+        self.contents = [
+            {'type': 'thread', 'closed': False, 'user_id': str(self.user.id), 'commentable_id': 'topic'},
+            {'type': 'thread', 'closed': True, 'user_id': str(self.user.id), 'commentable_id': 'topic'},
+            {'type': 'thread', 'closed': False, 'user_id': str(self.user.id + 1), 'commentable_id': 'topic'},
+            {'type': 'comment', 'closed': False, 'user_id': str(self.user.id)},
+            None,
+        ]
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def patch_permissions(self, user_permissions):
+        """
+        Gives the user the permissions in the course.
+        """
+        patcher = mock.patch(
+            'django_comment_client.permissions.all_permissions_for_user_in_course',
+            return_value=set(user_permissions),
+        )
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def check_one_by_one(self, view_permissions, content, operator="or"):
+        """
+        Checks the permissions of the view for the content by evaluating the
+        nested permission lists, as the permissions were originally checked.
+        """
+        if isinstance(view_permissions, basestring):
+            if view_permissions in permissions.CONDITIONS:
+                return permissions._check_condition(  # pylint: disable=protected-access
+                    self.user, view_permissions, content
+                )
+            return permissions.has_permission(self.user, view_permissions, course_id=self.course_id)
+        results = [self.check_one_by_one(per, content, operator="and") for per in view_permissions]
+        return True in results if operator == "or" else False not in results
+
+    @ddt.data(
+        [],
+        ['update_thread'],
+        ['update_thread', 'create_comment', 'vote'],
+        ['edit_content'],
+    )
+    def test_same_results(self, user_permissions):
+        self.patch_permissions(user_permissions)
+        for view_name, view_permissions in permissions.VIEW_PERMISSIONS.iteritems():
+            if 'is_question_author' in str(view_permissions):
+                # checking question authors retrieves the threads of the comments
+                continue
+            self.assertEqual(
+                permissions.check_permissions_by_view_for_contents(self.user, self.course_id, self.contents, view_name),
+                [self.check_one_by_one(view_permissions, content) for content in self.contents],
+                view_name
+            )
+
+    def test_permissions_resolved_once(self):
+        mock_all_permissions = self.patch_permissions(['update_thread', 'create_comment'])
+        self.assertEqual(
+            permissions.check_permissions_by_view_for_contents(
+                self.user, self.course_id, self.contents, 'update_thread'
+            ),
+            [True, False, False, True, True]
+        )
+        for content in self.contents:
+            permissions.check_permissions_by_view(self.user, self.course_id, content, 'create_comment')
+        self.assertEqual(mock_all_permissions.call_count, 1)
+
+    def test_permissions_outside_view_permissions(self):
+        self.patch_permissions(['manage_moderator'])
+        permission_bits = dict(permissions.PERMISSION_BITS)
+        self.assertTrue(permissions._check_conditions_permissions(  # pylint: disable=protected-access
+            self.user, ['manage_moderator'], self.course_id, self.contents[0]
+        ))
+        self.assertFalse(permissions._check_conditions_permissions(  # pylint: disable=protected-access
+            self.user, [['see_all_cohorts', 'is_open']], self.course_id, self.contents[0]
+        ))
+        self.assertEqual(permissions.PERMISSION_BITS, permission_bits)
@@ -14,6 +14,7 @@ from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 import django_comment_client.utils as utils
 
+from courseware.access_utils import check_group_access
 from courseware.tests.factories import InstructorFactory
 from courseware.tabs import get_course_tab_list
 from openedx.core.djangoapps.course_groups import cohorts
@@ -230,6 +231,22 @@ class CachedDiscussionIdMapTestCase(ModuleStoreTestCase):
         with self.assertRaises(utils.DiscussionIdMapIsNotCached):
             utils.get_cached_discussion_key(self.course, 'test_discussion_id')
 
+    def test_cached_id_map_read_once(self):
+        utils.get_cached_discussion_key(self.course, 'test_discussion_id')
+        # only the time the course structure was modified is read
+        with self.assertNumQueries(1):
+            usage_key = utils.get_cached_discussion_key(self.course, 'test_discussion_id')
+        self.assertEqual(usage_key, self.discussion.location)
+
+    def test_cached_id_map_follows_course_structure(self):
+        utils.get_cached_discussion_key(self.course, 'test_discussion_id')
+        course_structure = CourseStructure.objects.get(course_id=self.course.id)
+        course_structure.discussion_id_map_json = json.dumps({'test_discussion_id': unicode(self.discussion2.location)})
+        course_structure.save()
+
+        usage_key = utils.get_cached_discussion_key(self.course, 'test_discussion_id')
+        self.assertEqual(usage_key, self.discussion2.location)
+
     def test_module_does_not_have_required_keys(self):
         self.assertTrue(utils.has_required_keys(self.discussion))
         self.assertFalse(utils.has_required_keys(self.bad_discussion))
@@ -473,6 +490,19 @@ class CategoryMapTestCase(CategoryMapTestMixin, ModuleStoreTestCase):
             cohorted_if_in_list=True
         )
 
+    def test_compiled_modules_cached_per_publish(self):
+        self.create_discussion("Chapter 1", "Discussion 1")
+        course = self.store.get_course(self.course.id)
+        self.assertEqual(utils.get_discussion_categories_ids(course, self.user), ["discussion1"])
+
+        with mock.patch('django_comment_client.utils._compile_discussion_modules') as mock_compile:
+            self.assertEqual(utils.get_discussion_categories_ids(course, self.user), ["discussion1"])
+        self.assertFalse(mock_compile.called)
+
+        self.create_discussion("Chapter 1", "Discussion 2")
+        course = self.store.get_course(self.course.id)
+        self.assertItemsEqual(utils.get_discussion_categories_ids(course, self.user), ["discussion1", "discussion2"])
+
     def test_get_unstarted_discussion_modules(self):
         later = datetime.datetime(datetime.MAXYEAR, 1, 1, tzinfo=django_utc())
 
@@ -1061,6 +1091,15 @@ class ContentGroupCategoryMapTestCase(CategoryMapTestMixin, ContentGroupTestCase
             requesting_user=self.non_cohorted_user
         )
 
+    def test_group_access_checked_once_per_rule(self):
+        with mock.patch('django_comment_client.utils.check_group_access', wraps=check_group_access) as mock_check:
+            self.assertItemsEqual(
+                utils.get_discussion_categories_ids(self.course, self.alpha_user),
+                ['i4x-org-number-course-run', 'alpha_group_discussion', 'global_group_discussion']
+            )
+        # the unrestricted access, and the access of each of the alpha and beta groups
+        self.assertEqual(mock_check.call_count, 3)
+
 
 class JsonResponseTestCase(TestCase, UnicodeTestMixin):
     def _test_unicode_data(self, text):
@@ -3,26 +3,32 @@ from datetime import datetime
 import json
 import logging
 from django.conf import settings
+from django.core.cache import cache
 
 import pytz
-from django.contrib.auth.models import User
+from django.contrib.auth.models import AnonymousUser, User
 from django.core.urlresolvers import reverse
 from django.db import connection
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.http import HttpResponse
 from django.utils.timezone import UTC
 import pystache_custom as pystache
 from opaque_keys.edx.locations import i4xEncoder
-from opaque_keys.edx.keys import CourseKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
+from ccx_keys.locator import CCXLocator
 from xmodule.modulestore.django import modulestore
+from xmodule.split_test_module import get_split_user_partitions
 from ccx.overrides import get_current_ccx
 
 from django_comment_common.models import Role, FORUM_ROLE_STUDENT
-from django_comment_client.permissions import check_permissions_by_view, has_permission, get_team
+from django_comment_client.permissions import check_permissions_by_view_for_contents, has_permission, get_team
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from edxmako import lookup_template
 
 from courseware import courses
 from courseware.access import has_access
+from courseware.access_utils import check_group_access, check_start_date, in_preview_mode
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_course_cohorted
@@ -137,6 +143,109 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
     ]
 
 
+# How long the compiled discussion modules of a course version are kept in the django cache
+COMPILED_DISCUSSION_MODULES_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _compile_discussion_modules(course):
+    """
+    Returns the user-independent data of the valid discussion modules of the course needed to build the category map
+    of any user, as a dict with:
+
+        entries: the list of the discussion entries, in the modulestore order, as dicts with the id, title, sort_key,
+            normalized category and start_date of the entry, and what decides which users may load the module: its
+            start, days_early_for_beta, visible_to_staff_only and the index of its group access rule
+        group_access_rules: the list of the distinct merged group access of the modules, the first one being the
+            unrestricted access
+    """
+    # The group access of the modules is ignored when the course has no user partitions but those used by split tests
+    check_group_access_rules = len(course.user_partitions) != len(get_split_user_partitions(course.user_partitions))
+    group_access_rules = [{}]
+    rule_indexes = {_group_access_rule_key({}): 0}
+    entries = []
+    for module in modulestore().get_items(course.id, qualifiers={'category': 'discussion'}):
+        if not has_required_keys(module):
+            continue
+        group_access = module.merged_group_access if check_group_access_rules else {}
+        rule_key = _group_access_rule_key(group_access)
+        if rule_key not in rule_indexes:
+            rule_indexes[rule_key] = len(group_access_rules)
+            group_access_rules.append(group_access)
+        entries.append({
+            "id": module.discussion_id,
+            "title": module.discussion_target,
+            "sort_key": module.sort_key,
+            "category": " / ".join([x.strip() for x in module.discussion_category.split("/")]),
+            # Handle case where module.start is None
+            "start_date": module.start if module.start else datetime.max.replace(tzinfo=pytz.UTC),
+            "start": module.start,
+            "days_early_for_beta": module.days_early_for_beta,
+            "visible_to_staff_only": module.visible_to_staff_only,
+            "group_access_rule": rule_indexes[rule_key],
+        })
+    return {"entries": entries, "group_access_rules": group_access_rules}
+
+
+def _group_access_rule_key(group_access):
+    """
+    Returns a hashable value identifying the merged group access of a module.
+    """
+    return tuple(sorted(
+        (partition_id, tuple(group_ids) if isinstance(group_ids, list) else group_ids)
+        for partition_id, group_ids in group_access.iteritems()
+    ))
+
+
+def get_compiled_discussion_modules(course):
+    """
+    Returns the result of _compile_discussion_modules for the course, which is cached until the course is published
+    again. The modules of CCX courses aren't cached, since their schedules can be changed without publishing.
+    """
+    if course.subtree_edited_on is None or isinstance(course.id, CCXLocator):
+        return _compile_discussion_modules(course)
+    cache_key = u'django_comment_client.compiled_discussion_modules.{}.{}'.format(
+        course.id, course.subtree_edited_on.isoformat()
+    )
+    compiled = cache.get(cache_key)
+    if compiled is None:
+        compiled = _compile_discussion_modules(course)
+        cache.set(cache_key, compiled, COMPILED_DISCUSSION_MODULES_CACHE_TIMEOUT)
+    return compiled
+
+
+def get_accessible_discussion_entries(course, user, include_all=False):
+    """
+    Returns the entries of get_compiled_discussion_modules for the discussion modules of the course which the user can
+    load, like get_accessible_discussion_modules does without loading the modules.
+
+    The group access rules are checked once per user, rather than once per module.
+    """
+    compiled = get_compiled_discussion_modules(course)
+    if include_all:
+        return compiled["entries"]
+
+    user = user or AnonymousUser()
+    if has_access(user, 'staff', course):
+        return compiled["entries"]
+    if in_preview_mode():
+        # only staff can load modules in preview mode
+        return []
+
+    course_key = course.id.to_course_locator() if isinstance(course.id, CCXLocator) else course.id
+    group_access_allowed = [
+        bool(check_group_access(user, course.user_partitions, group_access, course_key))
+        for group_access in compiled["group_access_rules"]
+    ]
+    return [
+        entry for entry in compiled["entries"]
+        if (
+            not entry["visible_to_staff_only"] and
+            group_access_allowed[entry["group_access_rule"]] and
+            check_start_date(user, entry["days_early_for_beta"], entry["start"], course_key)
+        )
+    ]
+
+
 def get_discussion_id_map_entry(module):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
@@ -155,19 +264,64 @@ class DiscussionIdMapIsNotCached(Exception):
     pass
 
 
-def get_cached_discussion_key(course, discussion_id):
+# How long the discussion id map of a course version is kept in the django cache
+DISCUSSION_ID_MAP_CACHE_TIMEOUT = 60 * 60
+
+
+def _discussion_id_map_cache_key(course_key, modified):
+    """
+    Returns the django cache key of the discussion id map of the course structure last modified at modified.
+    """
+    # MySQL stores the timestamps without their microseconds
+    return u'django_comment_client.discussion_id_map.{}.{}'.format(
+        course_key, modified.replace(microsecond=0).isoformat()
+    )
+
+
+@receiver(post_save, sender=CourseStructure)
+def invalidate_discussion_id_map(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the cached discussion id map of a course structure saved twice within the same second.
+    """
+    cache.delete(_discussion_id_map_cache_key(instance.course_id, instance.modified))
+
+
+def _get_course_discussion_id_map(course_key):
+    """
+    Returns the discussion id map of the course as a {discussion_id: usage key string} dict, or raises
+    DiscussionIdMapIsNotCached. The map is kept in the django cache under the time the course structure was last
+    modified, so only that timestamp is read from the database while the course is unchanged.
+    """
+    modified = CourseStructure.objects.filter(course_id=course_key).values_list('modified', flat=True).first()
+    if modified is None:
+        raise DiscussionIdMapIsNotCached()
+    cache_key = _discussion_id_map_cache_key(course_key, modified)
+    id_map = cache.get(cache_key)
+    if id_map is None:
+        cached_mapping = CourseStructure.objects.get(course_id=course_key).discussion_id_map
+        if not cached_mapping:
+            raise DiscussionIdMapIsNotCached()
+        id_map = {discussion_id: unicode(usage_key) for discussion_id, usage_key in cached_mapping.iteritems()}
+        cache.set(cache_key, id_map, DISCUSSION_ID_MAP_CACHE_TIMEOUT)
+    return id_map
+
+
+def get_cached_discussion_key(course, discussion_id, id_map=None):
     """
     Returns the usage key of the discussion module associated with discussion_id if it is cached. If the discussion id
     map is cached but does not contain discussion_id, returns None. If the discussion id map is not cached for course,
     raises a DiscussionIdMapIsNotCached exception.
+
+    id_map is the map returned by _get_course_discussion_id_map, when already loaded.
     """
-    try:
-        cached_mapping = CourseStructure.objects.get(course_id=course.id).discussion_id_map
-        if not cached_mapping:
+    if id_map is None:
+        try:
+            id_map = _get_course_discussion_id_map(course.id)
+        except CourseStructure.DoesNotExist:
             raise DiscussionIdMapIsNotCached()
-        return cached_mapping.get(discussion_id)
-    except CourseStructure.DoesNotExist:
-        raise DiscussionIdMapIsNotCached()
+    key_string = id_map.get(discussion_id)
+    # Old mongo key strings don't include the course run
+    return UsageKey.from_string(key_string).map_into_course(course.id) if key_string else None
 
 
 def get_cached_discussion_id_map(course, discussion_ids, user):
@@ -176,19 +330,21 @@ def get_cached_discussion_id_map(course, discussion_ids, user):
     user. If not, returns the result of get_discussion_id_map
     """
     try:
-        entries = []
-        for discussion_id in discussion_ids:
-            key = get_cached_discussion_key(course, discussion_id)
-            if not key:
-                continue
-            module = modulestore().get_item(key)
-            if not (has_required_keys(module) and has_access(user, 'load', module, course.id)):
-                continue
-            entries.append(get_discussion_id_map_entry(module))
-        return dict(entries)
-    except DiscussionIdMapIsNotCached:
+        id_map = _get_course_discussion_id_map(course.id)
+    except (DiscussionIdMapIsNotCached, CourseStructure.DoesNotExist):
         return get_discussion_id_map(course, user)
 
+    entries = []
+    for discussion_id in discussion_ids:
+        key = get_cached_discussion_key(course, discussion_id, id_map)
+        if not key:
+            continue
+        module = modulestore().get_item(key)
+        if not (has_required_keys(module) and has_access(user, 'load', module, course.id)):
+            continue
+        entries.append(get_discussion_id_map_entry(module))
+    return dict(entries)
+
 
 def get_discussion_id_map(course, user):
     """
@@ -301,18 +457,17 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    modules = get_accessible_discussion_modules(course, user)
+    entries = get_accessible_discussion_entries(course, user)
 
     course_cohort_settings = get_course_cohort_settings(course.id)
 
-    for module in modules:
-        id = module.discussion_id
-        title = module.discussion_target
-        sort_key = module.sort_key
-        category = " / ".join([x.strip() for x in module.discussion_category.split("/")])
-        # Handle case where module.start is None
-        entry_start_date = module.start if module.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title, "id": id, "sort_key": sort_key, "start_date": entry_start_date})
+    for entry in entries:
+        unexpanded_category_map[entry["category"]].append({
+            "title": entry["title"],
+            "id": entry["id"],
+            "sort_key": entry["sort_key"],
+            "start_date": entry["start_date"],
+        })
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
     for category_path, entries in unexpanded_category_map.items():
@@ -416,7 +571,7 @@ def get_discussion_categories_ids(course, user, include_all=False):
 
     """
     accessible_discussion_ids = [
-        module.discussion_id for module in get_accessible_discussion_modules(course, user, include_all=include_all)
+        entry["id"] for entry in get_accessible_discussion_entries(course, user, include_all=include_all)
     ]
     return course.top_level_discussion_topic_ids + accessible_discussion_ids
 
@@ -500,24 +655,57 @@ class QueryCountDebugMiddleware(object):
         return response
 
 
+# The views whose permissions give each ability of the threads and of the comments (see get_ability)
+THREAD_ABILITY_VIEWS = {
+    'editable': 'update_thread',
+    'can_reply': 'create_comment',
+    'can_delete': 'delete_thread',
+    'can_openclose': 'openclose_thread',
+    'can_vote': 'vote_for_thread',
+}
+COMMENT_ABILITY_VIEWS = {
+    'editable': 'update_comment',
+    'can_reply': 'create_sub_comment',
+    'can_delete': 'delete_comment',
+    'can_openclose': None,
+    'can_vote': 'vote_for_comment',
+}
+
+
 def get_ability(course_id, content, user):
     """
     Return a dictionary of forums-oriented actions and the user's permission to perform them
     """
-    return {
-        'editable': check_permissions_by_view(user, course_id, content, "update_thread" if content['type'] == 'thread' else "update_comment"),
-        'can_reply': check_permissions_by_view(user, course_id, content, "create_comment" if content['type'] == 'thread' else "create_sub_comment"),
-        'can_delete': check_permissions_by_view(user, course_id, content, "delete_thread" if content['type'] == 'thread' else "delete_comment"),
-        'can_openclose': check_permissions_by_view(user, course_id, content, "openclose_thread") if content['type'] == 'thread' else False,
-        'can_vote': check_permissions_by_view(user, course_id, content, "vote_for_thread" if content['type'] == 'thread' else "vote_for_comment"),
-    }
+    return get_abilities(course_id, [content], user)[0]
+
+
+def get_abilities(course_id, contents, user):
+    """
+    Returns the list of the get_ability dicts of the contents, checking the user's permissions once for all of them.
+    """
+    abilities = [{} for __ in contents]
+    for is_thread, ability_views in ((True, THREAD_ABILITY_VIEWS), (False, COMMENT_ABILITY_VIEWS)):
+        indexes = [index for index, content in enumerate(contents) if (content['type'] == 'thread') == is_thread]
+        if not indexes:
+            continue
+        group = [contents[index] for index in indexes]
+        for ability, view_name in ability_views.iteritems():
+            if view_name is None:
+                permitted = [False] * len(group)
+            else:
+                permitted = check_permissions_by_view_for_contents(user, course_id, group, view_name)
+            for index, is_permitted in zip(indexes, permitted):
+                abilities[index][ability] = is_permitted
+    return abilities
 
 # TODO: RENAME
 
 
-def get_annotated_content_info(course_id, content, user, user_info):
+def get_annotated_content_info(course_id, content, user, user_info, ability=None):
     """
     Get metadata for an individual content (thread or comment)
+
+    ability is the get_ability dict of the content, when already computed.
     """
     voted = ''
     if content['id'] in user_info['upvoted_ids']:
@@ -527,40 +715,51 @@ def get_annotated_content_info(course_id, content, user, user_info):
     return {
         'voted': voted,
         'subscribed': content['id'] in user_info['subscribed_thread_ids'],
-        'ability': get_ability(course_id, content, user),
+        'ability': ability if ability is not None else get_ability(course_id, content, user),
     }
 
 # TODO: RENAME
 
 
+def _get_thread_contents(thread, contents):
+    """
+    Appends the thread and all its responses and comments to contents.
+    """
+    contents.append(thread)
+    for child in (
+            thread.get('children', []) +
+            thread.get('endorsed_responses', []) +
+            thread.get('non_endorsed_responses', [])
+    ):
+        _get_thread_contents(child, contents)
+    return contents
+
+
+def _get_annotated_content_infos_of_contents(course_id, contents, user, user_info):
+    """
+    Returns the annotated content infos of the contents, keyed by their ids.
+    """
+    return {
+        str(content['id']): get_annotated_content_info(course_id, content, user, user_info, ability)
+        for content, ability in zip(contents, get_abilities(course_id, contents, user))
+    }
+
+
 def get_annotated_content_infos(course_id, thread, user, user_info):
     """
     Get metadata for a thread and its children
     """
-    infos = {}
-
-    def annotate(content):
-        infos[str(content['id'])] = get_annotated_content_info(course_id, content, user, user_info)
-        for child in (
-                content.get('children', []) +
-                content.get('endorsed_responses', []) +
-                content.get('non_endorsed_responses', [])
-        ):
-            annotate(child)
-    annotate(thread)
-    return infos
+    return _get_annotated_content_infos_of_contents(course_id, _get_thread_contents(thread, []), user, user_info)
 
 
 def get_metadata_for_threads(course_id, threads, user, user_info):
     """
     Returns annotated content information for the specified course, threads, and user information
     """
-
-    def infogetter(thread):
-        return get_annotated_content_infos(course_id, thread, user, user_info)
-
-    metadata = reduce(merge_dict, map(infogetter, threads), {})
-    return metadata
+    contents = []
+    for thread in threads:
+        _get_thread_contents(thread, contents)
+    return _get_annotated_content_infos_of_contents(course_id, contents, user, user_info)
 
 # put this method in utils.py to avoid circular import dependency between helpers and mustache_helpers
 
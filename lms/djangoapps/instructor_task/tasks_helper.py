@@ -44,7 +44,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate
 )
-from certificates.api import generate_user_certificates
+from certificates.api import generate_user_certificates_in_bulk
 from courseware.courses import get_course_by_id, get_problems_in_section
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
@@ -79,6 +79,9 @@ UPDATE_STATUS_SUCCEEDED = 'succeeded'
 UPDATE_STATUS_FAILED = 'failed'
 UPDATE_STATUS_SKIPPED = 'skipped'
 
+# Number of students whose certificates are generated at once: their scores are held in memory.
+CERTIFICATE_GENERATION_CHUNK_SIZE = 100
+
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
@@ -1438,19 +1441,20 @@ def generate_students_certificates(
     task_progress.update_task_state(extra_meta=current_step)
 
     course = modulestore().get_course(course_id, depth=0)
-    # Generate certificate for each student
-    for student in students_require_certs:
-        task_progress.attempted += 1
-        status = generate_user_certificates(
-            student,
-            course_id,
-            course=course
-        )
+    # Generate the certificates a chunk of students at a time
+    generation_start_time = time()
+    for chunk_start in xrange(0, len(students_require_certs), CERTIFICATE_GENERATION_CHUNK_SIZE):
+        chunk = students_require_certs[chunk_start:chunk_start + CERTIFICATE_GENERATION_CHUNK_SIZE]
+        for __, status in generate_user_certificates_in_bulk(chunk, course_id, course=course):
+            task_progress.attempted += 1
+            if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
+                task_progress.succeeded += 1
+            else:
+                task_progress.failed += 1
 
-        if status in [CertificateStatuses.generating, CertificateStatuses.downloadable]:
-            task_progress.succeeded += 1
-        else:
-            task_progress.failed += 1
+        elapsed = time() - generation_start_time
+        current_step['students_per_second'] = round(task_progress.attempted / elapsed, 1) if elapsed else 0
+        task_progress.update_task_state(extra_meta=current_step)
 
     return task_progress.update_task_state(extra_meta=current_step)
 
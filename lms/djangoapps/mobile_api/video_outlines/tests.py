@@ -18,8 +18,10 @@ from xmodule.partitions.partitions import Group, UserPartition
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory
 from openedx.core.djangoapps.course_groups.models import CourseUserGroupPartitionGroup
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, remove_user_from_cohort
+from openedx.core.lib.block_cache.block_structure_factory import BlockStructureFactory
 
 from ..testutils import MobileAPITestCase, MobileAuthTestMixin, MobileCourseAccessTestMixin
+from .transformers import VideoOutlineTransformer
 
 
 class TestVideoAPITestCase(MobileAPITestCase):
@@ -891,3 +893,48 @@ class TestTranscriptsDetail(
         self.video = self._create_video_with_subs(custom_subid=u'你好')
         self.login_and_enroll()
         self.api_response(expected_response_code=200, lang='en')
+
+
+class TestVideoOutlineTransformer(TestVideoAPITestCase):
+    """
+    Tests for the data collected by the VideoOutlineTransformer.
+    """
+    def _collect(self):
+        """
+        Returns a block structure for the course with the transformer's data collected.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            self.store.make_course_usage_key(self.course.id), self.store
+        )
+        VideoOutlineTransformer.collect(block_structure)
+        return block_structure
+
+    def test_collect(self):
+        video = ItemFactory.create(
+            parent=self.other_unit,
+            category="video",
+            edx_video_id=self.edx_video_id,
+            display_name=u"test video omega \u03a9",
+        )
+        block_path, url_location, video_data = VideoOutlineTransformer.get_outline_data(
+            self._collect(), video.location
+        )
+        self.assertEqual(
+            [entry['name'] for entry in block_path],
+            [self.section.display_name, self.sub_section.display_name, self.other_unit.display_name],
+        )
+        self.assertEqual(
+            url_location,
+            {'chapter': self.section.location.block_id, 'section': self.sub_section.url_name, 'position': 2},
+        )
+        self.assertEqual(video_data['name'], video.display_name)
+        self.assertEqual(video_data['edx_video_id'], self.edx_video_id)
+
+    def test_collect_skips_hidden_blocks(self):
+        hidden_unit = ItemFactory.create(
+            parent=self.sub_section,
+            category="vertical",
+            hide_from_toc=True,
+        )
+        video = ItemFactory.create(parent=hidden_unit, category="video")
+        self.assertIsNone(VideoOutlineTransformer.get_outline_data(self._collect(), video.location))
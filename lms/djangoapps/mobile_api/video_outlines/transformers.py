@@ -0,0 +1,246 @@
+"""
+Video Outline Transformer
+"""
+from openedx.core.lib.block_cache.transformer import BlockStructureTransformer
+
+
+class VideoOutlineTransformer(BlockStructureTransformer):
+    """
+    Collects, once per published version of a course, everything the
+    mobile video outline needs to know about each video block: its
+    path from the course root, the location of its unit and section in
+    the courseware, and the video and transcript data that would
+    otherwise require instantiating the video module.
+
+    Blocks that are hidden from the table of contents (hide_from_toc),
+    and all of their descendants, are excluded from the outline.
+
+    Access control is left to the course block access transformers,
+    which must be run before reading the outline. Staff users are
+    exempted from group access, as they are in the courseware, by
+    leaving out the UserPartitionTransformer: this transformer then
+    only keeps the children of split tests for the user's groups
+    (see enforce_split_tests).
+    """
+    VERSION = 2
+
+    OUTLINE_BLOCK_TYPES = ('video',)
+
+    PATH = 'path'
+    URL_LOCATION = 'url_location'
+    VIDEO_DATA = 'video_data'
+    SPLIT_TEST = 'split_test'
+
+    def __init__(self, enforce_split_tests=False):
+        """
+        Arguments:
+            enforce_split_tests (bool) - Whether to remove the children
+                of split tests that aren't shown to the user's group,
+                for use without the UserPartitionTransformer.
+        """
+        self.enforce_split_tests = enforce_split_tests
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return "video_outlines"
+
+    @classmethod
+    def get_outline_data(cls, block_structure, block_key):
+        """
+        Returns a tuple of (path, url_location, video_data) collected
+        for the block with the given block_key, or None if the block is
+        not part of the video outline.
+        """
+        video_data = block_structure.get_transformer_block_field(block_key, cls, cls.VIDEO_DATA)
+        if video_data is None:
+            return None
+        return (
+            block_structure.get_transformer_block_field(block_key, cls, cls.PATH),
+            block_structure.get_transformer_block_field(block_key, cls, cls.URL_LOCATION),
+            video_data,
+        )
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        root_key = block_structure.root_block_usage_key
+
+        # Map of a block's usage key to the list of keys of its
+        # ancestors, starting below the root and ending with the block
+        # itself.  When a block has multiple parents, the first parent
+        # chain is used, just as the courseware navigation does.
+        lineage = {root_key: []}
+        hidden_blocks = set()
+        user_partitions = getattr(block_structure.get_xblock(root_key), 'user_partitions', []) or []
+
+        for block_key in block_structure.topological_traversal():
+            xblock = block_structure.get_xblock(block_key)
+            parents = block_structure.get_parents(block_key)
+
+            if parents:
+                parent_key = parents[0]
+                if parent_key in hidden_blocks:
+                    hidden_blocks.add(block_key)
+                    continue
+                lineage[block_key] = lineage[parent_key] + [block_key]
+
+            if getattr(xblock, 'hide_from_toc', False):
+                # Blocks hidden from the table of contents may not
+                # have human-readable names to display on the mobile
+                # clients, so neither they nor their descendants are
+                # included in the outline.
+                hidden_blocks.add(block_key)
+                continue
+
+            if block_key.block_type == 'split_test':
+                cls._collect_split_test(block_structure, block_key, xblock, user_partitions)
+                continue
+
+            if block_key.block_type not in cls.OUTLINE_BLOCK_TYPES:
+                continue
+
+            ancestor_keys = lineage[block_key][:-1]
+            block_structure.set_transformer_block_field(
+                block_key,
+                cls,
+                cls.PATH,
+                [cls._path_entry(block_structure.get_xblock(ancestor_key)) for ancestor_key in ancestor_keys],
+            )
+            block_structure.set_transformer_block_field(
+                block_key,
+                cls,
+                cls.URL_LOCATION,
+                cls._url_location(block_structure, ancestor_keys),
+            )
+            block_structure.set_transformer_block_field(
+                block_key,
+                cls,
+                cls.VIDEO_DATA,
+                cls._video_data(xblock),
+            )
+
+    @classmethod
+    def _collect_split_test(cls, block_structure, block_key, xblock, user_partitions):
+        """
+        Collects the partition of the split test and the child shown to
+        each of its groups.
+        """
+        partition = next(
+            (partition for partition in user_partitions if partition.id == xblock.user_partition_id), None
+        )
+        if partition is None:
+            return
+        block_structure.set_transformer_block_field(
+            block_key,
+            cls,
+            cls.SPLIT_TEST,
+            {
+                'partition': partition,
+                'group_id_to_child': {
+                    group.id: xblock.group_id_to_child.get(unicode(group.id)) for group in partition.groups
+                },
+            },
+        )
+
+    def transform(self, usage_info, block_structure):
+        """
+        Mutates block_structure based on the given usage_info.
+        """
+        # The collected outline is user-independent.
+        if not self.enforce_split_tests:
+            return
+
+        user_groups = {}
+
+        def get_user_group(partition):
+            """
+            Returns the user's group in the partition, assigning one if needed.
+            """
+            if partition.id not in user_groups:
+                user_groups[partition.id] = partition.scheme.get_group_for_user(
+                    usage_info.course_key, usage_info.user, partition
+                )
+            return user_groups[partition.id]
+
+        def is_hidden_by_split_test(block_key):
+            """
+            Returns whether the block is a child of a split test that
+            isn't shown to the user's group.
+            """
+            for parent_key in block_structure.get_parents(block_key):
+                split_test = block_structure.get_transformer_block_field(parent_key, self, self.SPLIT_TEST)
+                if split_test is None:
+                    continue
+                group = get_user_group(split_test['partition'])
+                if group is None or split_test['group_id_to_child'].get(group.id) != block_key:
+                    return True
+            return False
+
+        block_structure.remove_block_if(is_hidden_by_split_test)
+
+    @staticmethod
+    def _path_entry(xblock):
+        """
+        Returns the outline path entry for the given ancestor xblock.
+        """
+        return {
+            # to be consistent with other edx-platform clients, return the defaulted display name
+            'name': xblock.display_name_with_default,
+            'category': xblock.category,
+            'id': unicode(xblock.location),
+        }
+
+    @staticmethod
+    def _url_location(block_structure, ancestor_keys):
+        """
+        Returns a dict with the chapter id, section url_name and unit
+        position to be used when reversing the courseware urls for a
+        block with the given ancestors.  Values that do not apply at the
+        block's depth are set to None.
+        """
+        chapter_key = ancestor_keys[0] if len(ancestor_keys) > 0 else None
+        section_key = ancestor_keys[1] if len(ancestor_keys) > 1 else None
+        position = None
+
+        if len(ancestor_keys) > 2:
+            section_children = block_structure.get_children(section_key)
+            unit_key = ancestor_keys[2]
+            position = (
+                section_children.index(unit_key) if unit_key in section_children else len(section_children)
+            ) + 1
+
+        return {
+            'chapter': chapter_key.block_id if chapter_key else None,
+            'section': block_structure.get_xblock(section_key).url_name if section_key else None,
+            'position': position,
+        }
+
+    @staticmethod
+    def _video_data(video_descriptor):
+        """
+        Returns the user-independent summary data of the given video
+        descriptor.
+        """
+        transcripts_info = video_descriptor.get_transcripts_info()
+        if video_descriptor.html5_sources:
+            fallback_video_url = video_descriptor.html5_sources[0]
+        else:
+            fallback_video_url = video_descriptor.source
+
+        return {
+            'name': video_descriptor.display_name,
+            'category': video_descriptor.category,
+            'id': unicode(video_descriptor.scope_ids.usage_id),
+            'only_on_web': video_descriptor.only_on_web,
+            'edx_video_id': video_descriptor.edx_video_id,
+            'fallback_video_url': fallback_video_url,
+            'transcript_languages': video_descriptor.available_translations(transcripts_info, verify_assets=False),
+            'language': video_descriptor.get_default_transcript_language(transcripts_info),
+        }
@@ -10,6 +10,9 @@ from functools import partial
 
 from django.http import Http404, HttpResponse
 from mobile_api.models import MobileApiConfig
+from courseware.access import has_access
+from lms.djangoapps.course_blocks.api import get_course_blocks, COURSE_BLOCK_ACCESS_TRANSFORMERS
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
 
 from rest_framework import generics
 from rest_framework.response import Response
@@ -20,6 +23,7 @@ from xmodule.modulestore.django import modulestore
 
 from ..utils import mobile_view, mobile_course_access
 from .serializers import BlockOutline, video_summary
+from .transformers import VideoOutlineTransformer
 
 
 @mobile_view()
@@ -74,13 +78,26 @@ class VideoSummaryList(generics.ListAPIView):
               Management System.
     """
 
-    @mobile_course_access(depth=None)
+    @mobile_course_access()
     def list(self, request, course, *args, **kwargs):
         video_profiles = MobileApiConfig.get_video_profiles()
+        if has_access(request.user, 'staff', course):
+            # Staff see the content of all groups, except for split tests
+            transformers = [
+                transformer for transformer in COURSE_BLOCK_ACCESS_TRANSFORMERS
+                if not isinstance(transformer, UserPartitionTransformer)
+            ] + [VideoOutlineTransformer(enforce_split_tests=True)]
+        else:
+            transformers = COURSE_BLOCK_ACCESS_TRANSFORMERS + [VideoOutlineTransformer()]
+        blocks = get_course_blocks(
+            request.user,
+            modulestore().make_course_usage_key(course.id),
+            transformers=transformers,
+        )
         video_outline = list(
             BlockOutline(
                 course.id,
-                course,
+                blocks,
                 {"video": partial(video_summary, video_profiles)},
                 request,
                 video_profiles,
@@ -4,6 +4,7 @@ import logging
 from elasticsearch.exceptions import ConnectionError
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import translation
@@ -14,7 +15,11 @@ from request_cache import get_request_or_stub
 
 from .errors import ElasticSearchConnectionError
 from lms.djangoapps.teams.models import CourseTeam
-from .serializers import CourseTeamSerializer
+from .serializers import CourseTeamSerializerWithoutMembership
+
+# How long to wait before indexing a saved team, so that the saves of a team
+# made meanwhile are indexed at once.
+INDEX_DELAY_SECONDS = 5
 
 
 def if_search_enabled(f):
@@ -43,9 +48,10 @@ class CourseTeamIndexer(object):
 
     def data(self):
         """
-        Uses the CourseTeamSerializer to create a serialized course_team object.
+        Uses the CourseTeamSerializerWithoutMembership to create a serialized
+        course_team object, as the membership relations aren't saved in
+        elasticsearch.
         Adds in additional text and pk fields.
-        Removes membership relation.
 
         Returns serialized object with additional search fields.
         """
@@ -56,12 +62,10 @@ class CourseTeamIndexer(object):
             "request": get_request_or_stub()
         }
 
-        serialized_course_team = CourseTeamSerializer(self.course_team, context=context).data
+        serialized_course_team = CourseTeamSerializerWithoutMembership(self.course_team, context=context).data
 
         # Save the primary key so we can load the full objects easily after we search
         serialized_course_team['pk'] = self.course_team.pk
-        # Don't save the membership relations in elasticsearch
-        serialized_course_team.pop('membership', None)
 
         # add generally searchable content
         serialized_course_team['content'] = {
@@ -99,9 +103,46 @@ class CourseTeamIndexer(object):
         """
         Update index with course_team object (if feature is enabled).
         """
+        cls.index_many([course_team])
+
+    @classmethod
+    @if_search_enabled
+    def index_many(cls, course_teams):
+        """
+        Update index with several course_team objects at once (if feature is enabled).
+        """
         search_engine = cls.engine()
-        serialized_course_team = CourseTeamIndexer(course_team).data()
-        search_engine.index(cls.DOCUMENT_TYPE_NAME, [serialized_course_team])
+        serialized_course_teams = [CourseTeamIndexer(course_team).data() for course_team in course_teams]
+        if serialized_course_teams:
+            search_engine.index(cls.DOCUMENT_TYPE_NAME, serialized_course_teams)
+
+    @classmethod
+    @if_search_enabled
+    def index_later(cls, course_team):
+        """
+        Schedule the indexing of course_team (if feature is enabled).
+
+        The team is indexed as it is in the database after INDEX_DELAY_SECONDS,
+        so it's scheduled only once for all its saves meanwhile.
+        """
+        # avoid circular import problems
+        from .tasks import index_course_teams
+        if cache.add(cls._scheduled_cache_key(course_team.pk), True, INDEX_DELAY_SECONDS * 2):
+            index_course_teams.apply_async(args=[[course_team.pk]], countdown=INDEX_DELAY_SECONDS)
+
+    @classmethod
+    def unschedule(cls, course_team_pks):
+        """
+        Mark the indexing of the course teams as started, so that their next save schedules it again.
+        """
+        cache.delete_many([cls._scheduled_cache_key(pk) for pk in course_team_pks])
+
+    @staticmethod
+    def _scheduled_cache_key(course_team_pk):
+        """
+        Return the cache key marking the indexing of the course team as scheduled.
+        """
+        return u'teams.course_team_index_scheduled.{}'.format(course_team_pk)
 
     @classmethod
     @if_search_enabled
@@ -134,12 +175,12 @@ class CourseTeamIndexer(object):
 @receiver(post_save, sender=CourseTeam, dispatch_uid='teams.signals.course_team_post_save_callback')
 def course_team_post_save_callback(**kwargs):
     """
-    Reindex object after save.
+    Schedule the reindexing of the object after save.
     """
-    try:
-        CourseTeamIndexer.index(kwargs['instance'])
-    except ElasticSearchConnectionError:
-        pass
+    instance = kwargs['instance']
+    # team_size isn't indexed
+    if kwargs.get('created') or set(instance.field_tracker.changed()) - {'team_size'}:
+        CourseTeamIndexer.index_later(instance)
 
 
 @receiver(post_delete, sender=CourseTeam, dispatch_uid='teams.signals.course_team_post_delete_callback')
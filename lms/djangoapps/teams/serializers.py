@@ -1,7 +1,8 @@
 """Defines serializers used by the Team API."""
 from copy import deepcopy
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.db.models import Count, Manager
+from django.db.models.query import prefetch_related_objects
 from django.conf import settings
 
 from django_countries import countries
@@ -9,7 +10,7 @@ from rest_framework import serializers
 
 from openedx.core.lib.api.serializers import CollapsedReferenceSerializer
 from openedx.core.lib.api.fields import ExpandableField
-from openedx.core.djangoapps.user_api.accounts.serializers import UserReadOnlySerializer
+from openedx.core.djangoapps.user_api.accounts.serializers import UserReadOnlySerializer, user_prefetch_lookups
 
 from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
 
@@ -42,6 +43,27 @@ class CountryField(serializers.Field):
         return data
 
 
+class PrefetchingListSerializer(serializers.ListSerializer):  # pylint: disable=abstract-method
+    """
+    List serializer which loads the related objects read by its child
+    serializer for all the instances at once, so that serializing a page
+    takes the same number of queries whatever its size.
+
+    The child serializer returns the lookups to prefetch from get_prefetch_lookups().
+    """
+
+    def to_representation(self, data):
+        """Prefetches the related objects of the instances, then serializes them."""
+        instances = list(data.all() if isinstance(data, Manager) else data)
+        prefetch_related_objects(instances, self.child.get_prefetch_lookups())
+        return super(PrefetchingListSerializer, self).to_representation(instances)
+
+
+def _is_expanded(serializer, field_name):
+    """Returns whether the ExpandableField `field_name` is expanded in the context of the serializer."""
+    return field_name in serializer.context.get('expand', [])
+
+
 class UserMembershipSerializer(serializers.ModelSerializer):
     """Serializes CourseTeamMemberships with only user and date_joined
 
@@ -89,6 +111,14 @@ class CourseTeamSerializer(serializers.ModelSerializer):
             "membership",
         )
         read_only_fields = ("course_id", "date_created", "discussion_topic_id", "last_activity_at")
+        list_serializer_class = PrefetchingListSerializer
+
+    def get_prefetch_lookups(self):
+        """Returns the lookups of the memberships and their users, to prefetch when serializing many teams."""
+        lookups = ['membership__user']
+        if _is_expanded(self, 'user'):
+            lookups.extend(user_prefetch_lookups('membership__user'))
+        return lookups
 
 
 class CourseTeamCreationSerializer(serializers.ModelSerializer):
@@ -131,6 +161,10 @@ class CourseTeamSerializerWithoutMembership(CourseTeamSerializer):
         super(CourseTeamSerializerWithoutMembership, self).__init__(*args, **kwargs)
         del self.fields['membership']
 
+    def get_prefetch_lookups(self):
+        """The teams are serialized without related objects."""
+        return []
+
 
 class MembershipSerializer(serializers.ModelSerializer):
     """Serializes CourseTeamMemberships with information about both teams and users."""
@@ -161,6 +195,14 @@ class MembershipSerializer(serializers.ModelSerializer):
         model = CourseTeamMembership
         fields = ("user", "team", "date_joined", "last_activity_at")
         read_only_fields = ("date_joined", "last_activity_at")
+        list_serializer_class = PrefetchingListSerializer
+
+    def get_prefetch_lookups(self):
+        """Returns the lookups of the users and teams, to prefetch when serializing many memberships."""
+        lookups = ['user', 'team']
+        if _is_expanded(self, 'user'):
+            lookups.extend(user_prefetch_lookups('user'))
+        return lookups
 
 
 class BaseTopicSerializer(serializers.Serializer):
@@ -0,0 +1,26 @@
+"""
+Asynchronous tasks for the teams app.
+"""
+import logging
+
+from lms import CELERY_APP
+
+from lms.djangoapps.teams.models import CourseTeam
+from .errors import ElasticSearchConnectionError
+from .search_indexes import CourseTeamIndexer
+
+log = logging.getLogger(__name__)
+
+
+@CELERY_APP.task
+def index_course_teams(course_team_pks):
+    """
+    Index the course teams as they are in the database, in a single request to elasticsearch.
+
+    The teams deleted since they were scheduled are skipped.
+    """
+    CourseTeamIndexer.unschedule(course_team_pks)
+    try:
+        CourseTeamIndexer.index_many(CourseTeam.objects.filter(pk__in=course_team_pks))
+    except ElasticSearchConnectionError:
+        log.warning(u"Could not index the course teams %s", course_team_pks)
@@ -9,12 +9,15 @@ from student.tests.factories import CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
 from lms.djangoapps.teams.serializers import (
     BulkTeamCountTopicSerializer,
+    CourseTeamSerializer,
     TopicSerializer,
     MembershipSerializer,
 )
+from openedx.core.djangoapps.user_api.preferences.api import set_user_preference
 
 
 class SerializerTestCase(SharedModuleStoreTestCase):
@@ -71,6 +74,59 @@ class MembershipSerializerTestCase(SerializerTestCase):
         self.assertNotIn('membership', data['team'])
 
 
+class PrefetchingSerializerTestCase(SerializerTestCase):
+    """
+    Tests that many teams and memberships are serialized in constant queries.
+    """
+
+    def setUp(self):
+        super(PrefetchingSerializerTestCase, self).setUp()
+        self.add_team()
+
+    def add_team(self):
+        """Creates a team with two members, one of them sharing their profile."""
+        team = CourseTeamFactory.create(course_id=self.course.id, topic_id=self.course.teams_topics[0]['id'])
+        for __ in xrange(2):
+            user = UserFactory.create()
+            CourseEnrollmentFactory.create(user=user, course_id=self.course.id)
+            CourseTeamMembershipFactory.create(team=team, user=user)
+        user.profile.year_of_birth = 1970
+        user.profile.save()
+        set_user_preference(user, 'account_privacy', 'all_users')
+
+    def assert_constant_queries(self, serializer_cls, model, expand, num_queries):
+        """
+        Verify that serializing all the instances of the model makes
+        num_queries SQL queries, whatever the number of instances.
+        """
+        context = {'expand': expand, 'request': RequestFactory().get('/api/team/v0/teams')}
+        for __ in xrange(2):
+            instances = list(model.objects.all())
+            with self.assertNumQueries(num_queries):
+                data = serializer_cls(instances, context=context, many=True).data
+            self.assertEqual(len(data), len(instances))
+            self.add_team()
+        return data
+
+    def test_teams(self):
+        self.assert_constant_queries(CourseTeamSerializer, CourseTeam, [], num_queries=2)
+
+    def test_teams_expand_user(self):
+        # memberships, users, profiles, language proficiencies and privacy preferences
+        data = self.assert_constant_queries(CourseTeamSerializer, CourseTeam, ['user'], num_queries=5)
+        self.assertEqual(
+            sorted(membership['user']['account_privacy'] for membership in data[0]['membership']),
+            ['all_users', 'private']
+        )
+
+    def test_memberships(self):
+        self.assert_constant_queries(MembershipSerializer, CourseTeamMembership, [], num_queries=2)
+
+    def test_memberships_expand_user_and_team(self):
+        # users, teams, profiles, language proficiencies and privacy preferences
+        self.assert_constant_queries(MembershipSerializer, CourseTeamMembership, ['user', 'team'], num_queries=5)
+
+
 class TopicSerializerTestCase(SerializerTestCase):
     """
     Tests for the `TopicSerializer`, which should serialize team count data for
@@ -609,6 +609,15 @@ if FEATURES.get('ENABLE_OAUTH2_PROVIDER'):
     OAUTH_ENFORCE_SECURE = ENV_TOKENS.get('OAUTH_ENFORCE_SECURE', True)
     OAUTH_ENFORCE_CLIENT_SECURE = ENV_TOKENS.get('OAUTH_ENFORCE_CLIENT_SECURE', True)
 
+##### Class dashboard (Metrics tab) ##############
+if FEATURES.get('CLASS_DASHBOARD'):
+    INSTALLED_APPS += ('class_dashboard',)
+if FEATURES.get('CLASS_DASHBOARD') and ENV_TOKENS.get('CLASS_DASHBOARD_RECONCILE_PERIOD_HOURS', 24) is not None:
+    CELERYBEAT_SCHEDULE['reconcile-class-dashboard-aggregates'] = {
+        'task': 'class_dashboard.reconcile_aggregates',
+        'schedule': datetime.timedelta(hours=ENV_TOKENS.get('CLASS_DASHBOARD_RECONCILE_PERIOD_HOURS', 24)),
+    }
+
 ##### ADVANCED_SECURITY_CONFIG #####
 ADVANCED_SECURITY_CONFIG = ENV_TOKENS.get('ADVANCED_SECURITY_CONFIG', {})
 
@@ -58,6 +58,8 @@ ENABLE_JASMINE = False
 
 DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
+    # Whether the discussion API may send independent comments service requests concurrently
+    'CONCURRENT_COMMENTS_SERVICE_REQUESTS': True,
 }
 
 
@@ -92,6 +92,10 @@ CACHES = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'edx_course_structure_mem_cache',
     },
+    'definition_cache': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edx_definition_mem_cache',
+    },
     'lms.course_blocks': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'KEY_FUNCTION': 'util.memcache.safe_key',
@@ -282,6 +286,7 @@ FEATURES['ENABLE_SHOPPING_CART'] = True
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = True
+INSTALLED_APPS += ('class_dashboard',)
 
 ### This settings is for the course registration code length ############
 REGISTRATION_CODE_LENGTH = 8
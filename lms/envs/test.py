@@ -58,6 +58,10 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Most discussion API tests assert on the order of the comments service requests
+# (RetrieveThreadTest makes them concurrently, as in production)
+DISCUSSION_SETTINGS['CONCURRENT_COMMENTS_SERVICE_REQUESTS'] = False
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_HINTER_INSTRUCTOR_VIEW'] = True
@@ -419,6 +423,7 @@ PASSWORD_HASHERS = (
 
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = True
+INSTALLED_APPS += ('class_dashboard',)
 
 ################### Make tests quieter
 
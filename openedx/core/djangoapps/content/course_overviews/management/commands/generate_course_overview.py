@@ -10,6 +10,7 @@ from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.content.course_overviews.tasks import enqueue_async_course_overview_update_tasks
 
 
 log = logging.getLogger(__name__)
@@ -20,6 +21,8 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_overview --all --settings=devstack
         $ ./manage.py lms generate_course_overview 'edX/DemoX/Demo_Course' --settings=devstack
+        $ ./manage.py lms generate_course_overview --all --force-update --workers=8 --settings=devstack
+        $ ./manage.py lms generate_course_overview --all --enqueue-tasks --chunk-size=100 --settings=devstack
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course overview for one or more courses.'
@@ -35,6 +38,34 @@ class Command(BaseCommand):
             default=False,
             help='Generate course overview for all courses.',
         )
+        parser.add_argument(
+            '--force-update',
+            action='store_true',
+            dest='force_update',
+            default=False,
+            help='Rebuild course overviews even if they are already cached.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            dest='workers',
+            default=1,
+            help='Number of worker processes to generate the course overviews with.',
+        )
+        parser.add_argument(
+            '--enqueue-tasks',
+            action='store_true',
+            dest='enqueue_tasks',
+            default=False,
+            help='Enqueue celery tasks to generate the course overviews instead of generating them in this process.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=50,
+            help='Maximum number of courses per enqueued celery task.',
+        )
 
     def handle(self, *args, **options):
 
@@ -52,4 +83,16 @@ class Command(BaseCommand):
             if not course_keys:
                 log.fatal('No courses specified.')
 
-        CourseOverview.get_select_courses(course_keys)
+        if options.get('enqueue_tasks'):
+            enqueue_async_course_overview_update_tasks(
+                course_keys,
+                force_update=options.get('force_update', False),
+                chunk_size=options.get('chunk_size', 50),
+            )
+            return
+
+        CourseOverview.refresh_select_courses(
+            course_keys,
+            force_update=options.get('force_update', False),
+            workers=options.get('workers', 1),
+        )
@@ -78,3 +78,27 @@ class TestGenerateCourseOverview(ModuleStoreTestCase):
         """
         with self.assertRaises(CommandError):
             self.command.handle(all=False)
+
+    def test_force_update(self):
+        """
+        Test that existing course overviews are rebuilt when forced.
+        """
+        self.command.handle(unicode(self.course_key_1), all=False)
+        overview = CourseOverview.get_from_id(self.course_key_1)
+        overview.display_name = u'stale name'
+        overview.save()
+
+        self.command.handle(unicode(self.course_key_1), all=False)
+        self.assertEqual(CourseOverview.get_from_id(self.course_key_1).display_name, u'stale name')
+
+        self.command.handle(unicode(self.course_key_1), all=False, force_update=True)
+        self.assertNotEqual(CourseOverview.get_from_id(self.course_key_1).display_name, u'stale name')
+
+    @patch('openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update')
+    def test_enqueue_tasks(self, mock_update_task):
+        """
+        Test that courses are split into chunks of celery tasks.
+        """
+        self.command.handle(all=True, enqueue_tasks=True, chunk_size=1)
+        self.assertEqual(mock_update_task.apply_async.call_count, 2)
+        self._assert_courses_not_in_overview(self.course_key_1, self.course_key_2)
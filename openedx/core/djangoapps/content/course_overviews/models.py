@@ -3,8 +3,13 @@ Declaration of CourseOverview model
 """
 import json
 import logging
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing import Pool
 
-from django.db import models, transaction
+from django.core.cache import cache
+from django.db import connections, models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
 from django.template import defaultfilters
@@ -27,6 +32,13 @@ from ccx_keys.locator import CCXLocator
 log = logging.getLogger(__name__)
 
 
+# Result of (re)building the overview of a single course.
+#   course_key (unicode): serialized key of the course
+#   build_time (float): wall clock seconds spent building the overview
+#   error (unicode or None): error message, if the overview couldn't be built
+CourseOverviewBuildResult = namedtuple('CourseOverviewBuildResult', ['course_key', 'build_time', 'error'])
+
+
 class CourseOverview(TimeStampedModel):
     """
     Model for storing and caching basic information about a course.
@@ -45,6 +57,12 @@ class CourseOverview(TimeStampedModel):
     # IMPORTANT: Bump this whenever you modify this model and/or add a migration.
     VERSION = 3
 
+    # Single-flight protection of overview builds, in seconds.
+    BUILD_LOCK_TIMEOUT = 60
+    BUILD_WAIT_TIMEOUT = 10
+    BUILD_WAIT_MIN_INTERVAL = 0.05
+    BUILD_WAIT_MAX_INTERVAL = 1
+
     # Cache entry versioning.
     version = IntegerField()
 
@@ -189,8 +207,61 @@ class CourseOverview(TimeStampedModel):
         Load a CourseDescriptor, create a new CourseOverview from it, cache the
         overview, and return it.
 
+        Builds of the same overview are single-flighted across processes: if
+        another process is already building the overview for course_id, wait
+        for it to finish (up to BUILD_WAIT_TIMEOUT seconds) and return its
+        result instead of loading the course a second time.
+
+        Arguments:
+            course_id (CourseKey): the ID of the course overview to be loaded.
+
+        Returns:
+            CourseOverview: overview of the requested course.
+
+        Raises:
+            - CourseOverview.DoesNotExist if the course specified by course_id
+                was not found.
+            - IOError if some other error occurs while trying to load the
+                course from the module store.
+        """
+        with cls._build_lock(course_id) as acquired:
+            if not acquired:
+                course_overview = cls._wait_for_concurrent_build(course_id)
+                if course_overview is not None:
+                    return course_overview
+            return cls._load_from_module_store(course_id)
+
+    @classmethod
+    def update_from_module_store(cls, course_id):
+        """
+        Rebuild the CourseOverview for course_id from the module store and
+        atomically replace any existing cached overview with it.
+
+        Unlike deleting the overview and letting the next request rebuild it,
+        there is no window during which requests see a cache miss.
+
+        Arguments:
+            course_id (CourseKey): the ID of the course overview to be updated.
+
+        Returns:
+            CourseOverview: the newly built overview of the course.
+
+        Raises:
+            Same as load_from_module_store.
+        """
+        with cls._build_lock(course_id):
+            return cls._load_from_module_store(course_id, replace_existing=True)
+
+    @classmethod
+    def _load_from_module_store(cls, course_id, replace_existing=False):
+        """
+        Load a CourseDescriptor, create a new CourseOverview from it, cache the
+        overview, and return it, without any single-flight protection.
+
         Arguments:
             course_id (CourseKey): the ID of the course overview to be loaded.
+            replace_existing (bool): whether to delete any existing overview of
+                the course in the same transaction as saving the new one.
 
         Returns:
             CourseOverview: overview of the requested course.
@@ -208,6 +279,8 @@ class CourseOverview(TimeStampedModel):
                 course_overview = cls._create_from_course(course)
                 try:
                     with transaction.atomic():
+                        if replace_existing:
+                            cls.objects.filter(id=course_id).delete()
                         course_overview.save()
                         CourseOverviewTab.objects.bulk_create([
                             CourseOverviewTab(tab_id=tab.tab_id, course_overview=course_overview)
@@ -233,6 +306,63 @@ class CourseOverview(TimeStampedModel):
             else:
                 raise cls.DoesNotExist()
 
+    @classmethod
+    def _build_lock_key(cls, course_id):
+        """
+        Cache key of the lock for building the overview of course_id.
+        """
+        return u'course_overview.build_lock.{}'.format(course_id)
+
+    @classmethod
+    @contextmanager
+    def _build_lock(cls, course_id):
+        """
+        Context manager that tries to take the cross-process lock for building
+        the overview of course_id, and yields whether it was acquired.
+
+        The lock is taken with cache.add, which is atomic in memcached, and
+        expires after BUILD_LOCK_TIMEOUT seconds in case its holder dies.
+        """
+        key = cls._build_lock_key(course_id)
+        acquired = cache.add(key, 'true', cls.BUILD_LOCK_TIMEOUT)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                cache.delete(key)
+
+    @classmethod
+    def _wait_for_concurrent_build(cls, course_id):
+        """
+        Wait for another process to finish building the overview of course_id,
+        polling its build lock with exponential backoff (from
+        BUILD_WAIT_MIN_INTERVAL up to BUILD_WAIT_MAX_INTERVAL seconds), then
+        read the overview it built.
+
+        Returns:
+            CourseOverview, or None if the other process didn't leave an
+            up-to-date overview behind, or didn't release the lock within
+            BUILD_WAIT_TIMEOUT seconds.
+        """
+        lock_key = cls._build_lock_key(course_id)
+        deadline = time.time() + cls.BUILD_WAIT_TIMEOUT
+        interval = cls.BUILD_WAIT_MIN_INTERVAL
+        while cache.get(lock_key) is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                log.warning(
+                    'Timed out waiting for a concurrent build of the course overview for %s.', unicode(course_id)
+                )
+                return None
+            time.sleep(min(interval, remaining))
+            interval = min(2 * interval, cls.BUILD_WAIT_MAX_INTERVAL)
+
+        try:
+            course_overview = cls.objects.get(id=course_id)
+        except cls.DoesNotExist:
+            return None
+        return course_overview if course_overview.version >= cls.VERSION else None
+
     @classmethod
     def get_from_id(cls, course_id):
         """
@@ -446,6 +576,61 @@ class CourseOverview(TimeStampedModel):
 
         return course_overviews
 
+    @classmethod
+    def refresh_select_courses(cls, course_keys, force_update=False, workers=1):
+        """
+        (Re)generates the CourseOverview objects for the given course_keys,
+        optionally building them concurrently in a pool of worker processes.
+
+        Arguments:
+            course_keys (list[CourseKey]): the courses to generate overviews for.
+            force_update (bool): if True, rebuild and replace the overviews even
+                if an up-to-date one is already cached; otherwise only missing
+                or outdated overviews are built.
+            workers (int): number of worker processes. With 1, the overviews
+                are generated in the current process.
+
+        Returns:
+            list[CourseOverviewBuildResult]: per-course build timings and errors,
+                in the order of course_keys.
+        """
+        course_key_strings = [unicode(course_key) for course_key in course_keys]
+        log.info(
+            'Refreshing course overview for %d courses with %d worker(s).', len(course_key_strings), workers
+        )
+
+        start_time = time.time()
+        if workers > 1 and len(course_key_strings) > 1:
+            # Database connections must not be shared with the forked workers.
+            for connection in connections.all():
+                connection.close()
+            pool = Pool(processes=workers, initializer=_init_course_overview_worker)
+            try:
+                results = pool.map(
+                    _refresh_course_overview, [(key, force_update) for key in course_key_strings], chunksize=1
+                )
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [_refresh_course_overview((key, force_update)) for key in course_key_strings]
+
+        for result in results:
+            if result.error:
+                log.error(
+                    'Failed to generate course overview for %s after %.3fs: %s',
+                    result.course_key, result.build_time, result.error,
+                )
+            else:
+                log.info('Generated course overview for %s in %.3fs.', result.course_key, result.build_time)
+        log.info(
+            'Finished refreshing course overviews in %.3fs: %d succeeded, %d failed.',
+            time.time() - start_time,
+            sum(1 for result in results if not result.error),
+            sum(1 for result in results if result.error),
+        )
+        return results
+
     @classmethod
     def get_all_courses(cls, org=None):
         """
@@ -485,6 +670,48 @@ class CourseOverview(TimeStampedModel):
         return False
 
 
+def _init_course_overview_worker():
+    """
+    Initializer of the course overview worker processes: make sure that
+    connections inherited from the parent process are never reused.
+    """
+    from xmodule.modulestore.django import clear_existing_modulestores
+    clear_existing_modulestores()
+    for connection in connections.all():
+        connection.close()
+
+
+def _refresh_course_overview(args):
+    """
+    Generates the overview for a single course, timing the build.
+
+    Module-level so that it can be dispatched to worker processes.
+
+    Arguments:
+        args (tuple): serialized course key and the force_update flag.
+
+    Returns:
+        CourseOverviewBuildResult
+    """
+    course_key_string, force_update = args
+    course_key = CourseKey.from_string(course_key_string)
+    start_time = time.time()
+    error = None
+    try:
+        if force_update:
+            CourseOverview.update_from_module_store(course_key)
+        else:
+            CourseOverview.get_from_id(course_key)
+    except Exception as ex:  # pylint: disable=broad-except
+        log.exception(
+            'An error occurred while generating course overview for %s: %s',
+            course_key_string,
+            ex.message,
+        )
+        error = unicode(ex.message or repr(ex))
+    return CourseOverviewBuildResult(course_key_string, time.time() - start_time, error)
+
+
 class CourseOverviewTab(models.Model):
     """
     Model for storing and caching tabs information of a course.
@@ -13,8 +13,14 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     Catches the signal that a course has been published in Studio and
     updates the corresponding CourseOverview cache entry.
     """
-    CourseOverview.objects.filter(id=course_key).delete()
-    CourseOverview.load_from_module_store(course_key)
+    # Import tasks here to avoid a circular import.
+    from .tasks import async_course_overview_update
+
+    # The cached overview is replaced in place rather than deleted first, so
+    # that requests for the course don't all miss and rebuild it at once.
+    async_course_overview_update.apply_async(
+        [unicode(course_key)], kwargs={'force_update': True}
+    )
 
 
 @receiver(SignalHandler.course_deleted)
@@ -0,0 +1,51 @@
+"""
+Asynchronous tasks related to the Course Overviews sub-application
+"""
+import logging
+
+from celery.task import task
+from opaque_keys.edx.keys import CourseKey
+
+from .models import CourseOverview
+
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.async_course_overview_update')
+def async_course_overview_update(*course_ids, **kwargs):
+    """
+    Regenerates the CourseOverviews of the specified courses.
+
+    Callers should pass the course keys as Unicode strings, since
+    CourseLocators are not JSON-serializable for Celery.
+
+    Keyword Arguments:
+        force_update (bool): rebuild overviews that are already cached.
+        workers (int): number of worker processes to build them with.
+    """
+    course_keys = [CourseKey.from_string(course_id) for course_id in course_ids]
+    CourseOverview.refresh_select_courses(
+        course_keys,
+        force_update=kwargs.get('force_update', False),
+        workers=kwargs.get('workers', 1),
+    )
+
+
+def enqueue_async_course_overview_update_tasks(course_ids, force_update=False, chunk_size=50):
+    """
+    Splits the given courses into chunks and enqueues one
+    async_course_overview_update task per chunk, so that the overviews are
+    rebuilt concurrently by the Celery workers.
+
+    Arguments:
+        course_ids (list[CourseKey]): courses to regenerate overviews for.
+        force_update (bool): rebuild overviews that are already cached.
+        chunk_size (int): maximum number of courses per task.
+    """
+    course_id_strings = [unicode(course_id) for course_id in course_ids]
+    for index in range(0, len(course_id_strings), chunk_size):
+        async_course_overview_update.apply_async(
+            course_id_strings[index:index + chunk_size],
+            kwargs={'force_update': force_update},
+        )
@@ -9,6 +9,7 @@ import mock
 import pytz
 
 from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
 
 from lms.djangoapps.certificates.api import get_active_web_certificate
 from openedx.core.djangoapps.models.course_details import CourseDetails
@@ -25,7 +26,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
-from .models import CourseOverview
+from .models import CourseOverview, CourseOverviewTab
 
 
 @ddt.ddt
@@ -449,6 +450,87 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             set(select_course_ids),
         )
 
+    def test_refresh_select_courses(self):
+        course_ids = [CourseFactory.create().id for __ in range(2)]
+        results = CourseOverview.refresh_select_courses(course_ids + [CourseKey.from_string('fake/course/id')])
+        self.assertEqual([result.course_key for result in results[:2]], [unicode(key) for key in course_ids])
+        self.assertTrue(all(result.error is None and result.build_time >= 0 for result in results[:2]))
+        self.assertIsNotNone(results[2].error)
+        self._assert_overviews_exist(course_ids)
+
+    def test_update_from_module_store(self):
+        course = CourseFactory.create()
+        stale_overview = CourseOverview.get_from_id(course.id)
+        stale_overview.display_name = u'Stale Name'
+        stale_overview.save()
+
+        # The cached overview is replaced, along with its tabs.
+        self.assertEqual(CourseOverview.update_from_module_store(course.id).display_name, course.display_name)
+        self.assertEqual(CourseOverview.objects.filter(id=course.id).count(), 1)
+        self.assertEqual(CourseOverview.get_from_id(course.id).display_name, course.display_name)
+        self.assertEqual(
+            CourseOverviewTab.objects.filter(course_overview__id=course.id).count(), len(course.tabs)
+        )
+
+    def test_single_flight_build(self):
+        course = CourseFactory.create()
+        existing_overview = CourseOverview.get_from_id(course.id)
+
+        # While another process holds the build lock, wait for it to be
+        # released, then return the overview it built instead of loading the
+        # course again.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.cache.add', return_value=False
+        ):
+            with mock.patch(
+                'openedx.core.djangoapps.content.course_overviews.models.cache.get', side_effect=['true', 'true', None]
+            ):
+                with mock.patch(
+                    'openedx.core.djangoapps.content.course_overviews.models.time.sleep'
+                ) as mock_sleep:
+                    with mock.patch.object(CourseOverview, '_load_from_module_store') as mock_load:
+                        with self.assertNumQueries(1):
+                            self.assertEqual(CourseOverview.load_from_module_store(course.id), existing_overview)
+                        self.assertFalse(mock_load.called)
+        # backing off
+        self.assertEqual(
+            [args[0] for args, __ in mock_sleep.call_args_list],
+            [CourseOverview.BUILD_WAIT_MIN_INTERVAL, 2 * CourseOverview.BUILD_WAIT_MIN_INTERVAL]
+        )
+
+    def test_single_flight_build_released_lock(self):
+        course = CourseFactory.create()
+
+        # If the other process releases the build lock without leaving an
+        # overview behind, build it right away.
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.models.cache.add', return_value=False
+        ):
+            with mock.patch(
+                'openedx.core.djangoapps.content.course_overviews.models.time.sleep'
+            ) as mock_sleep:
+                self.assertEqual(CourseOverview.load_from_module_store(course.id).id, course.id)
+                self.assertFalse(mock_sleep.called)
+
+    def test_single_flight_build_timeout(self):
+        course = CourseFactory.create()
+
+        # If the other process holds the build lock for too long, build the
+        # overview inline.
+        with CourseOverview._build_lock(course.id) as acquired:  # pylint: disable=protected-access
+            self.assertTrue(acquired)
+            with mock.patch.object(CourseOverview, 'BUILD_WAIT_TIMEOUT', 0):
+                self.assertEqual(CourseOverview.load_from_module_store(course.id).id, course.id)
+
+    def _assert_overviews_exist(self, course_ids):
+        """
+        Asserts that overviews of the given courses are cached.
+        """
+        self.assertSetEqual(
+            set(CourseOverview.objects.filter(id__in=course_ids).values_list('id', flat=True)),
+            set(course_ids),
+        )
+
     def test_get_all_courses(self):
         course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
         self.assertSetEqual(
@@ -3,17 +3,25 @@ APIs for configuring credit eligibility requirements and tracking
 whether a user has satisfied those requirements.
 """
 
+from collections import defaultdict
+import datetime
 import logging
 
+from django.core.cache import cache
 from opaque_keys.edx.keys import CourseKey
+import pytz
 
 from openedx.core.djangoapps.credit.exceptions import InvalidCreditRequirements, InvalidCreditCourse
 from openedx.core.djangoapps.credit.email_utils import send_credit_notifications
 from openedx.core.djangoapps.credit.models import (
+    CREDIT_SUMMARY_CACHE_TIMEOUT,
     CreditCourse,
     CreditRequirement,
     CreditRequirementStatus,
     CreditEligibility,
+    bump_credit_summary_version,
+    credit_summary_cache_key,
+    get_credit_summary_versions,
 )
 
 # TODO: Cleanup this mess! ECOM-2908
@@ -92,6 +100,9 @@ def set_credit_requirements(course_key, requirements):
     for order, requirement in enumerate(requirements):
         CreditRequirement.add_or_update_course_requirement(credit_course, requirement, order)
 
+    # The requirements may have been disabled without a save
+    bump_credit_summary_version(course_key)
+
 
 def get_credit_requirements(course_key, namespace=None):
     """
@@ -402,6 +413,153 @@ def get_credit_requirement_status(course_key, username, namespace=None, name=Non
     return statuses
 
 
+# Credit requirement statuses for which the user does not remain eligible to get credit.
+NON_ELIGIBLE_STATUSES = ('failed', 'declined')
+
+
+def get_credit_summaries_for_user(username, course_keys):
+    """
+    Retrieve the credit eligibility and requirement statuses of a user in many courses.
+
+    Args:
+        username (str): The identifier of the user
+        course_keys (list of CourseKey): The identifiers of the courses
+
+    Returns:
+        dict of the credit summaries of the user, keyed by the keys of the credit courses among course_keys
+        (see _get_credit_summaries)
+    """
+    summaries = _get_credit_summaries([(username, course_key) for course_key in course_keys])
+    return {course_key: summary for (__, course_key), summary in summaries.iteritems()}
+
+
+def get_credit_summaries_for_course(course_key, usernames):
+    """
+    Retrieve the credit eligibility and requirement statuses of many users in a course.
+
+    Args:
+        course_key (CourseKey): The identifier of the course
+        usernames (list of str): The identifiers of the users
+
+    Returns:
+        dict of the credit summaries of the users in the course, keyed by username, or an empty dict if the course
+        isn't a credit course (see _get_credit_summaries)
+    """
+    summaries = _get_credit_summaries([(username, course_key) for username in usernames])
+    return {username: summary for (username, __), summary in summaries.iteritems()}
+
+
+def _get_credit_summaries(users_courses):
+    """
+    Returns the credit summaries of the (username, course_key) pairs in credit courses, keyed by pair. Each summary
+    is a dict with:
+
+        eligibility_status: "eligible" if the user has been marked as eligible for credit, "not_eligible" if the user
+            failed any requirement, and "partial_eligible" otherwise
+        requirements: the user's status of each requirement of the course, as returned by
+            get_credit_requirement_status
+
+    The summaries are cached until the user's statuses or eligibility, or the requirements of the course, change;
+    the missing ones are computed together with one query per model.
+    """
+    users_courses = [
+        (username, course_key) for username, course_key in users_courses
+        if CreditCourse.is_credit_course(course_key)
+    ]
+    if not users_courses:
+        return {}
+
+    versions = get_credit_summary_versions(set(course_key for __, course_key in users_courses))
+    cache_keys = {
+        user_course: credit_summary_cache_key(user_course[0], user_course[1], versions[user_course[1]])
+        for user_course in users_courses
+    }
+    cached = cache.get_many(cache_keys.values())
+    records = {
+        user_course: cached[cache_key]
+        for user_course, cache_key in cache_keys.iteritems() if cache_key in cached
+    }
+
+    missing = [user_course for user_course in users_courses if user_course not in records]
+    if missing:
+        computed = _compute_credit_summary_records(missing)
+        cache.set_many(
+            {cache_keys[user_course]: record for user_course, record in computed.iteritems()},
+            CREDIT_SUMMARY_CACHE_TIMEOUT
+        )
+        records.update(computed)
+
+    now = datetime.datetime.now(pytz.UTC)
+    summaries = {}
+    for user_course, record in records.iteritems():
+        # Eligibilities expire, so the deadline is checked on each read.
+        if record["eligibility_deadline"] is not None and record["eligibility_deadline"] > now:
+            eligibility_status = "eligible"
+        elif any(requirement["status"] in NON_ELIGIBLE_STATUSES for requirement in record["requirements"]):
+            eligibility_status = "not_eligible"
+        else:
+            eligibility_status = "partial_eligible"
+        summaries[user_course] = {
+            "eligibility_status": eligibility_status,
+            "requirements": record["requirements"],
+        }
+    return summaries
+
+
+def _compute_credit_summary_records(users_courses):
+    """
+    Returns the cached part of the credit summaries of the (username, course_key) pairs, keyed by pair: their
+    requirements (see get_credit_requirement_status) and the deadline of their eligibility, if any.
+    """
+    usernames = set(username for username, __ in users_courses)
+    course_keys = set(course_key for __, course_key in users_courses)
+
+    requirements_by_course = defaultdict(list)
+    for requirement in CreditRequirement.objects.filter(
+            course__course_key__in=course_keys, active=True
+    ).select_related('course'):
+        requirements_by_course[requirement.course.course_key].append(requirement)
+
+    statuses = {
+        (status.username, status.requirement_id): status
+        for status in CreditRequirementStatus.objects.filter(
+            username__in=usernames,
+            requirement__course__course_key__in=course_keys,
+            requirement__active=True,
+        )
+    }
+
+    eligibility_deadlines = {
+        (eligibility.username, eligibility.course.course_key): eligibility.deadline
+        for eligibility in CreditEligibility.objects.filter(
+            username__in=usernames,
+            course__course_key__in=course_keys,
+            course__enabled=True,
+        ).select_related('course')
+    }
+
+    records = {}
+    for username, course_key in users_courses:
+        requirements = []
+        for requirement in requirements_by_course[course_key]:
+            requirement_status = statuses.get((username, requirement.id))
+            requirements.append({
+                "namespace": requirement.namespace,
+                "name": requirement.name,
+                "display_name": requirement.display_name,
+                "criteria": requirement.criteria,
+                "reason": requirement_status.reason if requirement_status else None,
+                "status": requirement_status.status if requirement_status else None,
+                "status_date": requirement_status.modified if requirement_status else None,
+                "order": requirement.order,
+            })
+        records[(username, course_key)] = {
+            "requirements": requirements,
+            "eligibility_deadline": eligibility_deadlines.get((username, course_key)),
+        }
+    return records
+
+
 def _get_requirements_to_disable(old_requirements, new_requirements):
     """
     Get the ids of 'CreditRequirement' entries to be disabled that are
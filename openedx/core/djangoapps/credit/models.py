@@ -9,6 +9,7 @@ successful completion of a course on EdX
 import datetime
 from collections import defaultdict
 import logging
+import uuid
 
 import pytz
 
@@ -269,6 +270,63 @@ def invalidate_credit_courses_cache(sender, **kwargs):   # pylint: disable=unuse
     cache.delete(CreditCourse.CREDIT_COURSES_CACHE_KEY)
 
 
+# How long the credit summary of a user in a course (see api.get_credit_summaries_for_user) is cached.
+CREDIT_SUMMARY_CACHE_TIMEOUT = 60 * 60
+
+
+def _credit_summary_version_key(course_key):
+    """
+    Returns the cache key of the version of the credit summaries of the course.
+    """
+    return u"credit.summaries.version.{}".format(course_key)
+
+
+def get_credit_summary_versions(course_keys):
+    """
+    Returns the versions of the credit summaries of the courses by course key,
+    tokens which change whenever the requirements of the course change.
+    """
+    version_keys = {course_key: _credit_summary_version_key(course_key) for course_key in course_keys}
+    versions = cache.get_many(version_keys.values())
+    for course_key, version_key in version_keys.iteritems():
+        if version_key not in versions:
+            # Never set or evicted: start a new version, as the summaries
+            # cached under the old one may be out of date.
+            cache.add(version_key, uuid.uuid4().hex, None)
+            versions[version_key] = cache.get(version_key)
+    return {course_key: versions[version_key] for course_key, version_key in version_keys.iteritems()}
+
+
+def credit_summary_cache_key(username, course_key, version):
+    """
+    Returns the cache key of the credit summary of the user in the course, for the given version.
+    """
+    return u"credit.summary.{}.{}.{}".format(version, course_key, username)
+
+
+def bump_credit_summary_version(course_key):
+    """
+    Starts a new version of the credit summaries of the course, so that they
+    are computed again from the database.
+    """
+    cache.set(_credit_summary_version_key(course_key), uuid.uuid4().hex, None)
+
+
+def invalidate_credit_summary(username, course_key):
+    """
+    Drops the cached credit summary of the user in the course.
+    """
+    version = get_credit_summary_versions([course_key])[course_key]
+    cache.delete(credit_summary_cache_key(username, course_key, version))
+
+
+@receiver(models.signals.post_save, sender=CreditCourse)
+@receiver(models.signals.post_delete, sender=CreditCourse)
+def invalidate_course_credit_summaries(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the credit summaries of the course when it's enabled or disabled. """
+    bump_credit_summary_version(instance.course_key)
+
+
 class CreditRequirement(TimeStampedModel):
     """
     This model represents a credit requirement.
@@ -345,7 +403,9 @@ class CreditRequirement(TimeStampedModel):
 
         """
         # order credit requirements according to their appearance in courseware
-        requirements = CreditRequirement.objects.filter(course__course_key=course_key, active=True)
+        requirements = CreditRequirement.objects.filter(
+            course__course_key=course_key, active=True
+        ).select_related('course')
 
         if namespace is not None:
             requirements = requirements.filter(namespace=namespace)
@@ -390,6 +450,13 @@ class CreditRequirement(TimeStampedModel):
             return None
 
 
+@receiver(models.signals.post_save, sender=CreditRequirement)
+@receiver(models.signals.post_delete, sender=CreditRequirement)
+def invalidate_requirement_credit_summaries(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the credit summaries of the course of the requirement. """
+    bump_credit_summary_version(instance.course.course_key)
+
+
 class CreditRequirementStatus(TimeStampedModel):
     """
     This model represents the status of each requirement.
@@ -462,6 +529,8 @@ class CreditRequirementStatus(TimeStampedModel):
             defaults={"reason": reason, "status": status}
         )
         if not created:
+            # Spare the summary invalidation a query for the requirement
+            requirement_status.requirement = requirement
             requirement_status.status = status
             requirement_status.reason = reason if reason else {}
             requirement_status.save()
@@ -479,6 +548,7 @@ class CreditRequirementStatus(TimeStampedModel):
 
         try:
             requirement_status = cls.objects.get(username=username, requirement=requirement)
+            requirement_status.requirement = requirement
             requirement_status.delete()
         except cls.DoesNotExist:
             log_msg = (
@@ -491,6 +561,13 @@ class CreditRequirementStatus(TimeStampedModel):
             return
 
 
+@receiver(models.signals.post_save, sender=CreditRequirementStatus)
+@receiver(models.signals.post_delete, sender=CreditRequirementStatus)
+def invalidate_status_credit_summary(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the credit summary of the user in the course of the requirement. """
+    invalidate_credit_summary(instance.username, instance.requirement.course.course_key)
+
+
 def default_deadline_for_credit_eligibility():  # pylint: disable=invalid-name
     """ The default deadline to use when creating a new CreditEligibility model. """
     return datetime.datetime.now(pytz.UTC) + datetime.timedelta(
@@ -600,6 +677,13 @@ class CreditEligibility(TimeStampedModel):
         )
 
 
+@receiver(models.signals.post_save, sender=CreditEligibility)
+@receiver(models.signals.post_delete, sender=CreditEligibility)
+def invalidate_eligibility_credit_summary(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Invalidate the credit summary of the user in the course of the eligibility. """
+    invalidate_credit_summary(instance.username, instance.course.course_key)
+
+
 class CreditRequest(TimeStampedModel):
     """
     A request for credit from a particular credit provider.
@@ -76,17 +76,28 @@ def listen_for_grade_calculation(sender, username, grade_summary, course_key, de
     course_id = CourseKey.from_string(unicode(course_key))
     is_credit = api.is_credit_course(course_id)
     if is_credit:
-        requirements = api.get_credit_requirements(course_id, namespace='grade')
-        if requirements:
-            criteria = requirements[0].get('criteria')
+        # Grades are calculated far more often than they change, so the user's
+        # cached credit summary is checked before writing anything.
+        summary = api.get_credit_summaries_for_user(username, [course_id])[course_id]
+        if summary['eligibility_status'] == 'eligible':
+            return
+        requirement = next(
+            (requirement for requirement in summary['requirements'] if requirement['namespace'] == 'grade'), None
+        )
+        if requirement:
+            criteria = requirement.get('criteria')
             if criteria:
                 min_grade = criteria.get('min_grade')
                 if grade_summary['percent'] >= min_grade:
                     reason_dict = {'final_grade': grade_summary['percent']}
+                    if requirement['status'] == 'satisfied' and requirement['reason'] == reason_dict:
+                        return
                     api.set_credit_requirement_status(
                         username, course_id, 'grade', 'grade', status="satisfied", reason=reason_dict
                     )
                 elif deadline and deadline < timezone.now():
+                    if requirement['status'] == 'failed':
+                        return
                     api.set_credit_requirement_status(
                         username, course_id, 'grade', 'grade', status="failed", reason={}
                     )
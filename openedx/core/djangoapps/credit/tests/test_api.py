@@ -9,6 +9,7 @@ from django.conf import settings
 from django.core import mail
 from django.test.utils import override_settings
 from django.db import connection, transaction
+from freezegun import freeze_time
 from opaque_keys.edx.keys import CourseKey
 import pytz
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
@@ -549,6 +550,86 @@ class CreditRequirementApiTests(CreditApiTestBase):
         self.assertEqual(len(req_status), 1)
         self.assertEqual(req_status[0]["status"], None)
 
+    def _add_summary_courses(self, num_courses):
+        """
+        Creates credit courses with a grade and a reverification requirement.
+        """
+        course_keys = []
+        for index in range(num_courses):
+            course_key = CourseKey.from_string("edX/DemoX/Course_{}".format(index))
+            self.add_credit_course(course_key)
+            api.set_credit_requirements(course_key, [
+                {"namespace": "grade", "name": "grade", "display_name": "Grade", "criteria": {"min_grade": 0.8}},
+                {"namespace": "reverification", "name": "midterm", "display_name": "Midterm", "criteria": {}},
+            ])
+            course_keys.append(course_key)
+        # cache the set of credit courses
+        CreditCourse.is_credit_course(self.course_key)
+        return course_keys
+
+    def test_credit_summaries_for_user(self):
+        course_keys = self._add_summary_courses(3)
+        non_credit_course_key = CourseKey.from_string("edX/DemoX/Non_Credit")
+        api.set_credit_requirement_status("bob", course_keys[0], "grade", "grade")
+        api.set_credit_requirement_status("bob", course_keys[1], "reverification", "midterm", status="declined")
+        CreditEligibility.objects.create(course=CreditCourse.get_credit_course(course_keys[2]), username="bob")
+
+        # One query per model, whatever the number of courses, then none once cached
+        with self.assertNumQueries(3):
+            summaries = api.get_credit_summaries_for_user("bob", course_keys + [non_credit_course_key])
+        with self.assertNumQueries(0):
+            self.assertEqual(api.get_credit_summaries_for_user("bob", course_keys), summaries)
+
+        self.assertEqual(set(summaries), set(course_keys))
+        self.assertEqual(summaries[course_keys[0]]["eligibility_status"], "partial_eligible")
+        self.assertEqual(summaries[course_keys[1]]["eligibility_status"], "not_eligible")
+        self.assertEqual(summaries[course_keys[2]]["eligibility_status"], "eligible")
+        for course_key in course_keys:
+            self.assertEqual(
+                summaries[course_key]["requirements"], api.get_credit_requirement_status(course_key, "bob")
+            )
+
+    def test_credit_summaries_for_course(self):
+        course_key = self._add_summary_courses(1)[0]
+        usernames = ["user_{}".format(index) for index in range(5)]
+        api.set_credit_requirement_status(usernames[0], course_key, "grade", "grade", status="failed")
+
+        with self.assertNumQueries(3):
+            summaries = api.get_credit_summaries_for_course(course_key, usernames)
+        self.assertEqual(set(summaries), set(usernames))
+        self.assertEqual(summaries[usernames[0]]["eligibility_status"], "not_eligible")
+        for username in usernames[1:]:
+            self.assertEqual(summaries[username]["eligibility_status"], "partial_eligible")
+            self.assertEqual([req["status"] for req in summaries[username]["requirements"]], [None, None])
+
+    def test_credit_summary_invalidation(self):
+        course_key = self._add_summary_courses(1)[0]
+        api.get_credit_summaries_for_user("bob", [course_key])
+
+        # Changing a status recomputes the summary of the user only
+        api.get_credit_summaries_for_course(course_key, ["alice"])
+        api.set_credit_requirement_status("bob", course_key, "grade", "grade", reason={"final_grade": 0.9})
+        with self.assertNumQueries(0):
+            api.get_credit_summaries_for_course(course_key, ["alice"])
+        summary = api.get_credit_summaries_for_user("bob", [course_key])[course_key]
+        self.assertEqual(summary["requirements"][0]["status"], "satisfied")
+        self.assertEqual(summary["requirements"][0]["reason"], {"final_grade": 0.9})
+
+        # Changing the requirements recomputes the summaries of the course
+        api.set_credit_requirements(course_key, [
+            {"namespace": "grade", "name": "grade", "display_name": "Grade", "criteria": {"min_grade": 0.8}},
+        ])
+        summary = api.get_credit_summaries_for_user("bob", [course_key])[course_key]
+        self.assertEqual(len(summary["requirements"]), 1)
+
+        # The eligibility expires without any change in the database
+        eligibility = CreditEligibility.objects.create(course=CreditCourse.get_credit_course(course_key), username="bob")
+        summary = api.get_credit_summaries_for_user("bob", [course_key])[course_key]
+        self.assertEqual(summary["eligibility_status"], "eligible")
+        with freeze_time(eligibility.deadline.replace(tzinfo=None) + datetime.timedelta(days=1)):
+            summary = api.get_credit_summaries_for_user("bob", [course_key])[course_key]
+        self.assertEqual(summary["eligibility_status"], "partial_eligible")
+
 
 @ddt.ddt
 class CreditProviderIntegrationApiTests(CreditApiTestBase):
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db.models import Prefetch
 from openedx.core.djangoapps.user_api.accounts import NAME_MIN_LENGTH
 from openedx.core.djangoapps.user_api.serializers import ReadOnlyFieldsSerializerMixin
 
@@ -18,6 +19,25 @@ from . import (
 
 PROFILE_IMAGE_KEY_PREFIX = 'image_url'
 
+# The attribute holding the prefetched account privacy preferences of a user, see user_prefetch_lookups.
+ACCOUNT_PRIVACY_PREFERENCES_ATTR = '_prefetched_account_privacy_preferences'
+
+
+def user_prefetch_lookups(user_path):
+    """
+    Returns the prefetch_related lookups loading what UserReadOnlySerializer
+    reads for the users at `user_path`, so that many users are serialized in
+    a constant number of queries.
+    """
+    return [
+        user_path + '__profile__language_proficiencies',
+        Prefetch(
+            user_path + '__preferences',
+            queryset=UserPreference.objects.filter(key=ACCOUNT_VISIBILITY_PREF_KEY),
+            to_attr=ACCOUNT_PRIVACY_PREFERENCES_ATTR,
+        ),
+    ]
+
 
 class LanguageProficiencySerializer(serializers.ModelSerializer):
     """
@@ -127,9 +147,13 @@ class UserReadOnlySerializer(serializers.Serializer):
         if user_profile.requires_parental_consent():
             return PRIVATE_VISIBILITY
 
-        # Calling UserPreference directly because the requesting user may be different from existing_user
-        # (and does not have to be is_staff).
-        profile_privacy = UserPreference.get_value(user, ACCOUNT_VISIBILITY_PREF_KEY)
+        privacy_preferences = getattr(user, ACCOUNT_PRIVACY_PREFERENCES_ATTR, None)
+        if privacy_preferences is not None:
+            profile_privacy = privacy_preferences[0].value if privacy_preferences else None
+        else:
+            # Calling UserPreference directly because the requesting user may be different from existing_user
+            # (and does not have to be is_staff).
+            profile_privacy = UserPreference.get_value(user, ACCOUNT_VISIBILITY_PREF_KEY)
         return profile_privacy if profile_privacy else self.configuration.get('default_visibility')
 
     def _filter_fields(self, field_whitelist, serialized_account):
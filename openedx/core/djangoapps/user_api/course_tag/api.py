@@ -28,15 +28,24 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
-    try:
-        record = UserCourseTag.objects.get(
-            user=user,
-            course_id=course_id,
-            key=key)
-
-        return record.value
-    except UserCourseTag.DoesNotExist:
-        return None
+    return UserCourseTag.get_value(user, course_id, key)
+
+
+def get_course_tags(user, course_id):
+    """
+    Gets all the user's course tags in the specified course_id.
+
+    Within a request, the course tags are retrieved with one query the first
+    time and then kept up to date with the changes made by the request.
+
+    Args:
+        user: the User object for the course tags
+        course_id: course identifier (string)
+
+    Returns:
+        dict of the string values by key
+    """
+    return UserCourseTag.get_values(user, course_id)
 
 
 def set_course_tag(user, course_id, key, value):
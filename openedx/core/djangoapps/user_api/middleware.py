@@ -9,7 +9,7 @@ from opaque_keys.edx.keys import CourseKey
 
 from track.contexts import COURSE_REGEX
 
-from .models import UserCourseTag
+from .course_tag.api import get_course_tags
 
 
 class UserTagsEventContextMiddleware(object):
@@ -36,12 +36,8 @@ class UserTagsEventContextMiddleware(object):
             context['course_id'] = course_id
 
             if request.user.is_authenticated():
-                context['course_user_tags'] = dict(
-                    UserCourseTag.objects.filter(
-                        user=request.user.pk,
-                        course_id=course_key,
-                    ).values_list('key', 'value')
-                )
+                # Also loads the tags looked up by the partition schemes
+                context['course_user_tags'] = get_course_tags(request.user, course_key)
             else:
                 context['course_user_tags'] = {}
 
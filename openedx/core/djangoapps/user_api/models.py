@@ -8,6 +8,7 @@ from django.db.models.signals import post_delete, pre_save, post_save
 from django.dispatch import receiver
 from model_utils.models import TimeStampedModel
 
+from request_cache import get_cache, get_request
 from util.model_utils import get_changed_fields_dict, emit_setting_changed_event
 from xmodule_django.models import CourseKeyField
 
@@ -19,6 +20,82 @@ from xmodule_django.models import CourseKeyField
 # create an alias in "user_api".
 from student.models import UserProfile, Registration, PendingEmailChange  # pylint: disable=unused-import
 
+# The name of the request cache of the preferences and course tags of the users.
+USER_DATA_CACHE_NAME = "user_api.user_data"
+
+# The key of the hit counters in the request cache of the user data.
+_USER_DATA_STATS_KEY = "stats"
+
+
+def _get_user_data_cache():
+    """
+    Returns the request cache of the preferences and course tags of the users,
+    or None outside of a request, where nothing would ever clear it.
+    """
+    if get_request() is None:
+        return None
+    return get_cache(USER_DATA_CACHE_NAME)
+
+
+def _can_cache_user_data(user):
+    """
+    Returns whether the preferences and course tags of the user are cached
+    for the current request.
+    """
+    return user.id is not None and _get_user_data_cache() is not None
+
+
+def _get_request_cached_values(cache_key, load):
+    """
+    Returns the {key: value} dict of user data cached under cache_key for the
+    current request, calling load to retrieve it from the database the first
+    time. Outside of a request, load is called each time.
+    """
+    cache = _get_user_data_cache()
+    if cache is None:
+        return load()
+    stats = cache.setdefault(_USER_DATA_STATS_KEY, {"hits": 0, "misses": 0})
+    if cache_key in cache:
+        stats["hits"] += 1
+    else:
+        stats["misses"] += 1
+        cache[cache_key] = load()
+    return cache[cache_key]
+
+
+def _update_request_cached_value(cache_key, key, value):
+    """
+    Writes the value of the key through to the user data cached under
+    cache_key, if it was loaded in the current request. A None value
+    removes the key.
+    """
+    cache = _get_user_data_cache()
+    values = cache.get(cache_key) if cache is not None else None
+    if values is None:
+        return
+    if value is None:
+        values.pop(key, None)
+    else:
+        values[key] = value
+
+
+def get_user_data_cache_stats():
+    """
+    Returns the hits and misses of the cache of the preferences and course
+    tags of the users in the current request, as a {"hits": int, "misses": int}
+    dict.
+    """
+    cache = _get_user_data_cache() or {}
+    return dict(cache.get(_USER_DATA_STATS_KEY, {"hits": 0, "misses": 0}))
+
+
+def _stored_value(instance):
+    """
+    Returns the value of the user data instance as it's read back from the
+    database: values such as group ids are saved as integers.
+    """
+    return instance._meta.get_field("value").to_python(instance.value)
+
 
 class UserPreference(models.Model):
     """A user's preference, stored as generic text to be processed by client"""
@@ -46,12 +123,32 @@ class UserPreference(models.Model):
         Returns:
             The user preference value, or None if one is not set.
         """
+        if _can_cache_user_data(user):
+            return cls.get_values(user).get(preference_key)
         try:
             user_preference = cls.objects.get(user=user, key=preference_key)
             return user_preference.value
         except cls.DoesNotExist:
             return None
 
+    @classmethod
+    def get_values(cls, user):
+        """Gets all the user preference values of a user.
+
+        Within a request, they are retrieved with one query the first time and
+        then kept up to date with the changes made by the request.
+
+        Arguments:
+            user (User): The user whose preferences should be retrieved.
+
+        Returns:
+            A dict of the user preference values by key.
+        """
+        return dict(_get_request_cached_values(
+            ("preferences", user.id),
+            lambda: dict(cls.objects.filter(user=user).values_list("key", "value"))
+        ))
+
 
 @receiver(pre_save, sender=UserPreference)
 def pre_save_callback(sender, **kwargs):
@@ -73,6 +170,9 @@ def post_save_callback(sender, **kwargs):
         user_preference._old_value, user_preference.value
     )
     user_preference._old_value = None
+    _update_request_cached_value(
+        ("preferences", user_preference.user_id), user_preference.key, _stored_value(user_preference)
+    )
 
 
 @receiver(post_delete, sender=UserPreference)
@@ -84,6 +184,7 @@ def post_delete_callback(sender, **kwargs):
     emit_setting_changed_event(
         user_preference.user, sender._meta.db_table, user_preference.key, user_preference.value, None
     )
+    _update_request_cached_value(("preferences", user_preference.user_id), user_preference.key, None)
 
 
 class UserCourseTag(models.Model):
@@ -99,6 +200,62 @@ class UserCourseTag(models.Model):
     class Meta(object):
         unique_together = ("user", "course_id", "key")
 
+    @classmethod
+    def get_value(cls, user, course_id, key):
+        """Gets the value of the user's course tag for a given key.
+
+        Arguments:
+            user (User): The user whose course tag should be retrieved.
+            course_id (CourseKey): The course of the course tag.
+            key (str): The key of the course tag.
+
+        Returns:
+            The course tag value, or None if one is not set.
+        """
+        if _can_cache_user_data(user):
+            return cls.get_values(user, course_id).get(key)
+        try:
+            return cls.objects.get(user=user, course_id=course_id, key=key).value
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def get_values(cls, user, course_id):
+        """Gets all the course tag values of a user in a course.
+
+        Within a request, they are retrieved with one query the first time and
+        then kept up to date with the changes made by the request.
+
+        Arguments:
+            user (User): The user whose course tags should be retrieved.
+            course_id (CourseKey): The course of the course tags.
+
+        Returns:
+            A dict of the course tag values by key.
+        """
+        return dict(_get_request_cached_values(
+            ("course_tags", user.id, unicode(course_id)),
+            lambda: dict(cls.objects.filter(user=user, course_id=course_id).values_list("key", "value"))
+        ))
+
+
+@receiver(post_save, sender=UserCourseTag)
+def course_tag_post_save_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Write the saved course tag through to the request cache.
+    """
+    _update_request_cached_value(
+        ("course_tags", instance.user_id, unicode(instance.course_id)), instance.key, _stored_value(instance)
+    )
+
+
+@receiver(post_delete, sender=UserCourseTag)
+def course_tag_post_delete_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove the deleted course tag from the request cache.
+    """
+    _update_request_cached_value(("course_tags", instance.user_id, unicode(instance.course_id)), instance.key, None)
+
 
 class UserOrgTag(TimeStampedModel):
     """ Per-Organization user tags.
@@ -3,15 +3,19 @@ Test UserPreferenceModel and UserPreference events
 """
 from django.db import IntegrityError
 from django.test import TestCase
+from django.test.client import RequestFactory
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 from student.tests.tests import UserSettingsEventTestMixin
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from ..tests.factories import UserPreferenceFactory, UserCourseTagFactory, UserOrgTagFactory
-from ..models import UserPreference
-from ..preferences.api import set_user_preference
+from ..course_tag import api as course_tag_api
+from ..models import UserCourseTag, UserPreference, get_user_data_cache_stats
+from ..preferences.api import delete_user_preference, set_user_preference
 
 
 class UserPreferenceModelTest(ModuleStoreTestCase):
@@ -94,6 +98,59 @@ class UserPreferenceModelTest(ModuleStoreTestCase):
         self.assertIsNone(pref)
 
 
+class UserDataRequestCacheTest(TestCase):
+    """
+    Test that the preferences and course tags of a user are loaded once per request.
+    """
+    def setUp(self):
+        super(UserDataRequestCacheTest, self).setUp()
+        self.user = UserFactory.create()
+        self.course_id = SlashSeparatedCourseKey('test_org', 'test_course_number', 'test_run')
+        for key in ('first', 'second'):
+            UserPreferenceFactory.create(user=self.user, key=key, value=key)
+            UserCourseTagFactory.create(user=self.user, course_id=self.course_id, key=key, value=key)
+
+        # Start a request, as the RequestCache middleware does
+        RequestCache().process_request(RequestFactory().get('/'))
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_preferences(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(UserPreference.get_value(self.user, 'first'), 'first')
+            self.assertEqual(UserPreference.get_value(self.user, 'second'), 'second')
+            self.assertIsNone(UserPreference.get_value(self.user, 'third'))
+        self.assertEqual(get_user_data_cache_stats(), {'hits': 2, 'misses': 1})
+
+        # Changes are written through
+        set_user_preference(self.user, 'third', 3)
+        delete_user_preference(self.user, 'first')
+        with self.assertNumQueries(0):
+            self.assertEqual(UserPreference.get_values(self.user), {'second': 'second', 'third': '3'})
+
+    def test_course_tags(self):
+        other_course_id = SlashSeparatedCourseKey('test_org', 'other_course_number', 'test_run')
+        with self.assertNumQueries(2):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'first'), 'first')
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, 'second'), 'second')
+            self.assertIsNone(course_tag_api.get_course_tag(self.user, other_course_id, 'first'))
+        self.assertEqual(get_user_data_cache_stats(), {'hits': 1, 'misses': 2})
+
+        # Changes are written through
+        course_tag_api.set_course_tag(self.user, self.course_id, 'third', 3)
+        UserCourseTag.objects.get(user=self.user, course_id=self.course_id, key='first').delete()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                course_tag_api.get_course_tags(self.user, self.course_id), {'second': 'second', 'third': '3'}
+            )
+
+    def test_outside_of_request(self):
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(2):
+            self.assertEqual(UserPreference.get_value(self.user, 'first'), 'first')
+            self.assertEqual(UserPreference.get_value(self.user, 'second'), 'second')
+        self.assertEqual(get_user_data_cache_stats(), {'hits': 0, 'misses': 0})
+
+
 class TestUserPreferenceEvents(UserSettingsEventTestMixin, TestCase):
     """
     Mixin for verifying that user preference events are fired correctly.